@@ -0,0 +1,199 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+GITHUB_API = "https://api.github.com"
+CACHE_FILE = "github_cache.json"
+
+
+class IssueImporter:
+    """
+    Загрузка всех issues репозитория: страницы параллельно + кэш ETag
+
+    ПРОБЛЕМА:
+    Один GET без параметров возвращает только первые 30 issues, без токена
+    лимит - 60 запросов в час, и каждый запуск качает всё заново.
+
+    КАК РАБОТАЕТ:
+    1. Первая страница (per_page=100). В заголовке Link GitHub пишет
+       ссылки на next и last - по last узнаём сколько всего страниц
+    2. Остальные страницы качаем одновременно в max_workers потоков.
+       Одна requests.Session с пулом соединений: TCP/TLS соединения
+       переиспользуются, а не открываются на каждую страницу
+    3. На каждый URL запоминаем ETag / Last-Modified и тело ответа.
+       В следующий раз шлём If-None-Match / If-Modified-Since - если
+       ничего не поменялось, GitHub отвечает 304 без тела (и такой ответ
+       не тратит лимит запросов), а данные берём из кэша
+    4. Кэш хранится в JSON файле - работает и между запусками программы
+
+    ОШИБКИ:
+    404 - репозитория нет (get_issues вернёт None),
+    остальное - requests.HTTPError / requests.RequestException
+    """
+
+    def __init__(self, cache_file=CACHE_FILE, token=None, base_url=GITHUB_API,
+                 per_page=100, max_workers=4, timeout=10, session=None):
+        self.cache_file = cache_file
+        self.base_url = base_url.rstrip("/")
+        self.per_page = per_page
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache = self._load_cache()
+        # Сколько ответов пришло с сервера и сколько взято из кэша (304)
+        self.stats = {"fetched": 0, "not_modified": 0}
+        self._lock = threading.Lock()  # Страницы качаются в нескольких потоках
+
+        if session is None:
+            session = requests.Session()
+            # Пул на столько соединений, сколько потоков качают страницы
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+        self.session.headers["Accept"] = "application/vnd.github+json"
+
+        # Токен из аргумента или переменной окружения GITHUB_TOKEN:
+        # с ним лимит 5000 запросов в час вместо 60
+        token = token or os.environ.get("GITHUB_TOKEN")
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ==========================================
+    # КЭШ
+    # ==========================================
+
+    def _load_cache(self):
+        if not self.cache_file:
+            return {}
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}  # Кэш можно потерять - просто скачаем заново
+
+    def save_cache(self):
+        """Записать кэш (через временный файл, чтобы не оставить его наполовину записанным)"""
+        if not self.cache_file:
+            return
+        temp_name = self.cache_file + ".tmp"
+        with open(temp_name, "w", encoding="utf-8") as f:
+            json.dump(self.cache, f, ensure_ascii=False)
+        os.replace(temp_name, self.cache_file)
+
+    # ==========================================
+    # ЗАПРОСЫ
+    # ==========================================
+
+    def _get(self, url):
+        """
+        GET с условными заголовками
+
+        ВОЗВРАЩАЕТ: (данные страницы, ссылки из заголовка Link)
+        """
+        cached = self.cache.get(url)
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+
+        if response.status_code == 304 and cached:
+            with self._lock:
+                self.stats["not_modified"] += 1
+            return cached["data"], cached["links"]
+
+        response.raise_for_status()
+        # response.links - заголовок Link, уже разобранный requests:
+        # {"next": {"url": ...}, "last": {"url": ...}}
+        links = {rel: link["url"] for rel, link in response.links.items()}
+        data = response.json()
+        with self._lock:
+            self.stats["fetched"] += 1
+            self.cache[url] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "links": links,
+                "data": data,
+            }
+        return data, links
+
+    @staticmethod
+    def _page_url(url, page):
+        """Тот же URL с другим параметром page"""
+        parts = urlparse(url)
+        query = parse_qs(parts.query)
+        query["page"] = [str(page)]
+        return urlunparse(parts._replace(query=urlencode(query, doseq=True)))
+
+    @staticmethod
+    def _page_number(url):
+        return int(parse_qs(urlparse(url).query).get("page", ["1"])[0])
+
+    def get_issues(self, owner, repo, state="open"):
+        """
+        Все issues репозитория (без pull requests)
+
+        ВОЗВРАЩАЕТ: список словарей из GitHub API или None если репозитория нет
+        """
+        first_url = (f"{self.base_url}/repos/{owner}/{repo}/issues?"
+                     + urlencode({"state": state, "per_page": self.per_page, "page": 1}))
+        try:
+            data, links = self._get(first_url)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
+
+        pages = [data]
+        if "last" in links:
+            # Знаем номер последней страницы - качаем 2..last одновременно.
+            # map() возвращает результаты в порядке страниц
+            urls = [self._page_url(first_url, page)
+                    for page in range(2, self._page_number(links["last"]) + 1)]
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                pages.extend(page for page, _ in pool.map(self._get, urls))
+        else:
+            # GitHub не всегда присылает last - тогда идём по next по очереди
+            while "next" in links:
+                data, links = self._get(links["next"])
+                pages.append(data)
+
+        self.save_cache()
+
+        # Эндпоинт issues возвращает и pull requests - их пропускаем
+        return [issue for page in pages for issue in page if "pull_request" not in issue]
+
+
+def import_issues(manager, issues):
+    """
+    Добавить issues в TaskManager одной записью в БД
+
+    Issues, которые уже импортированы раньше (то же название и номер),
+    повторно не добавляются.
+    ВОЗВРАЩАЕТ: список новых задач
+    """
+    existing = {(task.title, task.description) for task in manager.tasks.values()}
+    items = []
+    for issue in issues:
+        item = (issue["title"], f"GitHub Issue #{issue['number']}")
+        if item not in existing:
+            existing.add(item)
+            items.append(item)
+    return manager.add_tasks(items)
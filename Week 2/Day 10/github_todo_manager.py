@@ -1,9 +1,10 @@
 import requests
 import json
 from datetime import datetime
+from task_store import TaskStore, TASKS_DB, STATUSES
+from github_importer import IssueImporter, import_issues, GITHUB_API
 
-GITHUB_API = "https://api.github.com"
-TASKS_FILE = "tasks.json"
+TASKS_FILE = "tasks.json"  # Старый формат - переносится в tasks.db при первом запуске
 
 class Task:
     def __init__(self, title, description ="", task_id = None):
@@ -13,11 +14,12 @@ class Task:
         self.status = "todo"
         self.created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-def generate_id(self):
+    @staticmethod
+    def generate_id():
         """Генерация уникального ID"""
         return int(datetime.now().timestamp() * 1000)
-    
-def to_dict(self):
+
+    def to_dict(self):
         """Преобразовать в словарь"""
         return {
             "id": self.id,
@@ -25,24 +27,24 @@ def to_dict(self):
             "description": self.description,
             "status": self.status,
             "created_at": self.created_at
-        }        
+        }
 
-@staticmethod
+    @staticmethod
 
-#@staticmethod = метод, который:
-#не получает self
-#не связан с конкретным объектом
-#просто помогает классу выполнять какую-то задачу
-#В твоём случае: создание задачи из словаря.
+    #@staticmethod = метод, который:
+    #не получает self
+    #не связан с конкретным объектом
+    #просто помогает классу выполнять какую-то задачу
+    #В твоём случае: создание задачи из словаря.
 
-def from_dict(data):
+    def from_dict(data):
         """Создать задачу из словаря"""
         task = Task(data["title"], data["description"], data["id"])
         task.status = data["status"]
         task.created_at = data["created_at"]
         return task
 
-def __str__(self):
+    def __str__(self):
         status_emoji = {
             "todo": "⏳",
             "in_progress": "🔄",
@@ -52,98 +54,135 @@ def __str__(self):
         return f"{emoji} [{self.id}] {self.title}"
 
 class TaskManager:
-    def __init__(self):
-        self.tasks = []
+    """
+    Задачи в памяти + хранилище TaskStore (SQLite)
+
+    КАК РАБОТАЕТ:
+    - self.tasks: id -> Task (dict помнит порядок добавления) - поиск по ID за O(1)
+    - self.status_counts: статус -> количество задач, обновляется при
+      каждом изменении - статистика ничего не перебирает
+    - Каждое действие пишет в БД только одну строку (или пачку при add_tasks),
+      файл целиком больше не переписывается
+    """
+
+    def __init__(self, store=None):
+        self.store = store if store is not None else TaskStore(TASKS_DB)
+        self.tasks = {}
+        self.status_counts = {status: 0 for status in STATUSES}
+        self._last_id = 0
         self.load_tasks()
-    
+
     def load_tasks(self):
-        """Загрузить задачи из файла"""
-        try:
-            with open(TASKS_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            
-            self.tasks = [Task.from_dict(task_data) for task_data in data]
+        """Загрузить задачи из БД (при первом запуске - перенести tasks.json)"""
+        if self.store.count() == 0:
+            try:
+                moved = self.store.import_json(TASKS_FILE)
+                if moved:
+                    print(f" Перенесено {moved} задач из {TASKS_FILE}")
+            except json.JSONDecodeError:
+                print(f" Файл {TASKS_FILE} повреждён, начинаем с пустого списка")
+
+        self.tasks = {}
+        for task_data in self.store.load():
+            task = Task.from_dict(task_data)
+            self.tasks[task.id] = task
+            self._last_id = max(self._last_id, task.id)
+
+        # Счётчики считает SQL один раз при запуске
+        self.status_counts = {status: 0 for status in STATUSES}
+        self.status_counts.update(self.store.count_by_status())
+
+        if self.tasks:
             print(f" Загружено {len(self.tasks)} задач")
-        
-        except FileNotFoundError:
-            print("ℹ Файл задач не найден, создаём новый")
-            self.tasks = []
-        
-        except json.JSONDecodeError:
-            print(" Файл задач повреждён, создаём новый")
-            self.tasks = []
+        else:
+            print("ℹ Задач пока нет")
 
-    def save_tasks(self):
-        """Сохранить задачи в файл"""
-        try:
-            data = [task.to_dict() for task in self.tasks]
-            with open(TASKS_FILE, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            print(" Задачи сохранены")
-        except Exception as e:
-            print(f" Ошибка сохранения: {e}")       
+    def _next_id(self):
+        # ID из времени в миллисекундах совпадают, если задачи созданы
+        # в одну миллисекунду (импорт пачкой) - тогда берём следующий
+        task_id = max(Task.generate_id(), self._last_id + 1)
+        self._last_id = task_id
+        return task_id
+
+    def add_tasks(self, items):
+        """
+        Добавить много задач одной записью в БД
+
+        items - пары (название, описание)
+        ВОЗВРАЩАЕТ: список созданных Task
+        """
+        tasks = [Task(title, description, self._next_id()) for title, description in items]
+        self.store.insert([task.to_dict() for task in tasks])
+
+        for task in tasks:
+            self.tasks[task.id] = task
+            self.status_counts[task.status] += 1
+        return tasks
 
     def add_task(self, title, description=""):
         """Добавить новую задачу"""
-        task = Task(title, description)
-        self.tasks.append(task)
-        self.save_tasks()
+        task = self.add_tasks([(title, description)])[0]
         print(f" Задача добавлена: {task}")
-        return task      
-    
+        return task
+
     def list_tasks(self, status=None):
         """Показать список задач"""
         # Фильтруем по статусу если нужно
-        filtered = self.tasks if not status else [t for t in self.tasks if t.status == status]
-        
+        tasks = self.tasks.values()
+        filtered = list(tasks) if not status else [t for t in tasks if t.status == status]
+
         if not filtered:
             print("\n📋 Нет задач")
             return
-        
+
         print("\n" + "="*70)
         print(f"📋 ЗАДАЧИ ({len(filtered)})")
         print("="*70)
-        
+
         for task in filtered:
             print(f"\n{task}")
             if task.description:
                 print(f"   {task.description}")
             print(f"   Создано: {task.created_at}")
-        
+
         print("\n" + "="*70 + "\n")
-    
+
     def update_status(self, task_id, new_status):
         """Изменить статус задачи"""
-        for task in self.tasks:
-            if task.id == task_id:
-                task.status = new_status
-                self.save_tasks()
-                print(f"✅ Статус обновлён: {task}")
-                return True
-        
-        print(f" Задача {task_id} не найдена")
-        return False
-    
+        task = self.tasks.get(task_id)
+        if task is None:
+            print(f" Задача {task_id} не найдена")
+            return False
+
+        if new_status != task.status:
+            self.store.update_status(task_id, new_status)  # UPDATE одной строки
+            self.status_counts[task.status] -= 1
+            self.status_counts[new_status] = self.status_counts.get(new_status, 0) + 1
+            task.status = new_status
+
+        print(f"✅ Статус обновлён: {task}")
+        return True
+
     def delete_task(self, task_id):
         """Удалить задачу"""
-        for task in self.tasks:
-            if task.id == task_id:
-                self.tasks.remove(task)
-                self.save_tasks()
-                print(f" Задача удалена: {task.title}")
-                return True
-        
-        print(f" Задача {task_id} не найдена")
-        return False
-    
+        task = self.tasks.get(task_id)
+        if task is None:
+            print(f" Задача {task_id} не найдена")
+            return False
 
-def get_statistics(self):
-        """Получить статистику"""
+        self.store.delete(task_id)
+        del self.tasks[task_id]
+        self.status_counts[task.status] -= 1
+        print(f" Задача удалена: {task.title}")
+        return True
+
+    def get_statistics(self):
+        """Получить статистику (из счётчиков, без перебора задач)"""
         total = len(self.tasks)
-        todo = len([t for t in self.tasks if t.status == "todo"])
-        in_progress = len([t for t in self.tasks if t.status == "in_progress"])
-        done = len([t for t in self.tasks if t.status == "done"])
-        
+        todo = self.status_counts["todo"]
+        in_progress = self.status_counts["in_progress"]
+        done = self.status_counts["done"]
+
         print("\n" + "="*50)
         print(" СТАТИСТИКА")
         print("="*50)
@@ -151,14 +190,16 @@ def get_statistics(self):
         print(f" К выполнению: {todo}")
         print(f" В работе: {in_progress}")
         print(f" Выполнено: {done}")
-        
+
         if total > 0:
             completion = (done / total) * 100
             print(f"\n Прогресс: {completion:.1f}%")
-        
-        print("="*50 + "\n")  
 
-        
+        print("="*50 + "\n")
+
+        return {"total": total, "todo": todo, "in_progress": in_progress, "done": done}
+
+
 class GitHubIntegration:
     """
     Интеграция с GitHub Issues
@@ -171,60 +212,54 @@ class GitHubIntegration:
     @staticmethod
     def get_repo_issues(owner, repo):
         """
-        Получить issues из репозитория
-        
+        Получить ВСЕ issues из репозитория
+
+        Страницы качаются параллельно, ответы кэшируются по ETag
+        в github_cache.json (см. github_importer.py)
+
         ПРИМЕР:
         get_repo_issues("python", "cpython")
         """
-        url = f"{GITHUB_API}/repos/{owner}/{repo}/issues"
-        
         try:
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                issues = response.json()
-                print(f" Получено {len(issues)} issues")
-                return issues
-            
-            elif response.status_code == 404:
+            with IssueImporter() as importer:
+                issues = importer.get_issues(owner, repo)
+
+            if issues is None:
                 print(f" Репозиторий {owner}/{repo} не найден")
                 return None
-            
-            else:
-                print(f" Ошибка {response.status_code}")
-                return None
-        
+
+            print(f" Получено {len(issues)} issues "
+                  f"(страниц скачано: {importer.stats['fetched']}, без изменений: {importer.stats['not_modified']})")
+            return issues
+
         except requests.Timeout:
             print(" Превышено время ожидания")
             return None
-        
+
+        except requests.HTTPError as e:
+            print(f" Ошибка {e.response.status_code}")
+            return None
+
         except requests.RequestException as e:
             print(f" Ошибка: {e}")
             return None
-        
+
 
     @staticmethod
     def import_issues(manager, issues):
         """
         Импортировать GitHub issues как задачи
-        
+
         КАК ЭТО РАБОТАЕТ:
         1. Берём issues из GitHub
-        2. Преобразуем в Task объекты
-        3. Добавляем в менеджер
+        2. Преобразуем в пары (название, описание)
+        3. Добавляем в менеджер все сразу - одна запись в БД
         """
         if not issues:
             return
-        
-        count = 0
-        for issue in issues[:5]:  # Импортируем первые 5
-            title = issue['title']
-            description = f"GitHub Issue #{issue['number']}"
-            
-            manager.add_task(title, description)
-            count += 1
-        
-        print(f" Импортировано {count} задач из GitHub")
+
+        tasks = import_issues(manager, issues)
+        print(f" Импортировано {len(tasks)} задач из GitHub")
 
 def main():
     """Главная функция приложения"""
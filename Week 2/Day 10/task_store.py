@@ -0,0 +1,99 @@
+import json
+import sqlite3
+
+TASKS_DB = "tasks.db"
+STATUSES = ("todo", "in_progress", "done")
+
+
+def dict_factory(cursor, row):
+    """Строка БД -> словарь {колонка: значение} (как в Week 3/Day 17/database.py)"""
+    d = {}
+    for idx, col in enumerate(cursor.description):
+        d[col[0]] = row[idx]
+    return d
+
+
+class TaskStore:
+    """
+    Хранилище задач в SQLite (вместо tasks.json)
+
+    ПРОБЛЕМА:
+    tasks.json переписывался целиком (с indent=2) при каждом добавлении,
+    смене статуса и удалении - чем больше задач, тем медленнее любое действие.
+
+    КАК РАБОТАЕТ:
+    - id - PRIMARY KEY: найти, обновить или удалить задачу по ID -
+      поиск по индексу, а не перебор
+    - Смена статуса = UPDATE одной строки, удаление = DELETE одной строки
+    - insert() пишет любое количество задач одной транзакцией БД
+      (импорт сотни issues - одна запись на диск, а не сотня)
+    """
+
+    def __init__(self, filename=TASKS_DB):
+        self.filename = filename
+        self.conn = sqlite3.connect(filename)
+        self.conn.row_factory = dict_factory
+        self.init_db()
+
+    def init_db(self):
+        with self.conn:
+            self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                description TEXT NOT NULL DEFAULT '',
+                status TEXT NOT NULL DEFAULT 'todo',
+                created_at TEXT NOT NULL
+            )
+            """)
+
+    def close(self):
+        self.conn.close()
+
+    def load(self):
+        """Все задачи (словари) в порядке ID"""
+        cursor = self.conn.execute("""
+        SELECT id, title, description, status, created_at FROM tasks ORDER BY id
+        """)
+        return cursor.fetchall()
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) AS total FROM tasks").fetchone()["total"]
+
+    def count_by_status(self):
+        """{"todo": 3, "done": 1} - один GROUP BY (при запуске, дальше счётчики ведёт менеджер)"""
+        cursor = self.conn.execute("SELECT status, COUNT(*) AS total FROM tasks GROUP BY status")
+        return {row["status"]: row["total"] for row in cursor.fetchall()}
+
+    def insert(self, tasks):
+        """Записать задачи (словари из Task.to_dict) одной транзакцией"""
+        with self.conn:
+            self.conn.executemany("""
+            INSERT INTO tasks (id, title, description, status, created_at)
+            VALUES (:id, :title, :description, :status, :created_at)
+            """, tasks)
+
+    def update_status(self, task_id, status):
+        """Изменить статус одной задачи. False - такой задачи нет"""
+        with self.conn:
+            cursor = self.conn.execute("UPDATE tasks SET status = ? WHERE id = ?", (status, task_id))
+            return cursor.rowcount > 0
+
+    def delete(self, task_id):
+        with self.conn:
+            cursor = self.conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            return cursor.rowcount > 0
+
+    def import_json(self, filename):
+        """
+        Перенести задачи из старого tasks.json
+
+        ВОЗВРАЩАЕТ: сколько задач перенесено (0 если файла нет)
+        """
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return 0
+        self.insert(data)
+        return len(data)
@@ -0,0 +1,141 @@
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+pytest.importorskip("requests")
+
+import github_todo_manager
+from github_importer import IssueImporter, import_issues
+from github_todo_manager import TaskManager
+from task_store import TaskStore
+
+PER_PAGE = 10
+
+
+class StubGitHub(BaseHTTPRequestHandler):
+    """
+    Мини-GitHub: /repos/demo/app/issues отдаёт issues страницами
+
+    Как настоящий API: заголовок Link со ссылками next/last,
+    ETag у каждой страницы и 304 на If-None-Match с тем же ETag
+    """
+
+    issues = []
+    requests_log = []  # (page, статус ответа)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/repos/demo/app/issues":
+            self._reply(404, {"message": "Not Found"})
+            return
+
+        query = parse_qs(url.query)
+        page = int(query.get("page", ["1"])[0])
+        per_page = int(query.get("per_page", ["30"])[0])
+        chunk = self.issues[(page - 1) * per_page: page * per_page]
+        etag = f'"{hash(json.dumps(chunk))}"'
+
+        if self.headers.get("If-None-Match") == etag:
+            self._reply(304, None, page=page)
+            return
+
+        last = max(1, -(-len(self.issues) // per_page))
+        base = f"http://{self.headers['Host']}{url.path}?state=open&per_page={per_page}"
+        links = []
+        if page < last:
+            links.append(f'<{base}&page={page + 1}>; rel="next"')
+            links.append(f'<{base}&page={last}>; rel="last"')
+        self._reply(200, chunk, page=page, headers={"ETag": etag, "Link": ", ".join(links)})
+
+    def _reply(self, status, body, page=None, headers=None):
+        StubGitHub.requests_log.append((page, status))
+        data = b"" if body is None else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            if value:
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass  # Не печатать каждый запрос
+
+
+@pytest.fixture
+def server():
+    """Фикстура: stub сервер на свободном порту в отдельном потоке"""
+    StubGitHub.issues = [{"number": n, "title": f"Issue {n}"} for n in range(1, 36)]
+    StubGitHub.issues.append({"number": 36, "title": "PR", "pull_request": {}})
+    StubGitHub.requests_log = []
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubGitHub)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_importer(server, tmp_path):
+    return IssueImporter(cache_file=str(tmp_path / "cache.json"), base_url=server, per_page=PER_PAGE)
+
+
+def test_fetches_all_pages(server, tmp_path):
+    with make_importer(server, tmp_path) as importer:
+        issues = importer.get_issues("demo", "app")
+
+    # 36 записей = 4 страницы, pull request пропущен, порядок сохранён
+    assert [issue["number"] for issue in issues] == list(range(1, 36))
+    assert sorted(page for page, _ in StubGitHub.requests_log) == [1, 2, 3, 4]
+
+
+def test_unchanged_repo_costs_304(server, tmp_path):
+    """Второй запуск (новый объект, кэш с диска): все страницы - 304"""
+    with make_importer(server, tmp_path) as importer:
+        first = importer.get_issues("demo", "app")
+    StubGitHub.requests_log = []
+
+    with make_importer(server, tmp_path) as importer:
+        second = importer.get_issues("demo", "app")
+        assert importer.stats == {"fetched": 0, "not_modified": 4}
+
+    assert second == first
+    assert {status for _, status in StubGitHub.requests_log} == {304}
+
+
+def test_changed_page_is_refetched(server, tmp_path):
+    with make_importer(server, tmp_path) as importer:
+        importer.get_issues("demo", "app")
+
+    StubGitHub.issues[0] = {"number": 1, "title": "Issue 1 (исправлено)"}
+
+    with make_importer(server, tmp_path) as importer:
+        issues = importer.get_issues("demo", "app")
+        assert importer.stats == {"fetched": 1, "not_modified": 3}
+
+    assert issues[0]["title"] == "Issue 1 (исправлено)"
+
+
+def test_missing_repo(server, tmp_path):
+    with make_importer(server, tmp_path) as importer:
+        assert importer.get_issues("demo", "nope") is None
+
+
+def test_import_is_one_bulk_insert(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(github_todo_manager, "TASKS_FILE", str(tmp_path / "tasks.json"))
+    manager = TaskManager(TaskStore(str(tmp_path / "tasks.db")))
+    inserts = []
+    original = manager.store.insert
+    monkeypatch.setattr(manager.store, "insert", lambda tasks: inserts.append(len(tasks)) or original(tasks))
+
+    with make_importer(server, tmp_path) as importer:
+        issues = importer.get_issues("demo", "app")
+    import_issues(manager, issues)
+    import_issues(manager, issues)  # Повторный импорт ничего не дублирует
+
+    assert inserts == [35, 0]
+    assert len(manager.tasks) == 35
+    assert manager.status_counts["todo"] == 35
@@ -0,0 +1,57 @@
+import pytest
+
+pytest.importorskip("requests")  # github_todo_manager импортирует requests
+
+import github_todo_manager
+from github_todo_manager import TaskManager
+from task_store import TaskStore
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """Фикстура: менеджер с БД во временной папке (старого tasks.json там нет)"""
+    monkeypatch.setattr(github_todo_manager, "TASKS_FILE", str(tmp_path / "tasks.json"))
+    return TaskManager(TaskStore(str(tmp_path / "tasks.db")))
+
+
+def test_statistics_from_counters(manager):
+    first, second, third = manager.add_tasks([("А", ""), ("Б", ""), ("В", "")])
+    manager.update_status(first.id, "done")
+    manager.update_status(second.id, "in_progress")
+    manager.delete_task(third.id)
+
+    assert manager.get_statistics() == {"total": 2, "todo": 0, "in_progress": 1, "done": 1}
+
+
+def test_bulk_ids_are_unique(manager):
+    """Сотня задач создаётся в одну миллисекунду - ID всё равно разные"""
+    tasks = manager.add_tasks((f"Задача {i}", "") for i in range(100))
+
+    assert len({t.id for t in tasks}) == 100
+
+
+def test_changes_are_persisted(manager, tmp_path):
+    task = manager.add_task("Купить молоко", "2 литра")
+    manager.update_status(task.id, "done")
+
+    reopened = TaskManager(TaskStore(str(tmp_path / "tasks.db")))
+
+    assert reopened.tasks[task.id].status == "done"
+    assert reopened.status_counts["done"] == 1
+
+
+def test_unknown_task(manager):
+    assert manager.update_status(12345, "done") == False
+    assert manager.delete_task(12345) == False
+
+
+def test_old_json_is_migrated(tmp_path, monkeypatch):
+    old = tmp_path / "tasks.json"
+    old.write_text('[{"id": 1, "title": "Старая", "description": "", "status": "done", '
+                   '"created_at": "2025-11-16 10:00:00"}]', encoding="utf-8")
+    monkeypatch.setattr(github_todo_manager, "TASKS_FILE", str(old))
+
+    manager = TaskManager(TaskStore(str(tmp_path / "tasks.db")))
+
+    assert manager.tasks[1].title == "Старая"
+    assert manager.status_counts["done"] == 1
@@ -0,0 +1,59 @@
+import json
+import pytest
+from task_store import TaskStore
+
+
+def make_task(task_id, title, status="todo"):
+    return {"id": task_id, "title": title, "description": "", "status": status,
+            "created_at": "2025-11-16 10:00:00"}
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Фикстура: хранилище во временной папке с тремя задачами"""
+    store = TaskStore(str(tmp_path / "tasks.db"))
+    store.insert([make_task(1, "Купить молоко"), make_task(2, "Сделать уроки", "done"),
+                  make_task(3, "Позвонить другу", "in_progress")])
+    yield store
+    store.close()
+
+
+def test_load_and_counts(store):
+    assert [t["title"] for t in store.load()] == ["Купить молоко", "Сделать уроки", "Позвонить другу"]
+    assert store.count() == 3
+    assert store.count_by_status() == {"todo": 1, "done": 1, "in_progress": 1}
+
+
+def test_update_status_changes_one_row(store):
+    assert store.update_status(1, "done") == True
+    assert store.update_status(999, "done") == False
+    assert store.count_by_status() == {"done": 2, "in_progress": 1}
+
+
+def test_delete(store):
+    assert store.delete(2) == True
+    assert store.delete(2) == False
+    assert [t["id"] for t in store.load()] == [1, 3]
+
+
+def test_data_survives_reopen(tmp_path):
+    path = str(tmp_path / "tasks.db")
+    store = TaskStore(path)
+    store.insert([make_task(1, "Задача")])
+    store.close()
+
+    reopened = TaskStore(path)
+    assert reopened.load()[0]["title"] == "Задача"
+    reopened.close()
+
+
+def test_import_json(tmp_path):
+    """Старый tasks.json переносится целиком"""
+    old = tmp_path / "tasks.json"
+    old.write_text(json.dumps([make_task(1, "Старая задача", "done")], ensure_ascii=False), encoding="utf-8")
+    store = TaskStore(str(tmp_path / "tasks.db"))
+
+    assert store.import_json(str(old)) == 1
+    assert store.import_json(str(tmp_path / "нет.json")) == 0
+    assert store.count_by_status() == {"done": 1}
+    store.close()
@@ -1,7 +1,25 @@
 class Task:
     def __init__(self, title , completed = False):
         self.title = title
-        self.completed  = completed
+        self._completed = bool(completed)
+        # Кому сообщать о смене статуса (TaskManager подписывается при add_task)
+        self._observers = []
+
+    @property
+    def completed(self):
+        return self._completed
+
+    @completed.setter
+    def completed(self, value):
+        # task.completed = True работает так же как mark_completed()
+        # bool(): completed = 1 или "да" - тоже True, иначе задача
+        # попала бы не в тот набор менеджера
+        value = bool(value)
+        if value == self._completed:
+            return
+        self._completed = value
+        for observer in self._observers:
+            observer(self)
 
     def mark_completed(self):
         self.completed = True
@@ -9,49 +27,166 @@ class Task:
     def mark_incomolete(self):
         self.completed = False
 
+class TaskList(list):
+    """
+    Список задач менеджера - обычный list
+
+    Его можно менять и напрямую (tasks.append, tasks.clear, del tasks[0] ...):
+    после такого изменения менеджер заново строит индексы - O(n).
+    Методы TaskManager обновляют индексы сами и перестройки не вызывают
+    """
+
+    def __init__(self, on_change):
+        super().__init__()
+        self._on_change = on_change
+
+    # Для TaskManager: изменить список без перестройки индексов
+    def _add(self, task):
+        list.append(self, task)
+
+    def _discard(self, task):
+        list.remove(self, task)
+
+    def _replace(self, tasks):
+        list.__setitem__(self, slice(None), tasks)
+
+
+def _rebuilds_index(name):
+    method = getattr(list, name)
+
+    def changed(self, *args):
+        result = method(self, *args)
+        self._on_change()
+        return result
+
+    changed.__name__ = name
+    return changed
+
+
+# Всё, что меняет состав списка (sort/reverse только переставляют - не нужно)
+for _name in ("append", "extend", "insert", "remove", "pop", "clear",
+              "__setitem__", "__delitem__", "__iadd__", "__imul__"):
+    setattr(TaskList, _name, _rebuilds_index(_name))
+
+
 class TaskManager:
+    """
+    Список задач с индексами
+
+    КАК РАБОТАЕТ:
+    - tasks: список задач в порядке добавления (как и раньше, обычный list)
+    - _by_title: название -> задачи с этим названием (обычно одна)
+    - _completed / _incomplete: задачи по статусу
+      (dict без значений = множество, которое помнит порядок добавления)
+    - Task сообщает менеджеру о mark_completed / mark_incomolete,
+      и задача переезжает из одного набора в другой
+
+    Поиск и подсчёты - O(1), удаление - O(n) (задачу надо вынуть из списка),
+    clear_completed - один проход по списку.
+    Название задачи после добавления не меняем - по нему построен индекс
+    """
+
     def __init__(self):
-        self.tasks = []
+        self._tasks = TaskList(self._reindex)
+        self._by_title = {}    # название -> [задачи]
+        self._completed = {}
+        self._incomplete = {}
+
+    @property
+    def tasks(self):
+        """Все задачи в порядке добавления"""
+        return self._tasks
+
+    @tasks.setter
+    def tasks(self, tasks):
+        # manager.tasks = [...] - заменить содержимое, индексы перестроятся
+        self._tasks[:] = tasks
+
+    def _bucket(self, task):
+        return self._completed if task.completed else self._incomplete
+
+    def _on_status_change(self, task):
+        # Статус уже поменялся - убираем из старого набора, кладём в новый
+        old = self._incomplete if task.completed else self._completed
+        del old[task]
+        self._bucket(task)[task] = None
+
+    def _index(self, task):
+        self._by_title.setdefault(task.title, []).append(task)
+        self._bucket(task)[task] = None
+        task._observers.append(self._on_status_change)
+
+    def _unindex(self, task):
+        del self._bucket(task)[task]
+
+        same_title = self._by_title[task.title]
+        same_title.remove(task)
+        if not same_title:
+            del self._by_title[task.title]
+
+        task._observers.remove(self._on_status_change)
+
+    def _reindex(self):
+        """Список изменили напрямую - построить индексы заново"""
+        for bucket in (self._completed, self._incomplete):
+            for task in bucket:
+                task._observers.remove(self._on_status_change)
+        self._by_title = {}
+        self._completed = {}
+        self._incomplete = {}
+        # Одна и та же задача могла попасть в список дважды - индексируем один раз
+        for task in dict.fromkeys(self._tasks):
+            self._index(task)
 
     def add_task(self, title):
         task = Task(title)
-        self.tasks.append(task)
+        self._tasks._add(task)
+        self._index(task)
         return task
 
     def remowe_task(self, title):
-        for task in self.tasks:
-            if task.title == title:
-                self.tasks.remove(task)
-                return True
-        return False
+        task = self.get_task(title)
+        if task is None:
+            return False
+        self._tasks._discard(task)
+        if task not in self._tasks:  # Та же задача могла быть в списке дважды
+            self._unindex(task)
+        return True
 
     def get_task(self, title):
-        for task in self.tasks:
-            if task.title == title:
-                return task
-        return None
-    
+        # Как и раньше, при одинаковых названиях - первая добавленная
+        same_title = self._by_title.get(title)
+        return same_title[0] if same_title else None
+
     def get_all_tasks(self):
         return self.tasks
 
-    
+
     def get_completed_tasks(self):
         """Получить только выполненные"""
-        return [task for task in self.tasks if task.completed]
-    
+        return list(self._completed)
+
     def get_incomplete_tasks(self):
         """Получить только невыполненные"""
-        return [task for task in self.tasks if not task.completed]
-    
+        return list(self._incomplete)
+
     def count_tasks(self):
         """Подсчитать все задачи"""
-        return len(self.tasks)
-    
+        return len(self._tasks)
+
     def count_completed(self):
         """Подсчитать выполненные"""
-        return len(self.get_completed_tasks())
-    
+        return len(self._completed)
+
+    def clear(self):
+        """Удалить все задачи"""
+        self._tasks.clear()
+
     def clear_completed(self):
         """Удалить все выполненные задачи"""
-        self.tasks = [task for task in self.tasks if not task.completed]
-
+        completed = self._completed
+        if not completed:
+            return
+        self._tasks._replace([task for task in self._tasks if task not in completed])
+        for task in list(completed):
+            self._unindex(task)
@@ -195,4 +195,115 @@ def manager_with_cleanup():
 def test_with_cleanup(manager_with_cleanup):
     """Тест с очисткой"""
     assert manager_with_cleanup.count_tasks() == 1
-    # После этого теста выполнится код после yield
\ No newline at end of file
+    # После этого теста выполнится код после yield
+
+
+def test_status_sets_follow_task(manager_with_tasks):
+    """mark_completed / mark_incomolete переносят задачу между наборами"""
+    task = manager_with_tasks.get_task("Сделать уроки")
+
+    task.mark_completed()
+    assert manager_with_tasks.count_completed() == 1
+    assert manager_with_tasks.get_completed_tasks() == [task]
+
+    task.mark_incomolete()
+    assert manager_with_tasks.count_completed() == 0
+    assert len(manager_with_tasks.get_incomplete_tasks()) == 3
+
+
+def test_completed_assignment_updates_counts(manager_with_tasks):
+    """Прямое присваивание task.completed тоже учитывается"""
+    task = manager_with_tasks.get_task("Купить молоко")
+
+    task.completed = True
+    task.completed = True  # Повторно - ничего не меняется
+
+    assert manager_with_tasks.count_completed() == 1
+
+
+def test_duplicate_titles(empty_manager):
+    """При одинаковых названиях get_task и удаление берут первую задачу"""
+    first = empty_manager.add_task("Задача")
+    second = empty_manager.add_task("Задача")
+
+    assert empty_manager.get_task("Задача") is first
+    assert empty_manager.remowe_task("Задача") == True
+    assert empty_manager.get_task("Задача") is second
+
+
+def test_removed_task_is_detached(manager_with_tasks):
+    """Удалённая задача больше не влияет на счётчики менеджера"""
+    task = manager_with_tasks.get_task("Позвонить другу")
+    manager_with_tasks.remowe_task("Позвонить другу")
+
+    task.mark_completed()
+
+    assert manager_with_tasks.count_completed() == 0
+    assert manager_with_tasks.get_task("Позвонить другу") is None
+
+
+def test_clear_completed_keeps_order(empty_manager):
+    tasks = [empty_manager.add_task(f"Задача {i}") for i in range(6)]
+    for task in tasks[::2]:
+        task.mark_completed()
+
+    empty_manager.clear_completed()
+
+    assert [t.title for t in empty_manager.get_all_tasks()] == ["Задача 1", "Задача 3", "Задача 5"]
+    assert empty_manager.get_task("Задача 0") is None
+
+
+def test_clear_removes_everything(manager_with_tasks):
+    task = manager_with_tasks.get_task("Купить молоко")
+
+    manager_with_tasks.clear()
+    task.mark_completed()  # Задача уже не в менеджере
+
+    assert manager_with_tasks.count_tasks() == 0
+    assert manager_with_tasks.count_completed() == 0
+    assert manager_with_tasks.get_task("Купить молоко") is None
+
+
+def test_tasks_is_a_list(manager_with_tasks):
+    """tasks - по-прежнему list: его можно менять напрямую"""
+    assert isinstance(manager_with_tasks.tasks, list)
+    assert manager_with_tasks.get_all_tasks() is manager_with_tasks.tasks
+
+
+def test_direct_list_changes_update_indexes(manager_with_tasks):
+    """tasks.append / del / clear / присваивание - поиск и счётчики не отстают"""
+    manager = manager_with_tasks
+    extra = Task("Новая", completed=True)
+
+    manager.tasks.append(extra)
+    assert manager.get_task("Новая") is extra
+    assert manager.count_completed() == 1
+
+    del manager.tasks[0]
+    assert manager.get_task("Купить молоко") is None
+    assert manager.count_tasks() == 3
+
+    extra.mark_incomolete()
+    assert manager.count_completed() == 0
+
+    manager.tasks = [extra]
+    assert manager.get_incomplete_tasks() == [extra]
+    assert manager.get_task("Позвонить другу") is None
+
+    manager.tasks.clear()
+    extra.mark_completed()  # Задача уже не в менеджере
+    assert manager.count_completed() == 0
+    assert manager.get_task("Новая") is None
+
+
+def test_truthy_completed_value(manager_with_tasks):
+    """completed = 1 - то же что True: задача не теряется между наборами"""
+    task = manager_with_tasks.get_task("Купить молоко")
+
+    task.completed = 1
+    assert task.completed is True
+    assert manager_with_tasks.count_completed() == 1
+
+    task.completed = True  # Уже выполнена - ничего не меняется
+    task.mark_incomolete()
+    assert manager_with_tasks.count_completed() == 0
@@ -0,0 +1,196 @@
+import json
+import math
+from datetime import date
+from money import to_minor, from_minor, to_number
+from reports import bucket_key
+from storage import atomic_write_json
+from transaction import DEFAULT_CURRENCY, CURRENCY_NAMES
+
+
+class RunningStats:
+    """
+    Среднее и дисперсия "на лету" (алгоритм Уэлфорда)
+
+    ПРОБЛЕМА:
+    Посчитать среднее и разброс заново = пройти всю историю, O(n).
+
+    КАК РАБОТАЕТ:
+    Храним только три числа: count, mean и m2 (сумма квадратов отклонений).
+    Каждое новое значение обновляет их за O(1):
+        delta = x - mean
+        mean += delta / count
+        m2   += delta * (x - mean)
+    Дисперсия = m2 / (count - 1). Так же за O(1) значение можно и убрать.
+    """
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def remove(self, value):
+        # Тот же шаг в обратную сторону
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        old_mean = (self.count * self.mean - value) / (self.count - 1)
+        self.m2 -= (value - old_mean) * (value - self.mean)
+        self.mean = old_mean
+        self.count -= 1
+        self.m2 = max(self.m2, 0.0)  # Погрешность float не должна сделать его отрицательным
+
+    @property
+    def std(self):
+        """Стандартное отклонение (выборочное). 0 пока значений меньше двух"""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self.m2 / (self.count - 1))
+
+
+class AlertMonitor:
+    """
+    Бюджеты по категориям и всплески трат - проверка при каждой записи
+
+    ПРАВИЛА:
+    - budget: расходы категории за месяц транзакции превысили бюджет.
+              Бюджеты - в валюте currency (по умолчанию рубли): расходы
+              в других валютах в них не входят, без курса их не сравнить
+    - spike:  расход больше среднего по категории на spike_sigma стандартных
+              отклонений (по умолчанию 3σ). Проверяем только когда у категории
+              уже есть min_history расходов - по трём покупкам выводов не делаем
+
+    КАК РАБОТАЕТ:
+    Для каждой пары (категория, валюта) - RunningStats по расходам (в копейках),
+    для каждой тройки (месяц, категория, валюта) - потраченная сумма.
+    check() смотрит на состояние ДО транзакции, add()/remove() его обновляют.
+    Всё за O(1) на транзакцию, сколько бы ни было истории.
+
+    ПРЕДУПРЕЖДЕНИЕ - словарь:
+        {"kind": "budget" | "spike", "category": ..., "transaction_id": ..., "message": ...}
+    """
+
+    def __init__(self, spike_sigma=3.0, min_history=10, currency=DEFAULT_CURRENCY):
+        self.spike_sigma = spike_sigma
+        self.min_history = min_history
+        self.currency = currency  # Валюта бюджетов
+        self.budgets = {}       # категория -> бюджет на месяц (копейки)
+        self._stats = {}        # (категория, валюта) -> RunningStats расходов
+        self._month_spent = {}  # (месяц "2025-11", категория, валюта) -> расходы (копейки)
+
+    @staticmethod
+    def _month(transaction):
+        return bucket_key(date.fromtimestamp(transaction.timestamp), "month")
+
+    def set_budget(self, category, amount):
+        self.budgets[category] = to_minor(amount)
+
+    def remove_budget(self, category):
+        self.budgets.pop(category, None)
+
+    def get_stats(self, category, currency=DEFAULT_CURRENCY):
+        """Среднее и отклонение расходов категории в валюте (RunningStats) или None"""
+        return self._stats.get((category, currency))
+
+    def get_month_spent(self, category, month, currency=None):
+        """Расходы категории за месяц "2025-11" (Decimal), по умолчанию в валюте бюджетов"""
+        currency = self.currency if currency is None else currency
+        return from_minor(self._month_spent.get((month, category, currency), 0))
+
+    def check(self, transaction):
+        """Предупреждения для транзакции, которую собираются добавить (список)"""
+        if transaction.transaction_type != "expense":
+            return []
+
+        alerts = []
+        category = transaction.category
+        currency = transaction.currency
+        amount = transaction.amount_minor
+        name = CURRENCY_NAMES.get(currency, currency)
+
+        stats = self._stats.get((category, currency))
+        if stats is not None and stats.count >= self.min_history:
+            threshold = stats.mean + self.spike_sigma * stats.std
+            if amount > threshold:
+                alerts.append({
+                    "kind": "spike",
+                    "category": category,
+                    "transaction_id": transaction.id,
+                    "message": (f"Необычно крупный расход в '{category}': {transaction.amount} {name} "
+                                f"(обычно около {from_minor(round(stats.mean))} {name})"),
+                })
+
+        budget = self.budgets.get(category)
+        if budget is not None and currency == self.currency:
+            month = self._month(transaction)
+            spent = self._month_spent.get((month, category, currency), 0) + amount
+            if spent > budget:
+                alerts.append({
+                    "kind": "budget",
+                    "category": category,
+                    "transaction_id": transaction.id,
+                    "message": (f"Бюджет '{category}' на {month} превышен: "
+                                f"{from_minor(spent)} из {from_minor(budget)} {name}"),
+                })
+
+        return alerts
+
+    def add(self, transaction):
+        if transaction.transaction_type != "expense":
+            return
+        stats_key = (transaction.category, transaction.currency)
+        stats = self._stats.get(stats_key)
+        if stats is None:
+            stats = RunningStats()
+            self._stats[stats_key] = stats
+        stats.add(transaction.amount_minor)
+
+        key = (self._month(transaction), transaction.category, transaction.currency)
+        self._month_spent[key] = self._month_spent.get(key, 0) + transaction.amount_minor
+
+    def remove(self, transaction):
+        if transaction.transaction_type != "expense":
+            return
+        stats_key = (transaction.category, transaction.currency)
+        stats = self._stats[stats_key]
+        stats.remove(transaction.amount_minor)
+        if stats.count == 0:
+            del self._stats[stats_key]
+
+        key = (self._month(transaction), transaction.category, transaction.currency)
+        self._month_spent[key] -= transaction.amount_minor
+        if self._month_spent[key] == 0:
+            del self._month_spent[key]
+
+    def rebuild(self, transactions):
+        """Пересчитать состояние с нуля (после загрузки), бюджеты сохраняются"""
+        self._stats = {}
+        self._month_spent = {}
+        for t in transactions:
+            self.add(t)
+
+
+def load_budgets(filename):
+    """
+    Бюджеты из JSON файла: {"Еда": 15000, "Транспорт": 3000}
+
+    Нет файла - бюджетов нет
+    """
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_budgets(filename, budgets):
+    """Записать бюджеты (Decimal -> число, как суммы транзакций в JSON)"""
+    atomic_write_json(filename, {category: to_number(to_minor(amount))
+                                 for category, amount in budgets.items()})
@@ -0,0 +1,89 @@
+"""
+Открытие большого журнала: BinaryLedger (mmap) против JSON
+
+ЗАПУСК:
+python benchmark_binary.py            # 5 000 000 транзакций
+python benchmark_binary.py 100000
+
+Открытие меряем в отдельном процессе - чтобы память, потраченная
+на создание файла, не попала в замер.
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from binary_ledger import BinaryLedger
+from transaction import Transaction
+
+CATEGORIES = ["Еда", "Транспорт", "Развлечения", "Здоровье", "Зарплата"]
+
+
+def generate(count):
+    # Генератор - миллионы Transaction не лежат в памяти одновременно
+    for i in range(count):
+        yield Transaction.create_validated(
+            i % 1000 + 1,
+            CATEGORIES[i % len(CATEGORIES)],
+            f"Строка {i}",
+            "income" if i % 10 == 0 else "expense",
+            1700000000 + i,
+        )
+
+
+def rss_mb():
+    # Текущая память процесса (Linux); на других системах - максимум за всё время
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except FileNotFoundError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def open_ledger(path):
+    """Запускается в отдельном процессе: открыть, прочитать пару записей"""
+    before = rss_mb()
+
+    start = time.perf_counter()
+    ledger = BinaryLedger(path)
+    opened = time.perf_counter() - start
+
+    start = time.perf_counter()
+    middle = ledger[len(ledger) // 2]
+    last = ledger[-1]
+    accessed = time.perf_counter() - start
+
+    print(f"Записей:                 {len(ledger)}")
+    print(f"Открытие:                {opened * 1000:8.2f} мс")
+    print(f"Две записи (середина, конец): {accessed * 1000:8.3f} мс  ({middle.id}, {last.id})")
+    print(f"Память после открытия:   +{rss_mb() - before:.1f} МБ")
+
+    start = time.perf_counter()
+    totals = ledger.totals()
+    print(f"totals() по всем записям: {time.perf_counter() - start:8.2f} с  {totals}")
+    ledger.close()
+
+
+def main(count):
+    print(f"=== BinaryLedger на {count} транзакций ===\n")
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "ledger.bin")
+
+        start = time.perf_counter()
+        BinaryLedger.create(path, generate(count)).close()
+        size = os.path.getsize(path) / 1024 / 1024
+        print(f"Создание: {time.perf_counter() - start:.1f} с, файл записей {size:.0f} МБ\n")
+
+        subprocess.run([sys.executable, __file__, "--open", path], check=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--open":
+        open_ledger(sys.argv[2])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000)
@@ -0,0 +1,73 @@
+"""
+Сравнение скорости: add_transaction по одной строке vs add_transactions пачкой
+
+ЗАПУСК:
+python benchmark_bulk.py          # 100 000 строк
+python benchmark_bulk.py 10000
+
+По одной строке с JsonFileStorage каждое добавление переписывает весь файл (O(n²)),
+поэтому этот вариант меряем на первых PER_ROW_JSON_LIMIT строках.
+"""
+import os
+import sys
+import tempfile
+import time
+from finance_manager import FinanceManager
+from storage import JournalStorage
+
+PER_ROW_JSON_LIMIT = 500
+
+CATEGORIES = ["Еда", "Транспорт", "Развлечения", "Здоровье", "Зарплата"]
+
+
+def make_rows(count):
+    return [
+        {
+            "amount": i % 1000 + 1,
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "description": f"Строка {i}",
+            "transaction_type": "income" if i % 10 == 0 else "expense",
+        }
+        for i in range(count)
+    ]
+
+
+def timed(label, count, action):
+    start = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - start
+    print(f"{label:45} {elapsed:8.2f} с  ({count / elapsed:10.0f} строк/с)")
+
+
+def per_row(manager, rows):
+    for row in rows:
+        manager.add_transaction(**row)
+
+
+def main(count):
+    rows = make_rows(count)
+    print(f"=== Добавление {count} строк ===\n")
+
+    with tempfile.TemporaryDirectory() as folder:
+        def new_manager(name, journal=False):
+            path = os.path.join(folder, name)
+            storage = JournalStorage(path, compact_every=count + 1) if journal else None
+            return FinanceManager(path, storage=storage)
+
+        json_rows = rows[:PER_ROW_JSON_LIMIT]
+        manager = new_manager("per_row.json")
+        timed(f"По одной, JsonFileStorage ({len(json_rows)} строк)", len(json_rows),
+              lambda: per_row(manager, json_rows))
+
+        manager = new_manager("per_row_journal.json", journal=True)
+        timed("По одной, JournalStorage", count, lambda: per_row(manager, rows))
+
+        manager = new_manager("bulk.json")
+        timed("add_transactions, JsonFileStorage", count, lambda: manager.add_transactions(rows))
+
+        manager = new_manager("bulk_journal.json", journal=True)
+        timed("add_transactions, JournalStorage", count, lambda: manager.add_transactions(rows))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,65 @@
+"""
+Сравнение памяти: объекты с __dict__ / Transaction со __slots__ / TransactionTable
+
+ЗАПУСК:
+python benchmark_memory.py          # 100 000 транзакций
+python benchmark_memory.py 1000000  # миллион
+
+tracemalloc считает сколько памяти выделил Python пока строились объекты
+"""
+import sys
+import tracemalloc
+from datetime import datetime
+from transaction import Transaction
+
+
+class DictTransaction:
+    """Старая версия Transaction: обычный класс (поля в __dict__) и дата строкой"""
+
+    def __init__(self, amount, category, description="", transaction_type="expense"):
+        self.amount = amount
+        self.category = category
+        self.description = description
+        self.transaction_type = transaction_type
+        self.date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.id = int(datetime.now().timestamp() * 1000)
+
+
+CATEGORIES = ["Еда", "Транспорт", "Развлечения", "Здоровье", "Зарплата"]
+
+
+def measure(build):
+    """Вернуть (результат, сколько байт выделено)"""
+    tracemalloc.start()
+    result = build()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def build_list(cls, count):
+    return [cls(i % 1000 + 1, CATEGORIES[i % len(CATEGORIES)], "Описание") for i in range(count)]
+
+
+def main(count):
+    print(f"=== Память на {count} транзакций ===\n")
+
+    _, dict_bytes = measure(lambda: build_list(DictTransaction, count))
+    print(f"{'Класс с __dict__':25} {dict_bytes / 1024 / 1024:8.1f} МБ")
+
+    transactions, slots_bytes = measure(lambda: build_list(Transaction, count))
+    print(f"{'Transaction (__slots__)':25} {slots_bytes / 1024 / 1024:8.1f} МБ")
+
+    try:
+        from transaction_table import TransactionTable
+    except ImportError:
+        print(f"{'TransactionTable':25} (нужен numpy)")
+        return
+
+    table, table_bytes = measure(lambda: TransactionTable.from_transactions(transactions))
+    print(f"{'TransactionTable':25} {table_bytes / 1024 / 1024:8.1f} МБ"
+          f"  (массивы: {table.nbytes / 1024 / 1024:.1f} МБ)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,44 @@
+"""
+Сумма миллионов транзакций: float vs целые копейки (money.py)
+
+ЗАПУСК:
+python benchmark_money.py            # 10 000 000 сумм
+python benchmark_money.py 1000000
+
+Показывает скорость и погрешность: float "уплывает",
+копейки в array('q') складываются точно.
+"""
+import sys
+import time
+from decimal import Decimal
+from money import minor_array, sum_minor, from_minor, to_minor
+
+
+def timed(label, action):
+    start = time.perf_counter()
+    result = action()
+    elapsed = time.perf_counter() - start
+    print(f"{label:35} {elapsed:8.3f} с  итог: {result}")
+    return result
+
+
+def main(count):
+    print(f"=== Сумма {count} сумм ===\n")
+
+    # 0.10, 0.20 ... 99.90 руб - в двоичном float почти ни одна не точна
+    floats = [(i % 999 + 1) / 10 for i in range(count)]
+    minors = minor_array(to_minor(Decimal(i % 999 + 1) / 10) for i in range(count))
+
+    float_total = timed("sum(list float)", lambda: sum(floats))
+    minor_total = timed("sum_minor(array('q'))", lambda: sum_minor(minors))
+
+    exact = from_minor(minor_total)
+    print(f"\nТочная сумма:        {exact}")
+    print(f"Погрешность float:   {Decimal(float_total) - exact}")
+    # Список: 8 байт указатель + 24 байта объект float на каждую сумму
+    print(f"Память list float:   {count * (8 + 24) // 1024 // 1024} МБ")
+    print(f"Память array('q'):   {minors.itemsize * len(minors) // 1024 // 1024} МБ")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
@@ -0,0 +1,71 @@
+"""
+Скорость FinanceManager.search на большом журнале
+
+ЗАПУСК:
+python benchmark_search.py            # 1 000 000 транзакций
+python benchmark_search.py 100000
+
+Сравнивает поиск по индексу с перебором всех описаний (как было бы без индекса).
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from finance_manager import FinanceManager
+from storage import JournalStorage
+
+WORDS = ["хлеб", "молоко", "метро", "такси", "кафе", "кино", "аптека", "бензин", "подарок", "книга"]
+CATEGORIES = ["Еда", "Транспорт", "Развлечения"]
+
+QUERIES = [
+    ("хлеб", {}),
+    ("хлеб", {"category": "Еда"}),
+    ("хлеб метро", {}),
+    ("кни", {}),
+    ("чек12345", {}),
+    ("хлеб метро кино", {}),
+]
+
+
+def make_rows(count):
+    random.seed(1)
+    return [
+        {
+            "amount": i % 1000 + 1,
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "description": f"{random.choice(WORDS)} {random.choice(WORDS)} чек{i}",
+        }
+        for i in range(count)
+    ]
+
+
+def timed(label, action):
+    start = time.perf_counter()
+    result = action()
+    elapsed = time.perf_counter() - start
+    print(f"{label:50} {elapsed * 1000:10.2f} мс  ({len(result)} найдено)")
+
+
+def main(count):
+    print(f"=== Поиск среди {count} транзакций ===\n")
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "search.json")
+        manager = FinanceManager(path, storage=JournalStorage(path, compact_every=count + 1))
+        manager.add_transactions(make_rows(count))
+
+        # Первый поиск сортирует список слов после загрузки - меряем отдельно
+        timed("первый поиск после загрузки", lambda: manager.search("хлеб", limit=20))
+
+        for query, filters in QUERIES:
+            timed(f"search({query!r}, limit=20, {filters})",
+                  lambda: manager.search(query, limit=20, **filters))
+
+        timed("перебор описаний ('хлеб', limit=20)", lambda: [
+            t for t in manager.get_all_transactions() if "хлеб" in t.description.casefold()
+        ][:20])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,294 @@
+"""
+Набор замеров скорости FinanceManager + сравнение с сохранённой базой (baseline)
+
+ЗАЧЕМ:
+Тесты проверяют что код правильный, но не что он быстрый.
+save_to_file и get_statistics уже дважды незаметно замедлялись.
+
+ЗАПУСК:
+python benchmark_suite.py run                          # 1k и 100k строк
+python benchmark_suite.py run --sizes 1000 100000 1000000
+python benchmark_suite.py run --save baseline.json     # запомнить как базу
+python benchmark_suite.py compare baseline.json        # замерить и сравнить с базой
+python benchmark_suite.py compare baseline.json current.json   # сравнить два файла
+
+compare завершается с кодом 1, если что-то стало медленнее базы
+больше чем на --threshold (по умолчанию 25%) - удобно для CI.
+
+Данные синтетические, но одинаковые при каждом запуске:
+генератор случайных чисел с фиксированным seed.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from finance_manager import FinanceManager
+from storage import JsonFileStorage
+
+SEED = 42
+DEFAULT_SIZES = (1000, 100_000)
+DEFAULT_THRESHOLD = 0.25
+
+CATEGORIES = ["Еда", "Транспорт", "Развлечения", "Здоровье", "Образование",
+              "Коммунальные услуги", "Одежда", "Зарплата", "Фриланс", "Другое"]
+WORDS = ["хлеб", "молоко", "метро", "такси", "кафе", "кино", "аптека", "бензин", "подарок", "книга"]
+
+# Сколько операций делать в замерах "по одной" - удаление и статистика
+# не зависят от размера журнала, поэтому весь журнал перебирать незачем
+REMOVE_COUNT = 1000
+STATS_COUNT = 1000
+
+
+class MemoryStorage:
+    """
+    Хранилище, которое ничего не пишет
+
+    Замеры add/remove/stats меряют сам FinanceManager, а не диск.
+    Запись на диск меряют save и load
+    """
+
+    def load(self):
+        raise FileNotFoundError
+
+    def save_all(self, transactions):
+        pass
+
+    def record_changes(self, transactions, added=(), removed_ids=()):
+        pass
+
+
+def make_ledger(count, seed=SEED):
+    """
+    Синтетический журнал: список словарей для add_transactions
+
+    Один seed - одни и те же строки при каждом запуске
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1).timestamp()
+    rows = []
+    for _ in range(count):
+        is_income = rng.random() < 0.1
+        rows.append({
+            "amount": rng.randint(100, 500_000) / 100,
+            "category": rng.choice(CATEGORIES),
+            "description": f"{rng.choice(WORDS)} {rng.choice(WORDS)}",
+            "transaction_type": "income" if is_income else "expense",
+            "date": datetime.fromtimestamp(start + rng.randint(0, 2 * 365 * 86400)).strftime("%Y-%m-%d %H:%M:%S"),
+        })
+    return rows
+
+
+def quiet_manager(filename, storage):
+    # FinanceManager печатает "Загружено ..." - в замерах это лишний шум
+    with redirect_stdout(io.StringIO()):
+        return FinanceManager(filename, storage=storage)
+
+
+# ==========================================
+# ЗАМЕРЫ
+# Каждый получает строки журнала и папку, возвращает (секунды, операций)
+# ==========================================
+
+def bench_add(rows, folder):
+    manager = quiet_manager("memory", MemoryStorage())
+    start = time.perf_counter()
+    for row in rows:
+        manager.add_transaction(row["amount"], row["category"],
+                                row["description"], row["transaction_type"])
+    return time.perf_counter() - start, len(rows)
+
+
+def bench_bulk_add(rows, folder):
+    manager = quiet_manager("memory", MemoryStorage())
+    start = time.perf_counter()
+    manager.add_transactions(rows)
+    return time.perf_counter() - start, len(rows)
+
+
+def bench_remove(rows, folder):
+    manager = quiet_manager("memory", MemoryStorage())
+    transactions = manager.add_transactions(rows)
+    # Удаляем из разных мест журнала, а не только с конца
+    ids = [t.id for t in random.Random(SEED).sample(transactions, min(REMOVE_COUNT, len(transactions)))]
+
+    start = time.perf_counter()
+    for transaction_id in ids:
+        manager.remove_transaction(transaction_id)
+    return time.perf_counter() - start, len(ids)
+
+
+def bench_stats(rows, folder):
+    manager = quiet_manager("memory", MemoryStorage())
+    manager.add_transactions(rows)
+    start = time.perf_counter()
+    for _ in range(STATS_COUNT):
+        manager.get_statistics()
+    return time.perf_counter() - start, STATS_COUNT
+
+
+def _saved_manager(rows, folder):
+    path = os.path.join(folder, "ledger.json")
+    manager = quiet_manager(path, JsonFileStorage(path))
+    manager.storage = MemoryStorage()  # Без записи на каждое добавление
+    manager.add_transactions(rows)
+    manager.storage = JsonFileStorage(path)
+    return manager, path
+
+
+def bench_save(rows, folder):
+    manager, _ = _saved_manager(rows, folder)
+    start = time.perf_counter()
+    manager.save_to_file()
+    return time.perf_counter() - start, len(rows)
+
+
+def bench_load(rows, folder):
+    manager, path = _saved_manager(rows, folder)
+    manager.save_to_file()
+    start = time.perf_counter()
+    quiet_manager(path, JsonFileStorage(path))
+    return time.perf_counter() - start, len(rows)
+
+
+def bench_export(rows, folder):
+    manager, _ = _saved_manager(rows, folder)
+    start = time.perf_counter()
+    manager.export_csv(os.path.join(folder, "export.csv"))
+    return time.perf_counter() - start, len(rows)
+
+
+BENCHMARKS = {
+    "add": bench_add,
+    "bulk_add": bench_bulk_add,
+    "remove": bench_remove,
+    "stats": bench_stats,
+    "save": bench_save,
+    "load": bench_load,
+    "export": bench_export,
+}
+
+
+def run(sizes=DEFAULT_SIZES, names=None, repeat=3, seed=SEED, progress=print):
+    """
+    Выполнить замеры
+
+    Из repeat повторов берём лучший: медленные выбросы - это чаще
+    соседние процессы, чем наш код
+
+    ВОЗВРАЩАЕТ:
+    {"meta": {...}, "results": {"add@1000": {"seconds": ..., "ops_per_sec": ...}, ...}}
+    """
+    results = {}
+    for size in sizes:
+        rows = make_ledger(size, seed)
+        for name in names or BENCHMARKS:
+            best = None
+            for _ in range(repeat):
+                with tempfile.TemporaryDirectory() as folder:
+                    seconds, operations = BENCHMARKS[name](rows, folder)
+                if best is None or seconds < best[0]:
+                    best = (seconds, operations)
+
+            seconds, operations = best
+            key = f"{name}@{size}"
+            results[key] = {
+                "seconds": seconds,
+                "operations": operations,
+                "ops_per_sec": operations / seconds if seconds else float("inf"),
+            }
+            if progress:
+                progress(f"{key:20} {seconds:10.4f} с  {results[key]['ops_per_sec']:14.0f} оп/с")
+
+    return {
+        "meta": {
+            "seed": seed,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Сравнить два набора замеров
+
+    Сравниваем операции в секунду (они не зависят от числа повторов)
+
+    ВОЗВРАЩАЕТ:
+    Список строк (name, было оп/с, стало оп/с, во сколько раз медленнее)
+    только для замеров, которые замедлились больше чем на threshold
+    Замеры, которых нет в одном из наборов, пропускаются
+    """
+    regressions = []
+    for name, old in baseline["results"].items():
+        new = current["results"].get(name)
+        if new is None:
+            continue
+        slowdown = old["ops_per_sec"] / new["ops_per_sec"]
+        if slowdown > 1 + threshold:
+            regressions.append((name, old["ops_per_sec"], new["ops_per_sec"], slowdown))
+    return regressions
+
+
+def load_results(filename):
+    with open(filename, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_results(filename, results):
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры скорости FinanceManager")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="замерить")
+    compare_parser = commands.add_parser("compare", help="замерить и сравнить с базой")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current", nargs="?", help="готовый файл замеров вместо нового запуска")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    for sub in (run_parser, compare_parser):
+        sub.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+        sub.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="только эти замеры")
+        sub.add_argument("--repeat", type=int, default=3)
+        sub.add_argument("--save", help="записать замеры в JSON файл")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare" and args.current:
+        current = load_results(args.current)
+    else:
+        current = run(args.sizes, args.only, args.repeat)
+    if args.save:
+        save_results(args.save, current)
+        print(f"\nЗамеры сохранены в {args.save}")
+
+    if args.command == "run":
+        return 0
+
+    regressions = compare(load_results(args.baseline), current, args.threshold)
+    if not regressions:
+        print(f"\n✓ Медленнее базы (больше чем на {args.threshold:.0%}) ничего не стало")
+        return 0
+
+    print(f"\nЗАМЕДЛЕНИЯ (больше чем на {args.threshold:.0%}):")
+    for name, old, new, slowdown in regressions:
+        print(f"  {name:20} {old:14.0f} -> {new:14.0f} оп/с  (в {slowdown:.2f} раза медленнее)")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,394 @@
+import mmap
+import os
+import struct
+import tempfile
+from transaction import Transaction
+from storage import CorruptedLedgerError, file_lock, _fsync_folder
+
+
+class BinaryLedger:
+    """
+    Двоичный журнал транзакций с записями фиксированной длины
+
+    ЗАЧЕМ:
+    JSON надо прочитать и разобрать целиком, и только потом показать меню.
+    Здесь файл открывается через mmap (операционная система подгружает
+    с диска только те страницы, которые мы читаем), а Transaction создаётся
+    лишь когда к записи обращаются. Открыть журнал на 5 млн записей -
+    миллисекунды и почти ноль памяти, сколько бы записей ни было.
+
+    ФАЙЛЫ:
+    - filename - заголовок + записи по RECORD.size (56) байт:
+        id | копейки | timestamp | ссылки на категорию, описание и счёт | валюта | тип | флаги
+      Запись номер i лежит по смещению HEADER.size + i * RECORD.size - O(1) доступ
+    - filename.heap-<поколение> - "куча" строк: длина (4 байта) + UTF-8.
+      Ссылка в записи = смещение строки в куче. Одна категория (счёт) пишется
+      в кучу один раз, её смещение и есть "номер категории". Журнал, открытый
+      заново, перед первым append находит уже записанные категории по записям
+
+    Куча только дописывается. save_all (create) пишет новую кучу с новым
+    поколением и атомарно подменяет файл записей - старые данные целы,
+    пока подмена не случилась.
+
+    УДАЛЕНИЕ:
+    Запись не вырезается, а помечается флагом DELETED (один байт на месте).
+    len(ledger) - число записей вместе с удалёнными, ledger[i] для удалённой - None,
+    при переборе (for t in ledger) удалённые пропускаются.
+    """
+
+    MAGIC = b"FINLEDG1"
+    VERSION = 2  # 2 - добавлены счёт и валюта
+    # magic, версия, размер записи, поколение кучи
+    HEADER = struct.Struct("<8sHH4xQ")
+    # id, копейки, timestamp, категория, описание, счёт, валюта, тип, флаги (+3 байта выравнивания)
+    RECORD = struct.Struct("<qqqQQQ3sBB3x")
+    STRING_LENGTH = struct.Struct("<I")
+    FLAGS_OFFSET = 52  # Смещение байта флагов внутри записи
+    DELETED = 1
+
+    TYPE_CODES = {"expense": 0, "income": 1}
+    TYPE_NAMES = ("expense", "income")
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._records = None
+        self._heap = None
+        self._strings = {}  # ссылка -> строка (только категории и счета - их немного)
+        self._refs = {}     # категория/счёт -> ссылка (чтобы не писать в кучу повторно)
+        self._refs_loaded = False  # _refs собран по всем записям (см. _load_refs)
+        self._open()
+
+    # ==========================================
+    # ОТКРЫТИЕ
+    # ==========================================
+
+    @staticmethod
+    def heap_filename(filename, generation):
+        return f"{filename}.heap-{generation:016x}"
+
+    @staticmethod
+    def _map(f):
+        # Пустой файл отобразить в память нельзя
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _open(self):
+        # FileNotFoundError пробрасываем - как у остальных хранилищ
+        with open(self.filename, "rb") as f:
+            self._records = self._map(f)
+
+        if len(self._records) < self.HEADER.size:
+            raise CorruptedLedgerError(self.filename, "нет заголовка")
+        magic, version, record_size, self.generation = self.HEADER.unpack_from(self._records, 0)
+        if magic != self.MAGIC or version != self.VERSION or record_size != self.RECORD.size:
+            raise CorruptedLedgerError(self.filename, "неизвестный формат")
+
+        try:
+            with open(self.heap_filename(self.filename, self.generation), "rb") as f:
+                self._heap = self._map(f)
+        except FileNotFoundError as e:
+            raise CorruptedLedgerError(self.filename, "нет файла строк (heap)") from e
+
+    def close(self):
+        for mapped in (self._records, self._heap):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        self._records = self._heap = None
+
+    def _reopen(self):
+        self.close()
+        self._open()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ==========================================
+    # ЧТЕНИЕ
+    # ==========================================
+
+    def __len__(self):
+        # Недописанная последняя запись (программа упала во время записи)
+        # в счёт не идёт - деление с отбрасыванием остатка
+        return (len(self._records) - self.HEADER.size) // self.RECORD.size
+
+    def _read_string(self, ref):
+        (length,) = self.STRING_LENGTH.unpack_from(self._heap, ref)
+        start = ref + self.STRING_LENGTH.size
+        return self._heap[start:start + length].decode("utf-8")
+
+    def _category(self, ref):
+        # Категорий мало - запоминаем раскодированные строки
+        name = self._strings.get(ref)
+        if name is None:
+            name = self._read_string(ref)
+            self._strings[ref] = name
+            self._refs.setdefault(name, ref)
+        return name
+
+    def __getitem__(self, index):
+        """Transaction из записи номер index (None если запись удалена)"""
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("Нет записи с таким номером")
+
+        (transaction_id, amount_minor, timestamp, category_ref, description_ref,
+         account_ref, currency, type_code, flags) = self.RECORD.unpack_from(
+            self._records, self.HEADER.size + index * self.RECORD.size)
+        if flags & self.DELETED:
+            return None
+
+        # Данные из файла уже проверены при записи - создаём без validate
+        transaction = Transaction.__new__(Transaction)
+        transaction.id = transaction_id
+        transaction.amount_minor = amount_minor
+        transaction.timestamp = timestamp
+        transaction.category = self._category(category_ref)
+        transaction.description = self._read_string(description_ref)
+        transaction.transaction_type = self.TYPE_NAMES[type_code]
+        transaction.account = self._category(account_ref)
+        transaction.currency = currency.decode("ascii")
+        return transaction
+
+    def __iter__(self):
+        """Генератор: живые транзакции по одной"""
+        for index in range(len(self)):
+            transaction = self[index]
+            if transaction is not None:
+                yield transaction
+
+    def totals(self):
+        """
+        Суммы доходов и расходов в копейках по валютам, без создания Transaction
+
+        struct.iter_unpack читает записи прямо из отображённого файла
+
+        ВОЗВРАЩАЕТ:
+        {"RUB": {"income": ..., "expense": ...}, "USD": {...}}
+        """
+        totals = {}
+        end = self.HEADER.size + len(self) * self.RECORD.size
+        with memoryview(self._records) as view:
+            for record in self.RECORD.iter_unpack(view[self.HEADER.size:end]):
+                if record[8] & self.DELETED:
+                    continue
+                currency = totals.get(record[6])
+                if currency is None:
+                    currency = totals[record[6]] = {"income": 0, "expense": 0}
+                currency[self.TYPE_NAMES[record[7]]] += record[1]
+        return {code.decode("ascii"): values for code, values in totals.items()}
+
+    # ==========================================
+    # ЗАПИСЬ
+    # ==========================================
+
+    def _load_refs(self):
+        """
+        Собрать _refs по записям, которые уже в файле
+
+        Без этого append после открытия не знает, что "Еда" уже в куче,
+        и пишет её снова при каждом запуске. Один проход по записям
+        (struct.iter_unpack, без Transaction): ссылки на категории и счета
+        плюс первое пустое описание. Строки читаются по разу на ссылку.
+        """
+        category_refs = set()
+        empty_ref = None
+        end = self.HEADER.size + len(self) * self.RECORD.size
+        with memoryview(self._records) as view:
+            for record in self.RECORD.iter_unpack(view[self.HEADER.size:end]):
+                category_refs.add(record[3])
+                category_refs.add(record[5])
+                if empty_ref is None and self.STRING_LENGTH.unpack_from(self._heap, record[4])[0] == 0:
+                    empty_ref = record[4]
+
+        for ref in category_refs:
+            self._category(ref)
+        if empty_ref is not None:
+            self._refs.setdefault("", empty_ref)
+        self._refs_loaded = True
+
+    @classmethod
+    def _store(cls, heap_file, text, refs=None):
+        """Записать строку в кучу и вернуть её смещение (refs - уже записанные строки)"""
+        if refs is not None and text in refs:
+            return refs[text]
+        ref = heap_file.tell()
+        data = text.encode("utf-8")
+        heap_file.write(cls.STRING_LENGTH.pack(len(data)) + data)
+        if refs is not None:
+            refs[text] = ref
+        return ref
+
+    @classmethod
+    def _pack(cls, transaction, heap_file, refs):
+        return cls.RECORD.pack(
+            transaction.id,
+            transaction.amount_minor,
+            transaction.timestamp,
+            cls._store(heap_file, transaction.category, refs),
+            # Пустые описания встречаются часто - их тоже пишем один раз
+            cls._store(heap_file, transaction.description,
+                       None if transaction.description else refs),
+            cls._store(heap_file, transaction.account, refs),
+            transaction.currency.encode("ascii"),
+            cls.TYPE_CODES[transaction.transaction_type],
+            0,
+        )
+
+    @classmethod
+    def create(cls, filename, transactions):
+        """
+        Записать журнал заново из любого итерируемого набора Transaction
+
+        1. Новая куча с новым поколением (старая не трогается)
+        2. Записи во временный файл, fsync, os.replace - атомарная подмена
+        3. Старая куча больше не нужна - удаляем
+        """
+        try:
+            with cls(filename) as old:
+                old_heap = cls.heap_filename(filename, old.generation)
+        except (FileNotFoundError, CorruptedLedgerError):
+            old_heap = None
+
+        generation = int.from_bytes(os.urandom(8), "little")
+        heap_name = cls.heap_filename(filename, generation)
+        folder = os.path.dirname(os.path.abspath(filename))
+        fd, temp_name = tempfile.mkstemp(dir=folder, prefix=os.path.basename(filename) + ".", suffix=".tmp")
+
+        try:
+            with open(heap_name, "wb") as heap_file, os.fdopen(fd, "wb") as records_file:
+                records_file.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, cls.RECORD.size, generation))
+                refs = {}
+                for t in transactions:
+                    records_file.write(cls._pack(t, heap_file, refs))
+                for f in (heap_file, records_file):
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(temp_name, filename)
+        except BaseException:
+            for name in (temp_name, heap_name):
+                if os.path.exists(name):
+                    os.remove(name)
+            raise
+
+        _fsync_folder(folder)
+        if old_heap and old_heap != heap_name and os.path.exists(old_heap):
+            os.remove(old_heap)
+
+        ledger = cls(filename)
+        # Все строки этой кучи записаны здесь же - собирать заново не нужно
+        ledger._refs = refs
+        ledger._refs_loaded = True
+        return ledger
+
+    def append(self, transactions):
+        """
+        Дописать транзакции в конец
+
+        Порядок важен: сначала строки в кучу (+fsync), потом записи.
+        Упадём посередине - в куче останется мусор, но записи ссылаются
+        только на то, что уже на диске
+        """
+        if not self._refs_loaded:
+            self._load_refs()
+
+        count = len(self)
+        with open(self.heap_filename(self.filename, self.generation), "ab") as heap_file:
+            packed = [self._pack(t, heap_file, self._refs) for t in transactions]
+            heap_file.flush()
+            os.fsync(heap_file.fileno())
+
+        with open(self.filename, "r+b") as records_file:
+            # Отрезаем недописанную запись, если прошлый раз упали на ней
+            records_file.truncate(self.HEADER.size + count * self.RECORD.size)
+            records_file.seek(0, os.SEEK_END)
+            records_file.write(b"".join(packed))
+            records_file.flush()
+            os.fsync(records_file.fileno())
+
+        self._reopen()
+
+    def mark_deleted(self, indexes):
+        """Пометить записи удалёнными (на месте, по байту на запись)"""
+        with open(self.filename, "r+b") as records_file:
+            for index in indexes:
+                records_file.seek(self.HEADER.size + index * self.RECORD.size + self.FLAGS_OFFSET)
+                records_file.write(bytes([self.DELETED]))
+            records_file.flush()
+            os.fsync(records_file.fileno())
+        self._reopen()
+
+
+class BinaryStorage:
+    """
+    Хранилище для FinanceManager в формате BinaryLedger
+
+    Интерфейс тот же что у JsonFileStorage (load / save_all / record_changes):
+    - добавление дописывает записи в конец - O(добавленных)
+    - удаление ставит флаг на месте - O(удалённых)
+    - save_all переписывает журнал и выбрасывает удалённые записи
+
+    FinanceManager при загрузке всё равно создаёт все Transaction (ему нужны
+    индексы и суммы). Ленивое чтение - это BinaryLedger напрямую.
+    Рассчитано на один процесс: номера записей запоминаются при load(),
+    журнал остаётся открытым до close() - вместе с ним и список строк,
+    уже записанных в кучу (иначе каждое добавление писало бы их снова).
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._ledger = None   # открытый BinaryLedger
+        self._positions = {}  # id -> номер записи в файле
+
+    def _use(self, ledger):
+        """Запомнить открытый журнал (предыдущий закрыть)"""
+        if self._ledger is not None:
+            self._ledger.close()
+        self._ledger = ledger
+        return ledger
+
+    def load(self):
+        with file_lock(self.filename):
+            ledger = self._use(BinaryLedger(self.filename))
+            transactions = []
+            self._positions = {}
+            for index in range(len(ledger)):
+                t = ledger[index]
+                if t is not None:
+                    self._positions[t.id] = index
+                    transactions.append(t)
+            return transactions
+
+    def save_all(self, transactions):
+        with file_lock(self.filename):
+            transactions = list(transactions)
+            self._use(BinaryLedger.create(self.filename, transactions))
+            self._positions = {t.id: index for index, t in enumerate(transactions)}
+
+    def record_changes(self, transactions, added=(), removed_ids=()):
+        with file_lock(self.filename):
+            ledger = self._ledger
+            if ledger is None:
+                try:
+                    ledger = self._use(BinaryLedger(self.filename))
+                except FileNotFoundError:
+                    ledger = self._use(BinaryLedger.create(self.filename, []))
+
+            removed = [self._positions.pop(i) for i in removed_ids if i in self._positions]
+            if removed:
+                ledger.mark_deleted(removed)
+            if added:
+                start = len(ledger)
+                ledger.append(added)
+                for offset, t in enumerate(added):
+                    self._positions[t.id] = start + offset
+
+    def close(self):
+        if self._ledger is not None:
+            self._ledger.close()
+            self._ledger = None
@@ -1,31 +1,246 @@
-import json
-from datetime import datetime
-from transaction import Transaction
+import math
+from datetime import datetime, time
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+from transaction import Transaction, BulkValidationError, DEFAULT_ACCOUNT, DEFAULT_CURRENCY
+from storage import JsonFileStorage
+from import_export import write_csv, read_csv, write_jsonl, read_jsonl
+from id_generator import default_generator
+from reports import DailyRollups, parse_day
+from money import from_minor, to_minor, minor_array
+from search_index import SearchIndex
+from alerts import AlertMonitor
 
 class FinanceManager:
-    def __init__(self, filename="transactions.json"):
-        self.transactions = []  # Список всех Transaction объектов
+    # search(): если найдено больше стольких ID, идём по индексу дат, а не сортируем
+    SEARCH_SCAN_THRESHOLD = 1000
+
+    def __init__(self, filename="transactions.json", storage=None):
+        # Индекс id -> Transaction
+        # dict помнит порядок добавления, поэтому он же служит и списком транзакций
+        self._by_id = {}
+        # Накопленные суммы - чтобы статистика не проходила по всему списку
+        # Все суммы - целые копейки (amount_minor): складываются без погрешности
+        # Суммы ведутся отдельно по валютам: 100 долларов + 100 рублей - не 200
+        self._totals = {}           # валюта -> {"income": ..., "expense": ...}
+        self._category_totals = {}  # валюта -> {категория: сумма}
+        self._category_counts = {}  # валюта -> {категория: количество транзакций}
+        # Партиции по счетам: счёт -> {id: Transaction}
+        # и суммы (счёт, валюта) -> {"income", "expense", "count"} для сводного баланса
+        self._accounts = {}
+        self._account_totals = {}
+        # Суммы по дням для отчётов и отсортированный индекс (timestamp, id)
+        self._rollups = DailyRollups()
+        self._date_index = []
+        # Обратный индекс слов описаний для search()
+        self._search_index = SearchIndex()
+        # Бюджеты и всплески трат: проверяются при каждом добавлении (alerts.py)
+        self._alerts = AlertMonitor()
+        self._alert_hooks = []
         self.filename = filename
+        # Хранилище можно подменить (например JournalStorage из storage.py)
+        # По умолчанию - обычный JSON файл, как раньше
+        self.storage = storage if storage is not None else JsonFileStorage(filename)
         self.load_from_file()  # Загружаем если файл существует
 
-    def add_transaction(self, amount, category, description="", transaction_type="expense"):    
-        transaction = Transaction(amount, category, description, transaction_type)
-        self.transactions.append(transaction)
+    @property
+    def transactions(self):
+        """Список всех Transaction объектов в порядке добавления"""
+        return list(self._by_id.values())
+
+    @transactions.setter
+    def transactions(self, transactions):
+        # Заменить всё содержимое (например после загрузки из файла)
+        self._by_id = {}
+        for t in transactions:
+            self._index(t)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def _index(self, transaction):
+        # ID обязан быть уникальным, иначе индекс потеряет транзакцию.
+        # Новые ID уникальны (id_generator.py), но в старых файлах
+        # встречаются одинаковые - сдвигаем на следующий свободный
+        while transaction.id in self._by_id:
+            transaction.id += 1
+        self._by_id[transaction.id] = transaction
+
+    def add_transaction(self, amount, category, description="", transaction_type="expense",
+                        account=DEFAULT_ACCOUNT, currency=DEFAULT_CURRENCY):    
+        transaction = Transaction(amount, category, description, transaction_type, account, currency)
+        self._index(transaction)
+        # Предупреждения считаем по состоянию ДО этой транзакции
+        alerts = self._alerts.check(transaction)
+        self._aggregate_add(transaction)
         
-        # Сохраняем изменения в файл
-        self.save_to_file()
+        # Сохраняем изменения (хранилище само решает: дописать или переписать)
+        self._record_changes(added=[transaction])
+        self._notify(alerts)
         
         return transaction
+
+    def add_transactions(self, rows):
+        """
+        Пакетное добавление (например импорт выписки из банка)
+
+        rows - любой итерируемый набор словарей:
+            {"amount": 100, "category": "Еда",
+             "description": "...", "transaction_type": "expense",
+             "date": "2025-11-16 10:00:00"}   # description, transaction_type, date - необязательные
+
+        КАК РАБОТАЕТ:
+        1. Проверяем ВСЕ строки и собираем ВСЕ ошибки
+        2. Если есть ошибки - BulkValidationError, ничего не добавлено
+        3. Создаём транзакции без повторной проверки
+        4. Сохраняем ОДИН раз
+        5. Если сохранить не удалось - откатываем всё и пробрасываем ошибку
+
+        Атомарно: либо добавлены все строки, либо ни одной.
+
+        ВОЗВРАЩАЕТ:
+        Список созданных Transaction
+        """
+        rows = list(rows)  # Нужны два прохода: проверка и создание
+
+        # ПРОХОД 1: проверка
+        errors = []
+        timestamps = []
+        for index, row in enumerate(rows):
+            if not isinstance(row, dict):
+                errors.append((index, f"Ожидался словарь, получено {type(row)}"))
+                continue
+            if "amount" not in row or "category" not in row:
+                errors.append((index, "Нужны поля amount и category"))
+                continue
+
+            error = Transaction.validate(row["amount"], row.get("transaction_type", "expense"),
+                                         row.get("currency", DEFAULT_CURRENCY))
+            if error:
+                errors.append((index, error))
+                continue
+
+            timestamp = None
+            if row.get("date"):
+                try:
+                    timestamp = int(datetime.fromisoformat(row["date"]).timestamp())
+                except (TypeError, ValueError):
+                    errors.append((index, f"Некорректная дата: {row['date']}"))
+                    continue
+            timestamps.append(timestamp)
+
+        if errors:
+            raise BulkValidationError(errors)
+
+        # ПРОХОД 2: создание и индексирование
+        transactions = []
+        alerts = []
+        for row, timestamp in zip(rows, timestamps):
+            transaction = Transaction.create_validated(
+                row["amount"],
+                row["category"],
+                row.get("description", ""),
+                row.get("transaction_type", "expense"),
+                timestamp,
+                row.get("account", DEFAULT_ACCOUNT),
+                row.get("currency", DEFAULT_CURRENCY),
+            )
+            self._index(transaction)
+            alerts.extend(self._alerts.check(transaction))
+            self._aggregate_add(transaction, index_date=False)
+            transactions.append(transaction)
+
+        # Индекс дат: вместо insort на каждую строку (сдвиг списка каждый раз)
+        # дописываем все ключи и сортируем один раз
+        self._date_index.extend((t.timestamp, t.id) for t in transactions)
+        self._date_index.sort()
+
+        if not transactions:
+            return transactions
+
+        # Одно сохранение на всю пачку (при ошибке - откат всей пачки)
+        self._record_changes(added=transactions)
+        self._notify(alerts)
+
+        return transactions
+
+    # ==========================================
+    # БЮДЖЕТЫ И ПРЕДУПРЕЖДЕНИЯ
+    # ==========================================
+
+    def add_alert_hook(self, hook):
+        """
+        Подписаться на предупреждения
+
+        hook(alert) вызывается после успешного сохранения транзакции,
+        alert - словарь из AlertMonitor.check (есть ключ "message")
+        """
+        self._alert_hooks.append(hook)
+
+    def _notify(self, alerts):
+        for alert in alerts:
+            for hook in self._alert_hooks:
+                hook(alert)
+
+    def set_budget(self, category, amount):
+        """Бюджет категории на месяц в основной валюте (DEFAULT_CURRENCY)"""
+        self._alerts.set_budget(category, amount)
+
+    def remove_budget(self, category):
+        self._alerts.remove_budget(category)
+
+    def get_budgets(self):
+        """Бюджеты: категория -> Decimal (в основной валюте)"""
+        return {category: from_minor(limit) for category, limit in self._alerts.budgets.items()}
+
+    def get_budget_usage(self, month):
+        """
+        Сколько потрачено из бюджетов за месяц "2025-11"
+
+        ВОЗВРАЩАЕТ:
+        {категория: {"budget": ..., "spent": ..., "left": ...}}
+        """
+        usage = {}
+        for category, budget in self.get_budgets().items():
+            spent = self._alerts.get_month_spent(category, month)
+            usage[category] = {"budget": budget, "spent": spent, "left": budget - spent}
+        return usage
+
+    def get_transaction(self, transaction_id):
+        """Найти транзакцию по ID за O(1). None если такой нет"""
+        return self._by_id.get(transaction_id)
     
     def remove_transaction(self, transaction_id): 
-        # Проходим по всем транзакциям
-        for transaction in self.transactions:
-            # Проверяем ID
-            if transaction.id == transaction_id:
-                self.transactions.remove(transaction)
-                self.save_to_file()
-                return True
-        return False
+        # .pop(ключ, None) - удалить и вернуть значение, None если ключа нет
+        # Поиск по хэшу вместо прохода по списку
+        transaction = self._by_id.pop(transaction_id, None)
+        if transaction is None:
+            return False
+
+        self._aggregate_remove(transaction)
+        self._record_changes(removed=[transaction])
+        return True
+
+    def remove_transactions(self, transaction_ids):
+        """
+        Удалить сразу много транзакций
+
+        КАК РАБОТАЕТ:
+        Каждое удаление - O(1), а сохраняем один раз в конце
+
+        ВОЗВРАЩАЕТ:
+        Количество удалённых (несуществующие ID пропускаются)
+        """
+        removed = []
+        for transaction_id in transaction_ids:
+            transaction = self._by_id.pop(transaction_id, None)
+            if transaction is not None:
+                self._aggregate_remove(transaction)
+                removed.append(transaction)
+
+        if removed:
+            self._record_changes(removed=removed)
+        return len(removed)
     
     def  get_all_transactions(self):
          return self.transactions
@@ -33,95 +248,488 @@ class FinanceManager:
     def get_transactions_by_type(self, transaction_type):
 
         # List comprehension - короткий способ фильтрации
-        # Читается: "дай мне t для каждого t в self.transactions, 
+        # Читается: "дай мне t для каждого t из всех транзакций, 
         # где t.transaction_type равен transaction_type"
-        return [t for t in self.transactions if t.transaction_type == transaction_type]
+        return [t for t in self._by_id.values() if t.transaction_type == transaction_type]
     
     def get_transactions_by_category(self, category):
-        return [t for t in self.transactions if t.category == category]
+        return [t for t in self._by_id.values() if t.category == category]
     
-    def get_balance(self):
-        # Считаем доходы
-        # sum() складывает числа
-        # [t.amount for t in ... if ...] создаёт список сумм
-        # sum([100, 200, 300]) = 600
-        income = sum([t.amount for t in self.transactions if t.transaction_type == "income"])
-
-        # Считаем расходы
-        expenses = sum([t.amount for t in self.transactions if t.transaction_type == "expense"])
-        
-        # Возвращаем разницу
-        return income - expenses
+    def get_currencies(self):
+        """Валюты, в которых есть транзакции"""
+        return list(self._totals)
+
+    def _currency_totals(self, currency):
+        return self._totals.get(currency, {"income": 0, "expense": 0})
+
+    def get_balance(self, currency=DEFAULT_CURRENCY):
+        # Суммы уже посчитаны при добавлении/удалении - просто вычитаем
+        # Только транзакции в валюте currency - все валюты сразу
+        # в одной сумме см. get_consolidated_balance
+        # Копейки -> Decimal только на выходе
+        totals = self._currency_totals(currency)
+        return from_minor(totals["income"] - totals["expense"])
     
-    def get_total_income(self):
-        """Общая сумма доходов"""
-        return sum([t.amount for t in self.transactions if t.transaction_type == "income"])
+    def get_total_income(self, currency=DEFAULT_CURRENCY):
+        """Общая сумма доходов в валюте currency"""
+        return from_minor(self._currency_totals(currency)["income"])
     
-    def get_total_expenses(self):
-        """Общая сумма расходов"""
-        return sum([t.amount for t in self.transactions if t.transaction_type == "expense"])
+    def get_total_expenses(self, currency=DEFAULT_CURRENCY):
+        """Общая сумма расходов в валюте currency"""
+        return from_minor(self._currency_totals(currency)["expense"])
     
-    def get_statistics(self):
-        categories = {}
+    def get_statistics(self, currency=DEFAULT_CURRENCY):
+        # Никаких проходов по списку: O(количество категорий) на копию словаря
+        # total_transactions - все транзакции, суммы - только в валюте currency
+        return {
+            "total_transactions": len(self._by_id),
+            "currency": currency,
+            "total_income": self.get_total_income(currency),
+            "total_expenses": self.get_total_expenses(currency),
+            "balance": self.get_balance(currency),
+            "categories": {category: from_minor(total)
+                           for category, total in self._category_totals.get(currency, {}).items()}
+        }        
+
+    # ==========================================
+    # СЧЕТА И ВАЛЮТЫ
+    # ==========================================
+
+    def get_accounts(self):
+        """Названия счетов в порядке появления"""
+        return list(self._accounts)
+
+    def get_transactions_by_account(self, account):
+        # Партиция счёта - перебираем только его транзакции
+        return list(self._accounts.get(account, {}).values())
+
+    def get_account_balances(self):
+        """
+        Баланс каждого счёта в его валютах
+
+        ВОЗВРАЩАЕТ:
+        {"Основной": {"RUB": Decimal("46500")}, "Карта USD": {"USD": Decimal("120.50")}}
+        """
+        balances = {}
+        for (account, currency), totals in self._account_totals.items():
+            balances.setdefault(account, {})[currency] = from_minor(totals["income"] - totals["expense"])
+        return balances
+
+    def get_consolidated_balance(self, rates, currency=DEFAULT_CURRENCY, day=None, accounts=None):
+        """
+        Сводный баланс всех счетов (или только accounts) в одной валюте
+
+        rates - fx.RateTable, day - курс на какой день (по умолчанию сегодня)
+
+        КАК РАБОТАЕТ:
+        Балансы уже накоплены по (счёт, валюта). Складываем их по валютам
+        и переводим каждую валюту ОДИН раз - работы столько, сколько валют,
+        а не транзакций. Курсы берутся из кэша RateTable
+        """
+        by_currency = {}
+        for (account, code), totals in self._account_totals.items():
+            if accounts is not None and account not in accounts:
+                continue
+            by_currency[code] = by_currency.get(code, 0) + totals["income"] - totals["expense"]
+
+        total = sum(rates.convert_minor(minor, code, currency, day) for code, minor in by_currency.items())
+        return from_minor(total)
+
+    def get_category_counts(self):
+        """Количество транзакций в каждой категории (во всех валютах)"""
+        counts = {}
+        for by_category in self._category_counts.values():
+            for category, count in by_category.items():
+                counts[category] = counts.get(category, 0) + count
+        return counts
+
+    def get_report(self, period="month", start=None, end=None, currency=DEFAULT_CURRENCY):
+        """
+        Доходы/расходы/баланс по периодам
 
-        for t in self.transactions:                        # Проходим по всем транзакциям
-            category = t.category
+        period - "day", "week", "month" или "year"
+        start, end - границы (включительно): date или строка "2025-11-16"
+        currency - отчёт только по транзакциям в этой валюте
 
-            if category in categories:                     # Если категория уже есть в словаре
-                categories[category] += t.amount           # Добавляем сумму к существующей
+        ПРИМЕР:
+        manager.get_report("month", "2025-01-01", "2025-12-31")
+        -> [{"period": "2025-11", "income": 50000, "expenses": 3500,
+             "balance": 46500, "count": 4, "categories": {...}}, ...]
+
+        Считается из готовых сумм по дням - не проходит по транзакциям
+        """
+        return self._rollups.report(period, start, end, currency)
+
+    def get_transactions_between(self, start=None, end=None):
+        """
+        Транзакции за дни [start, end] по возрастанию даты
+
+        Поиск границ - bisect по отсортированному индексу дат, O(log n)
+        """
+        first, last = self._date_range(start, end)
+        return [self._by_id[transaction_id] for _, transaction_id in self._date_index[first:last]]
+
+    def iter_transactions(self, transaction_type=None, category=None,
+                          min_amount=None, max_amount=None,
+                          start=None, end=None, cursor=None, reverse=False):
+        """
+        Генератор: транзакции по дате с фильтрами, по одной
+
+        ФИЛЬТРЫ (все необязательные):
+        - transaction_type - "income" / "expense"
+        - category
+        - min_amount, max_amount - границы суммы (включительно)
+        - start, end - дни (включительно), как в get_transactions_between
+
+        cursor - ключ (timestamp, id): начать строго ПОСЛЕ него
+                 (или строго ДО него если reverse=True)
+        reverse=True - от новых к старым
+
+        ЗАЧЕМ ГЕНЕРАТОР:
+        Ничего не собирается в список - кто читает первые 20,
+        тот и проверит примерно 20 транзакций, а не все
+        """
+        # Границы суммы - в копейки один раз, дальше сравниваем целые
+        min_minor = to_minor(min_amount) if min_amount is not None else None
+        max_minor = to_minor(max_amount) if max_amount is not None else None
+
+        first, last = self._date_range(start, end)
+        if cursor is not None:
+            if reverse:
+                last = min(last, bisect_left(self._date_index, cursor))
             else:
-                categories[category] = t.amount            # Добавляем сумму к существующей  
+                first = max(first, bisect_right(self._date_index, cursor))
+
+        positions = range(last - 1, first - 1, -1) if reverse else range(first, last)
+        for position in positions:
+            t = self._by_id[self._date_index[position][1]]
+            if transaction_type is not None and t.transaction_type != transaction_type:
+                continue
+            if category is not None and t.category != category:
+                continue
+            if min_minor is not None and t.amount_minor < min_minor:
+                continue
+            if max_minor is not None and t.amount_minor > max_minor:
+                continue
+            yield t
+
+    def search(self, query, category=None, start=None, end=None, prefix=True, limit=None):
+        """
+        Поиск по описанию (без учёта регистра)
 
-        # Формируем итоговый словарь
-        return {
-            "total_transactions": len(self.transactions),
-            "total_income": self.get_total_income(),
-            "total_expenses": self.get_total_expenses(),
-            "balance": self.get_balance(),
-            "categories": categories
-        }        
+        query    - слова через пробел, транзакция должна содержать все
+        prefix   - True: "хле" найдёт "хлеб" (удобно для поиска по мере ввода)
+        category, start, end - фильтры как в iter_transactions
+        limit    - не больше стольких результатов
+
+        ВОЗВРАЩАЕТ:
+        Список Transaction по возрастанию даты
+
+        КАК РАБОТАЕТ:
+        Слова ищутся в обратном индексе (search_index.py), а не перебором
+        описаний - проверяются только транзакции, где слова уже нашлись
+        """
+        sets = self._search_index.match_sets(query, prefix=prefix)
+        if sets is None:
+            # Пустой запрос - просто фильтры
+            return list(islice(self.iter_transactions(category=category, start=start, end=end), limit))
+
+        if limit is not None and len(sets[0]) > self.SEARCH_SCAN_THRESHOLD:
+            # Частые слова ("хлеб" в каждой пятой транзакции): пересекать и
+            # сортировать сотни тысяч ID ради первых limit дорого. Идём по индексу
+            # дат и останавливаемся, как только набрали limit.
+            # Если слова вместе почти не встречаются, просмотр затянется.
+            # Шаг по индексу дат раз в 10-20 дороже проверки "id in set",
+            # поэтому после len(sets[0]) // 16 шагов сдаёмся и пересекаем множества
+            found = []
+            budget = len(sets[0]) // 16
+            for t in self.iter_transactions(category=category, start=start, end=end):
+                if all(t.id in ids for ids in sets):
+                    found.append(t)
+                    if len(found) == limit:
+                        return found
+                budget -= 1
+                if budget == 0:
+                    break
+            else:
+                return found
+
+        ids = sets[0].intersection(*sets[1:])
+        start_ts, end_ts = self._day_bounds(start, end)
+        found = []
+        for transaction_id in ids:
+            t = self._by_id[transaction_id]
+            if category is not None and t.category != category:
+                continue
+            if start_ts is not None and t.timestamp < start_ts:
+                continue
+            if end_ts is not None and t.timestamp > end_ts:
+                continue
+            found.append(t)
+
+        found.sort(key=lambda t: (t.timestamp, t.id))
+        return found[:limit]
+
+    @staticmethod
+    def _day_bounds(start=None, end=None):
+        # Дни [start, end] -> timestamp начала первого и конца последнего дня
+        start_ts = end_ts = None
+        if start is not None:
+            start_ts = int(datetime.combine(parse_day(start), time.min).timestamp())
+        if end is not None:
+            end_ts = int(datetime.combine(parse_day(end), time.max).timestamp())
+        return start_ts, end_ts
+
+    def _date_range(self, start=None, end=None):
+        # Позиции границ в self._date_index для дней [start, end]
+        start_ts, end_ts = self._day_bounds(start, end)
+        first = 0
+        last = len(self._date_index)
+        if start_ts is not None:
+            first = bisect_left(self._date_index, (start_ts,))
+        if end_ts is not None:
+            # (end_ts, бесконечность) - после всех транзакций с этим timestamp
+            last = bisect_right(self._date_index, (end_ts, math.inf))
+        return first, last
+
+    def amounts_minor(self, transaction_type=None, currency=DEFAULT_CURRENCY):
+        """
+        Суммы транзакций в валюте currency в копейках - компактный array('q')
+
+        Для аналитики: money.sum_minor(manager.amounts_minor("income"))
+        складывает миллионы сумм точно и быстро (NumPy если установлен)
+        и совпадает с get_total_income() - другие валюты не подмешиваются
+        """
+        return minor_array(t.amount_minor for t in self._by_id.values()
+                           if t.currency == currency
+                           and (transaction_type is None or t.transaction_type == transaction_type))
+
+    def to_table(self):
+        """
+        Колоночная таблица (NumPy) для аналитики по большим объёмам
+
+        Импорт внутри метода: NumPy нужен только тем, кто вызывает to_table()
+        """
+        from transaction_table import TransactionTable
+        return TransactionTable.from_transactions(self._by_id.values())
+
+    # ==========================================
+    # НАКОПЛЕННЫЕ СУММЫ (обновляются при add/remove)
+    # ==========================================
+
+    @staticmethod
+    def _compute_aggregates(transactions):
+        """
+        Посчитать все суммы с нуля одним проходом
+
+        ВОЗВРАЩАЕТ:
+        (суммы по типам, суммы по категориям, количество по категориям) -
+        каждое по валютам
+        """
+        totals = {}
+        category_totals = {}
+        category_counts = {}
+
+        for t in transactions:
+            totals.setdefault(t.currency, {"income": 0, "expense": 0})[t.transaction_type] += t.amount_minor
+            # .get(ключ, 0) - вернёт 0 если категории ещё нет
+            by_category = category_totals.setdefault(t.currency, {})
+            by_category[t.category] = by_category.get(t.category, 0) + t.amount_minor
+            counts = category_counts.setdefault(t.currency, {})
+            counts[t.category] = counts.get(t.category, 0) + 1
+
+        return totals, category_totals, category_counts
+
+    @staticmethod
+    def _compute_partitions(transactions):
+        """Партиции по счетам и суммы (счёт, валюта) с нуля"""
+        accounts = {}
+        account_totals = {}
+        for t in transactions:
+            accounts.setdefault(t.account, {})[t.id] = t
+            totals = account_totals.setdefault((t.account, t.currency),
+                                               {"income": 0, "expense": 0, "count": 0})
+            totals[t.transaction_type] += t.amount_minor
+            totals["count"] += 1
+        return accounts, account_totals
+
+    @staticmethod
+    def _compute_search_index(transactions):
+        """Индекс слов описаний с нуля (см. search_index.py)"""
+        index = SearchIndex()
+        for t in transactions:
+            index.add(t)
+        return index
+
+    @staticmethod
+    def _compute_rollups(transactions):
+        """Суммы по дням с нуля (см. reports.py)"""
+        rollups = DailyRollups()
+        for t in transactions:
+            rollups.add(t)
+        return rollups
+
+    def _rebuild_aggregates(self):
+        # Вызывается после загрузки, когда список заменён целиком
+        self._totals, self._category_totals, self._category_counts = \
+            self._compute_aggregates(self._by_id.values())
+        self._rollups = self._compute_rollups(self._by_id.values())
+        self._search_index = self._compute_search_index(self._by_id.values())
+        self._alerts.rebuild(self._by_id.values())
+        self._accounts, self._account_totals = self._compute_partitions(self._by_id.values())
+        # Один sort на всю загрузку вместо insort на каждую транзакцию
+        self._date_index = sorted((t.timestamp, t.id) for t in self._by_id.values())
+
+    def _aggregate_add(self, t, index_date=True):
+        self._rollups.add(t)
+        self._search_index.add(t)
+        self._alerts.add(t)
+        if index_date:
+            insort(self._date_index, (t.timestamp, t.id))
+
+        self._accounts.setdefault(t.account, {})[t.id] = t
+        totals = self._account_totals.setdefault((t.account, t.currency),
+                                                 {"income": 0, "expense": 0, "count": 0})
+        totals[t.transaction_type] += t.amount_minor
+        totals["count"] += 1
+
+        self._totals.setdefault(t.currency, {"income": 0, "expense": 0})[t.transaction_type] += t.amount_minor
+        category_totals = self._category_totals.setdefault(t.currency, {})
+        category_totals[t.category] = category_totals.get(t.category, 0) + t.amount_minor
+        category_counts = self._category_counts.setdefault(t.currency, {})
+        category_counts[t.category] = category_counts.get(t.category, 0) + 1
+
+    def _aggregate_remove(self, t):
+        self._rollups.remove(t)
+        self._search_index.remove(t)
+        self._alerts.remove(t)
+        del self._date_index[bisect_left(self._date_index, (t.timestamp, t.id))]
+
+        partition = self._accounts[t.account]
+        del partition[t.id]
+        if not partition:
+            del self._accounts[t.account]
+        key = (t.account, t.currency)
+        self._account_totals[key][t.transaction_type] -= t.amount_minor
+        self._account_totals[key]["count"] -= 1
+        if self._account_totals[key]["count"] == 0:
+            del self._account_totals[key]
+
+        self._totals[t.currency][t.transaction_type] -= t.amount_minor
+        category_totals = self._category_totals[t.currency]
+        category_counts = self._category_counts[t.currency]
+        category_counts[t.category] -= 1
+
+        if category_counts[t.category] == 0:
+            # Последняя транзакция категории - убираем категорию совсем,
+            # как будто её и не было (так же считает _compute_aggregates)
+            del category_counts[t.category]
+            del category_totals[t.category]
+            if not category_counts:
+                # И валюту, если в ней больше нет транзакций
+                del self._category_counts[t.currency]
+                del self._category_totals[t.currency]
+                del self._totals[t.currency]
+        else:
+            category_totals[t.category] -= t.amount_minor
+
+    def check_aggregates(self):
+        """
+        Проверка согласованности: пересчитать всё с нуля и сравнить
+
+        ЗАЧЕМ:
+        Для тестов - убедиться что add/remove правильно обновляют суммы
+
+        ВОЗВРАЩАЕТ:
+        True если накопленные суммы совпадают с пересчитанными
+        """
+        transactions = self._by_id.values()
+        expected = (
+            self._compute_aggregates(transactions),
+            self._compute_rollups(transactions).by_day,
+            sorted((t.timestamp, t.id) for t in transactions),
+            self._compute_search_index(transactions).postings,
+            self._compute_partitions(transactions),
+        )
+        actual = (
+            (self._totals, self._category_totals, self._category_counts),
+            self._rollups.by_day,
+            self._date_index,
+            self._search_index.postings,
+            (self._accounts, self._account_totals),
+        )
+        # Суммы в копейках - целые числа, поэтому сравниваем точно
+        return expected == actual
     
-    def save_to_file(self):
+    def _record_changes(self, added=(), removed=()):
+        """
+        Передать хранилищу только то что изменилось
+
+        JsonFileStorage всё равно перепишет файл, JournalStorage - допишет строки.
+        Если записать не удалось - откатываем изменения в памяти и
+        пробрасываем ошибку: в памяти и на диске должно быть одно и то же.
+        """
         try:
-            # Превращаем каждую транзакцию в словарь
-            # [t.to_dict() for t in self.transactions]
-            # Это list comprehension
-            data = [t.to_dict() for t in self.transactions]
-            
-            # Открываем файл на запись
-            with open(self.filename, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # .values() - без копирования в новый список
+            self.storage.record_changes(self._by_id.values(), added=added,
+                                        removed_ids=[t.id for t in removed])
+        except Exception:
+            for transaction in added:
+                del self._by_id[transaction.id]
+                self._aggregate_remove(transaction)
+            # Удалённые возвращаются в конец порядка добавления
+            for transaction in removed:
+                self._by_id[transaction.id] = transaction
+                self._aggregate_add(transaction)
+            raise
 
+    def save_to_file(self):
+        # Записываем всё состояние целиком
+        # (для JournalStorage это ещё и компактификация журнала)
+        # Ошибки не глотаем - вызывающий должен знать что данные не сохранены
+        self.storage.save_all(self._by_id.values())
 
-        except Exception as e:        
-            print(f"Ошибка сохранения: {e}")
+    def close(self):
+        """
+        Завершить работу с хранилищем
+
+        Для BackgroundWriter - дописать накопленные изменения и остановить поток
+        """
+        if hasattr(self.storage, "close"):
+            self.storage.close()
 
 
     def load_from_file(self):
 
         try:
-             with open(self.filename, "r", encoding="utf-8") as f:
-                 # json.load() читает JSON из файла
-                # Возвращает то что было сохранено (список словарей)
-                data = json.load(f)
-                
-                self.transactions = [Transaction.from_dict(t) for t in data]
-                print(f"Загружено {len(self.transactions)} транзакций")
+            # Хранилище читает файл(ы) и возвращает список Transaction
+            loaded = self.storage.load()
+            loaded_ids = {t.id for t in loaded}
+            self.transactions = loaded
+            print(f"Загружено {len(self._by_id)} транзакций")
 
         except FileNotFoundError:
             # Файла нет - это нормально при первом запуске
             print("Файл не найден, создаём новый")
             self.transactions = []
-        
-        except json.JSONDecodeError:
-            # Файл есть но повреждён
-            print("Файл повреждён, создаём новый")
-            self.transactions = []
-        
-        except Exception as e:
-            # Любая другая ошибка
-            print(f"Ошибка загрузки: {e}")
-            self.transactions = []
+
+        # Повреждённый файл (CorruptedLedgerError) и другие ошибки не ловим:
+        # если начать с пустого списка, первое же сохранение затрёт данные
+
+        # Список заменён целиком - пересчитываем суммы один раз
+        self._rebuild_aggregates()
+
+        # Новые ID должны быть больше всех загруженных
+        if self._by_id:
+            default_generator.observe(max(self._by_id))
+
+            # _index сдвинул повторяющиеся ID только в памяти. Записываем
+            # снимок: иначе удаление по новому ID (надгробие в журнале,
+            # флаг в BinaryStorage) не найдёт транзакцию на диске, и после
+            # перезапуска она вернётся
+            if len(loaded_ids) != len(self._by_id):
+                print("Повторяющиеся ID заменены, сохраняем файл")
+                self.save_to_file()
 
 
     def export_to_csv(self, filename="export.csv"):    
@@ -131,30 +739,75 @@ class FinanceManager:
         CSV = Comma Separated Values (значения разделённые запятыми)
         Формат: каждая строка = одна запись, столбцы разделены запятыми
         
+        Поля с запятыми и кавычками модуль csv сам берёт в кавычки
+        (см. export_csv и import_export.py)
         """
 
         try:
-            with open(filename, "w", encoding="utf-8") as f:
-                # Записываем заголовок (первая строка)
-                f.write("ID,Дата,Тип,Сумма,Категория,Описание\n")
-                
-                # Записываем каждую транзакцию
-                for t in self.transactions:
-                    # Форматируем строку
-                    # {t.id},{t.date},...
-                    # f.write() записывает строку в файл
-                    line = f"{t.id},{t.date},{t.transaction_type},{t.amount},{t.category},{t.description}\n"
-                    f.write(line)
-            
+            self.export_csv(filename)
             print(f"Экспортировано в {filename}")
             return True
         
         except Exception as e:
             print(f"Ошибка экспорта: {e}")
             return False
-        
 
+    # ==========================================
+    # ПОТОКОВЫЙ ИМПОРТ / ЭКСПОРТ (CSV, JSON Lines, .gz)
+    # ==========================================
+
+    def export_csv(self, filename, progress=None):
+        """
+        Экспорт в CSV (или .csv.gz) без сборки списка
 
+        progress - необязательная функция progress(количество_строк)
+
+        ВОЗВРАЩАЕТ:
+        Количество записанных транзакций
+        """
+        return write_csv(self._by_id.values(), filename, progress=progress)
+
+    def export_jsonl(self, filename, progress=None):
+        """Экспорт в JSON Lines (или .jsonl.gz)"""
+        return write_jsonl(self._by_id.values(), filename, progress=progress)
+
+    def import_csv(self, filename, batch_size=10000, progress=None):
+        """
+        Импорт из CSV (или .csv.gz) пачками по batch_size строк
+
+        Файл читается генератором, в памяти не больше одной пачки.
+        ID из файла не используются - транзакции получают новые ID,
+        дата сохраняется.
+
+        ВОЗВРАЩАЕТ:
+        Количество добавленных транзакций
+        """
+        return self._import_rows(read_csv(filename, progress=progress), batch_size)
+
+    def import_jsonl(self, filename, batch_size=10000, progress=None):
+        """Импорт из JSON Lines (или .jsonl.gz) пачками"""
+        return self._import_rows(read_jsonl(filename, progress=progress), batch_size)
+
+    def _import_rows(self, rows, batch_size):
+        """
+        Добавить строки пачками через add_transactions
+
+        Каждая пачка атомарна. Если в пачке ошибка - она не добавляется,
+        предыдущие пачки остаются. Номера строк в ошибке - от начала файла.
+        """
+        count = 0
+        while True:
+            # islice берёт следующие batch_size элементов генератора
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return count
+
+            try:
+                self.add_transactions(batch)
+            except BulkValidationError as e:
+                raise BulkValidationError([(count + index, message) for index, message in e.errors])
+
+            count += len(batch)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+import csv
+from bisect import bisect_right, insort
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+from reports import parse_day
+from transaction import DEFAULT_CURRENCY
+
+
+class MissingRateError(LookupError):
+    """В таблице нет курса валюты на нужную дату (и раньше неё)"""
+    def __init__(self, currency, day):
+        self.currency = currency
+        self.day = day
+        super().__init__(f"Нет курса {currency} на {day}")
+
+
+class RateTable:
+    """
+    Таблица курсов валют к базовой валюте (по умолчанию RUB)
+
+    ФАЙЛ (CSV):
+        date,currency,rate
+        2025-11-01,USD,81.25
+        2025-11-01,EUR,93.80
+        2025-11-15,USD,80.90
+
+    rate = сколько базовой валюты стоит 1 единица currency.
+
+    КАК РАБОТАЕТ:
+    - Для каждой валюты - отсортированный список дат и курсов.
+      Курс на день = последний известный на этот день или раньше (bisect)
+    - Один и тот же (валюта, день) спрашивают постоянно,
+      поэтому ответы запоминаются в LRU кэше (functools.lru_cache):
+      повторный запрос - поиск в словаре, без bisect и Decimal
+    """
+
+    def __init__(self, base=DEFAULT_CURRENCY, cache_size=4096):
+        self.base = base
+        self._dates = {}  # валюта -> отсортированный список дат
+        self._rates = {}  # валюта -> курсы в том же порядке
+        # Кэш у каждой таблицы свой: lru_cache на методе класса
+        # был бы общим для всех таблиц и держал бы их в памяти
+        self._cached_rate = lru_cache(maxsize=cache_size)(self._find_rate)
+
+    @classmethod
+    def load(cls, filename, base=DEFAULT_CURRENCY):
+        """Прочитать курсы из CSV файла (FileNotFoundError если файла нет)"""
+        table = cls(base)
+        with open(filename, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                table.add_rate(row["currency"].strip(), row["date"].strip(), row["rate"].strip())
+        return table
+
+    def add_rate(self, currency, day, rate):
+        day = parse_day(day)
+        rate = Decimal(rate)
+
+        dates = self._dates.setdefault(currency, [])
+        rates = self._rates.setdefault(currency, [])
+        position = bisect_right(dates, day)
+        if position and dates[position - 1] == day:
+            rates[position - 1] = rate  # Курс на этот день уже был - заменяем
+        else:
+            insort(dates, day)
+            rates.insert(position, rate)
+
+        # Новый курс может поменять уже запомненные ответы
+        self._cached_rate.cache_clear()
+
+    def rate(self, currency, day=None):
+        """Курс currency к базовой валюте на день (по умолчанию сегодня)"""
+        day = date.today() if day is None else parse_day(day)
+        return self._cached_rate(currency, day)
+
+    def _find_rate(self, currency, day):
+        if currency == self.base:
+            return Decimal(1)
+        dates = self._dates.get(currency, [])
+        position = bisect_right(dates, day)
+        if position == 0:
+            raise MissingRateError(currency, day)
+        return self._rates[currency][position - 1]
+
+    def cache_info(self):
+        """Статистика кэша: попадания, промахи, размер"""
+        return self._cached_rate.cache_info()
+
+    def convert_minor(self, minor, from_currency, to_currency, day=None):
+        """
+        Перевести сумму в копейках (центах) из одной валюты в другую
+
+        Через базовую валюту: USD -> RUB -> EUR.
+        Результат округляется до целой копейки
+        """
+        if from_currency == to_currency:
+            return minor
+        amount = Decimal(minor) * self.rate(from_currency, day) / self.rate(to_currency, day)
+        return int(amount.quantize(Decimal(1), rounding=ROUND_HALF_UP))
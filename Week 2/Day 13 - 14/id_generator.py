@@ -0,0 +1,102 @@
+import os
+import threading
+import time
+
+
+class IdGenerator:
+    """
+    Генератор уникальных ID для транзакций (в стиле Snowflake)
+
+    ПРОБЛЕМА:
+    Раньше ID = время в миллисекундах.
+    Две транзакции в одну миллисекунду получали одинаковый ID.
+
+    КАК РАБОТАЕТ:
+    ID = (миллисекунды с EPOCH << 22) + (номер процесса << 12) + номер внутри миллисекунды
+
+        миллисекунды     | процесс (10 бит) | номер (12 бит)
+        58 000 000 000   | 0 ... 1023       | 0, 1, 2 ... 4095
+
+    - ID растут монотонно: каждый следующий больше предыдущего
+    - Если номера в миллисекунде кончились или часы ушли назад,
+      берём следующий номер после предыдущего ID (занимаем у будущих
+      миллисекунд) - без ожидания
+    - Номер процесса (по умолчанию pid % 1024) разводит ID разных процессов,
+      которые пишут в один файл. После fork() номер пересчитывается
+    - Lock делает генератор безопасным для нескольких потоков
+    - Старые ID (просто миллисекунды) намного меньше новых, поэтому не пересекаются
+    """
+
+    EPOCH_MS = 1704067200000  # 2024-01-01 UTC - чтобы ID дольше помещались в 63 бита
+    NODE_BITS = 10
+    SEQUENCE_BITS = 12
+
+    def __init__(self, node_id=None):
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._fixed_node = node_id is not None
+        self.node_id = node_id if self._fixed_node else self._default_node()
+
+    @classmethod
+    def _default_node(cls):
+        return os.getpid() % (1 << cls.NODE_BITS)
+
+    def _after_fork(self):
+        # Дочерний процесс унаследовал номер родителя - берём свой
+        self._lock = threading.Lock()
+        if not self._fixed_node:
+            self.node_id = self._default_node()
+
+    def next_id(self):
+        millis = int(time.time() * 1000) - self.EPOCH_MS
+        candidate = (((millis << self.NODE_BITS) | self.node_id) << self.SEQUENCE_BITS)
+
+        with self._lock:
+            if candidate <= self._last_id:
+                candidate = self._next_after(self._last_id)
+            self._last_id = candidate
+            return candidate
+
+    def _next_after(self, last_id):
+        """
+        Наименьший ID больше last_id с НАШИМ номером процесса
+
+        Просто last_id + 1 нельзя: при переполнении номера в миллисекунде
+        (или если last_id чужой - см. observe) мы залезли бы в биты
+        номера процесса и могли совпасть с ID другого процесса
+        """
+        sequence_mask = (1 << self.SEQUENCE_BITS) - 1
+        node_mask = (1 << self.NODE_BITS) - 1
+
+        sequence = last_id & sequence_mask
+        node = (last_id >> self.SEQUENCE_BITS) & node_mask
+        millis = last_id >> (self.SEQUENCE_BITS + self.NODE_BITS)
+
+        if node == self.node_id and sequence < sequence_mask:
+            return last_id + 1
+        if node >= self.node_id:
+            millis += 1
+        return ((millis << self.NODE_BITS) | self.node_id) << self.SEQUENCE_BITS
+
+    def observe(self, existing_id):
+        """
+        Сообщить генератору об уже существующем ID (например загруженном из файла)
+
+        ЗАЧЕМ:
+        Если файл создан на машине с часами "впереди",
+        новые ID всё равно будут больше загруженных
+        """
+        with self._lock:
+            if existing_id > self._last_id:
+                self._last_id = existing_id
+
+
+# Один генератор на весь процесс - его используют Transaction и хранилища
+default_generator = IdGenerator()
+
+if hasattr(os, "register_at_fork"):  # нет на Windows - там нет и fork()
+    os.register_at_fork(after_in_child=default_generator._after_fork)
+
+
+def next_id():
+    return default_generator.next_id()
@@ -0,0 +1,149 @@
+import csv
+import gzip
+import json
+from decimal import Decimal, InvalidOperation
+
+# Заголовки CSV - те же что были у export_to_csv, плюс счёт и валюта в конце
+CSV_HEADER = ["ID", "Дата", "Тип", "Сумма", "Категория", "Описание", "Счёт", "Валюта"]
+
+# Заголовок CSV -> ключ словаря строки (английские названия тоже понимаем)
+CSV_COLUMNS = {
+    "ID": "id",
+    "Дата": "date",
+    "Тип": "transaction_type",
+    "Сумма": "amount",
+    "Категория": "category",
+    "Описание": "description",
+    "Счёт": "account",
+    "Валюта": "currency",
+    "id": "id",
+    "date": "date",
+    "transaction_type": "transaction_type",
+    "amount": "amount",
+    "category": "category",
+    "description": "description",
+    "account": "account",
+    "currency": "currency",
+}
+
+
+def open_text(filename, mode):
+    """
+    Открыть текстовый файл, сжатый gzip если имя кончается на .gz
+
+    newline="" - так требует модуль csv (он сам управляет переводами строк)
+    """
+    if filename.endswith(".gz"):
+        return gzip.open(filename, mode + "t", encoding="utf-8", newline="")
+    return open(filename, mode, encoding="utf-8", newline="")
+
+
+def parse_amount(value):
+    """
+    Строка из CSV -> число
+
+    "100" -> 100, "100.50" -> Decimal("100.50")
+    Decimal, а не float: копейки не искажаются по дороге в Transaction
+    Нечисло оставляем строкой - Transaction.validate сообщит об ошибке
+    """
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        return value
+
+
+def _report(progress, count, every):
+    # Сообщаем о прогрессе раз в every строк, а не на каждой
+    if progress and count % every == 0:
+        progress(count)
+
+
+def write_csv(transactions, filename, progress=None, progress_every=10000):
+    """
+    Записать транзакции в CSV по одной (список не собирается)
+
+    csv.writer сам берёт в кавычки поля с запятыми, кавычками и переводами строк
+
+    ВОЗВРАЩАЕТ:
+    Количество записанных строк
+    """
+    count = 0
+    with open_text(filename, "w") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        for t in transactions:
+            writer.writerow([t.id, t.date, t.transaction_type, t.amount, t.category, t.description,
+                             t.account, t.currency])
+            count += 1
+            _report(progress, count, progress_every)
+
+    if progress:
+        progress(count)
+    return count
+
+
+def read_csv(filename, progress=None, progress_every=10000):
+    """
+    Генератор: читает CSV и отдаёт по одному словарю на строку
+
+    yield - функция отдаёт значение и "засыпает" до следующего запроса,
+    поэтому в памяти всегда только одна строка файла
+    """
+    count = 0
+    with open_text(filename, "r") as f:
+        reader = csv.DictReader(f)
+        for record in reader:
+            row = {}
+            for column, value in record.items():
+                key = CSV_COLUMNS.get(column)
+                # Пустые счёт/валюта - значит "по умолчанию" (ключа просто нет)
+                if key and (value or key not in ("account", "currency")):
+                    row[key] = value
+            if "amount" in row:
+                row["amount"] = parse_amount(row["amount"])
+
+            yield row
+            count += 1
+            _report(progress, count, progress_every)
+
+    if progress:
+        progress(count)
+
+
+def write_jsonl(transactions, filename, progress=None, progress_every=10000):
+    """
+    JSON Lines: одна транзакция = одна строка JSON
+
+    Удобно для больших файлов: можно читать и писать построчно
+    """
+    count = 0
+    with open_text(filename, "w") as f:
+        for t in transactions:
+            f.write(json.dumps(t.to_dict(), ensure_ascii=False) + "\n")
+            count += 1
+            _report(progress, count, progress_every)
+
+    if progress:
+        progress(count)
+    return count
+
+
+def read_jsonl(filename, progress=None, progress_every=10000):
+    """Генератор: читает JSON Lines и отдаёт по одному словарю"""
+    count = 0
+    with open_text(filename, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+
+            yield json.loads(line)
+            count += 1
+            _report(progress, count, progress_every)
+
+    if progress:
+        progress(count)
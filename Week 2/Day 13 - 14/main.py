@@ -1,11 +1,34 @@
 from finance_manager import FinanceManager
-from transaction import Transaction
+from transaction import Transaction, DEFAULT_ACCOUNT, DEFAULT_CURRENCY, CURRENCY_NAMES
+from storage import JournalStorage, BackgroundWriter, CorruptedLedgerError
+from pagination import TransactionPager
+from alerts import load_budgets, save_budgets
+from fx import RateTable, MissingRateError
+from datetime import date
 import re
+from decimal import Decimal, InvalidOperation
 
 
 class FinanceApp:
-    def __init__(self):
-        self.manager = FinanceManager("transactions.json") # При создании он автоматически загрузит transactions.json
+    def __init__(self, filename="transactions.json"):
+        # Журнал + фоновая запись: изменения дописываются в transactions.json.journal
+        # пачками, под блокировкой - несколько копий программы могут работать с одним файлом
+        storage = BackgroundWriter(JournalStorage(filename))
+        self.manager = FinanceManager(filename, storage=storage) # При создании он автоматически загрузит transactions.json
+        self.page_size = 20  # Сколько транзакций на одной странице просмотра
+
+        # Бюджеты на месяц по категориям - в отдельном файле
+        self.budgets_file = "budgets.json"
+        for category, amount in load_budgets(self.budgets_file).items():
+            self.manager.set_budget(category, amount)
+
+        # Менеджер сообщает о превышении бюджета и необычных тратах,
+        # мы копим предупреждения и показываем их после действия (show_alerts)
+        self.alerts = []
+        self.manager.add_alert_hook(self.alerts.append)
+
+        # Курсы валют для сводного баланса (date,currency,rate) - необязательный файл
+        self.rates_file = "rates.csv"
         # Списки категорий для расходов и доходов
         self.expense_categories = [
             "Еда",
@@ -36,14 +59,15 @@ class FinanceApp:
             return False, "Сумма должна быть числом (например: 100 или 100.50)"
         
         try:
-            amount = float(amount_str)
+            # Decimal, а не float: "0.10" остаётся ровно десятью копейками
+            amount = Decimal(amount_str)
 
             if amount <= 0:
                 return False , "Сумма должна быть больше нуля"
             return True, amount
         
 
-        except ValueError:
+        except (ValueError, InvalidOperation):
             return False, "Некорректная сумма"
         
     def select_category(self, transaction_type):
@@ -98,7 +122,8 @@ class FinanceApp:
         2. Спрашиваем сумму (с валидацией)
         3. Выбираем категорию
         4. Вводим описание
-        5. Создаём транзакцию
+        5. Счёт и валюта (Enter = основной счёт в рублях)
+        6. Создаём транзакцию
         """
         print("\n" + "="*60)
         print("ДОБАВИТЬ ТРАНЗАКЦИЮ")
@@ -149,13 +174,19 @@ class FinanceApp:
         # ШАГ 4: Ввести описание
         description = input("\nОписание (необязательно): ").strip()
 
+        # ШАГ 5: Счёт и валюта
+        account = input(f"Счёт (Enter = {DEFAULT_ACCOUNT}): ").strip() or DEFAULT_ACCOUNT
+        currency = input(f"Валюта (Enter = {DEFAULT_CURRENCY}): ").strip().upper() or DEFAULT_CURRENCY
+
         try:
             # Вызываем метод менеджера
             transaction = self.manager.add_transaction(
                 amount=amount,
                 category=category,
                 description=description,
-                transaction_type=transaction_type
+                transaction_type=transaction_type,
+                account=account,
+                currency=currency
             )
             
             print("\n✓ Транзакция добавлена:")
@@ -178,33 +209,82 @@ class FinanceApp:
 
         choice = input("\nВыбор (1-3): ").strip()
         
-        # Получаем нужные транзакции
+        # Фильтр по типу
         if choice == "1":
-            transactions = self.manager.get_all_transactions()
+            filters = {}
             title = "ВСЕ ТРАНЗАКЦИИ"
         elif choice == "2":
-            transactions = self.manager.get_transactions_by_type("income")
+            filters = {"transaction_type": "income"}
             title = "ДОХОДЫ"
         elif choice == "3":
-            transactions = self.manager.get_transactions_by_type("expense")
+            filters = {"transaction_type": "expense"}
             title = "РАСХОДЫ"
         else:
             print("Некорректный выбор")
             return
-        
-        # Показываем
+
+        # Дополнительные фильтры (Enter = пропустить)
+        category = input("Категория (Enter = все): ").strip()
+        if category:
+            filters["category"] = category
+
+        for key, prompt in (("min_amount", "Сумма от"), ("max_amount", "Сумма до")):
+            value = input(f"{prompt} (Enter = без ограничения): ").strip()
+            if value:
+                is_valid, amount = self.validate_amount(value)
+                if not is_valid:
+                    print(f"Ошибка: {amount}")
+                    return
+                filters[key] = amount
+
+        # Пейджер создаёт объекты только для одной страницы
+        pager = TransactionPager(self.manager, page_size=self.page_size, **filters)
+        page = pager.first_page()
+
+        while True:
+            self.print_page(title, page)
+
+            if not page:
+                return
+
+            print("\nn - дальше, p - назад, d - перейти к дате, q - в меню")
+            command = input("Команда: ").strip().lower()
+
+            if command == "n":
+                if not pager.has_next:
+                    print("\nЭто последняя страница")
+                page = pager.next_page()
+            elif command == "p":
+                if not pager.has_prev:
+                    print("\nЭто первая страница")
+                page = pager.prev_page()
+            elif command == "d":
+                day = input("Дата (ГГГГ-ММ-ДД): ").strip()
+                if not re.match(r'^\d{4}-\d{2}-\d{2}$', day):
+                    print("Формат даты: 2025-11-16")
+                    continue
+                try:
+                    page = pager.jump_to_date(day)
+                except ValueError:
+                    print("Некорректная дата")
+            elif command == "q":
+                return
+            else:
+                print("Неизвестная команда")
+
+    def print_page(self, title, page):
+        """Показать одну страницу транзакций"""
         print("\n" + "="*60)
         print(title)
         print("="*60)
         
-        if not transactions:
+        if not page:
             print("\nНет транзакций")
             return 
         
-        # Проходим по транзакциям с номерами
-        for i, t in enumerate(transactions, 1):
+        for t in page:
             # t.__str__() вызывается автоматически при print(t)
-            print(f"\n{i}. {t}")
+            print(f"\n{t}")
             print(f"   Дата: {t.date}")
             print(f"   ID: {t.id}")
         
@@ -219,43 +299,70 @@ class FinanceApp:
         
         ВЫВОДИТ:
         - Общее количество транзакций
-        - Доходы
-        - Расходы
-        - Баланс
-        - Разбивку по категориям
+        - Доходы, расходы, баланс и разбивку по категориям -
+          отдельно для каждой валюты (рубли с долларами не складываем)
+        - Балансы счетов и сводный баланс в рублях (если есть rates.csv)
         """
         print("\n" + "="*60)
         print("СТАТИСТИКА")
         print("="*60)
 
-        # Получаем статистику из менеджера
-        # stats это словарь
-        stats = self.manager.get_statistics()
-        
-        # Выводим основную информацию
-        print(f"\nВсего транзакций: {stats['total_transactions']}")
-        print(f"Доходы: {stats['total_income']:.2f} руб")
-        print(f"Расходы: {stats['total_expenses']:.2f} руб")
-
-        # Баланс (может быть отрицательным)
-        balance = stats['balance']
-        # Выбираем символ в зависимости от знака
-        balance_sign = "+" if balance >= 0 else ""
-        print(f"Баланс: {balance_sign}{balance:.2f} руб")
-
-         # Показываем категории если есть
-        if stats['categories']:
-            print("\n" + "-"*60)
-            print("ПО КАТЕГОРИЯМ:")
-            print("-"*60)
-
-             # .items() возвращает пары (ключ, значение) из словаря
-            # {"Еда": 1000, "Транспорт": 500}.items() -> [("Еда", 1000), ("Транспорт", 500)]
-            for category, amount in stats['categories'].items():
-                print(f"{category:20} {amount:>10.2f} руб")
-                # {category:20} - выровнять по левому краю, ширина 20
-                # {amount:>10.2f} - выровнять по правому краю, ширина 10, 2 знака после точки
-            print("\n" + "="*60)
+        print(f"\nВсего транзакций: {len(self.manager)}")
+
+        for currency in self.manager.get_currencies() or [DEFAULT_CURRENCY]:
+            # Получаем статистику из менеджера
+            # stats это словарь
+            stats = self.manager.get_statistics(currency)
+            name = CURRENCY_NAMES.get(currency, currency)
+
+            print(f"\n--- {currency} ---")
+            print(f"Доходы: {stats['total_income']:.2f} {name}")
+            print(f"Расходы: {stats['total_expenses']:.2f} {name}")
+
+            # Баланс (может быть отрицательным)
+            balance = stats['balance']
+            # Выбираем символ в зависимости от знака
+            balance_sign = "+" if balance >= 0 else ""
+            print(f"Баланс: {balance_sign}{balance:.2f} {name}")
+
+            # Показываем категории если есть
+            if stats['categories']:
+                print("\n" + "-"*60)
+                print("ПО КАТЕГОРИЯМ:")
+                print("-"*60)
+
+                # .items() возвращает пары (ключ, значение) из словаря
+                # {"Еда": 1000, "Транспорт": 500}.items() -> [("Еда", 1000), ("Транспорт", 500)]
+                for category, amount in stats['categories'].items():
+                    print(f"{category:20} {amount:>10.2f} {name}")
+                    # {category:20} - выровнять по левому краю, ширина 20
+                    # {amount:>10.2f} - выровнять по правому краю, ширина 10, 2 знака после точки
+
+        self.show_accounts()
+        print("\n" + "="*60)
+
+    def show_accounts(self):
+        """Балансы по счетам и сводный баланс по курсам из rates.csv"""
+        balances = self.manager.get_account_balances()
+        if not balances:
+            return
+
+        print("\n" + "-"*60)
+        print("ПО СЧЕТАМ:")
+        print("-"*60)
+        for account, by_currency in balances.items():
+            for currency, balance in by_currency.items():
+                print(f"{account:20} {balance:>10.2f} {currency}")
+
+        try:
+            rates = RateTable.load(self.rates_file)
+            total = self.manager.get_consolidated_balance(rates)
+        except FileNotFoundError:
+            return  # Курсов нет - сводный баланс не показываем
+        except MissingRateError as e:
+            print(f"\nСводный баланс недоступен: {e}")
+            return
+        print(f"\nСводный баланс: {total:.2f} {DEFAULT_CURRENCY}")
 
 
         
@@ -273,14 +380,16 @@ class FinanceApp:
         print("УДАЛИТЬ ТРАНЗАКЦИЮ")
         print("="*60)
         
-        transactions = self.manager.get_all_transactions()
+        # Показываем только последнюю страницу, а не все транзакции
+        # Остальные ID можно найти в "Просмотр транзакций"
+        transactions = TransactionPager(self.manager, page_size=self.page_size).last_page()
         
         if not transactions:
             print("\nНет транзакций")
             return
         
         # Показываем список
-        print("\nТранзакции:")
+        print("\nПоследние транзакции:")
         for i, t in enumerate(transactions, 1):
             print(f"{i}. {t} (ID: {t.id})")
 
@@ -315,6 +424,65 @@ class FinanceApp:
 
 
 
+    def search_transactions(self):
+        """Поиск по описанию (начало слова тоже подходит: "хле" найдёт "хлеб")"""
+        print("\n" + "="*60)
+        print("ПОИСК")
+        print("="*60)
+
+        query = input("\nСлова из описания: ").strip()
+        if not query:
+            print("Пустой запрос")
+            return
+
+        category = input("Категория (Enter = все): ").strip() or None
+
+        # Показываем не больше одной страницы
+        found = self.manager.search(query, category=category, limit=self.page_size)
+        self.print_page(f"НАЙДЕНО ПО ЗАПРОСУ \"{query}\"", found)
+
+    def show_alerts(self):
+        """Показать накопленные предупреждения и очистить список"""
+        for alert in self.alerts:
+            print(f"\n⚠ {alert['message']}")
+        self.alerts.clear()
+
+    def manage_budgets(self):
+        """Бюджеты на месяц: сколько потрачено и установка нового"""
+        print("\n" + "="*60)
+        print("БЮДЖЕТЫ")
+        print("="*60)
+
+        month = date.today().strftime("%Y-%m")
+        usage = self.manager.get_budget_usage(month)
+
+        if usage:
+            # Бюджеты - в основной валюте, расходы в других валютах в них не входят
+            name = CURRENCY_NAMES.get(DEFAULT_CURRENCY, DEFAULT_CURRENCY)
+            print(f"\nМесяц: {month} (в {DEFAULT_CURRENCY})\n")
+            for category, row in usage.items():
+                print(f"{category:20} {row['spent']:>10.2f} из {row['budget']:>10.2f} {name}"
+                      f"  (осталось {row['left']:.2f})")
+        else:
+            print("\nБюджеты не заданы")
+
+        category = input("\nКатегория для нового бюджета (Enter = назад): ").strip()
+        if not category:
+            return
+
+        amount_str = input("Бюджет на месяц (0 = убрать): ").strip()
+        if amount_str == "0":
+            self.manager.remove_budget(category)
+        else:
+            is_valid, amount = self.validate_amount(amount_str)
+            if not is_valid:
+                print(f"Ошибка: {amount}")
+                return
+            self.manager.set_budget(category, amount)
+
+        save_budgets(self.budgets_file, self.manager.get_budgets())
+        print("\n✓ Бюджеты сохранены")
+
     def export_to_csv(self):
         """Экспорт в CSV"""
         print("\n" + "="*60)
@@ -363,11 +531,13 @@ class FinanceApp:
             print("3. Статистика")
             print("4. Удалить транзакцию")
             print("5. Экспорт в CSV")
-            print("6. Выход")
+            print("6. Поиск")
+            print("7. Бюджеты")
+            print("8. Выход")
             print("="*60)
             
             try:
-                choice = input("\nВыбор (1-6): ").strip()
+                choice = input("\nВыбор (1-8): ").strip()
                 
                 if choice == "1":
                     self.add_transaction_interactive()
@@ -385,11 +555,19 @@ class FinanceApp:
                     self.export_to_csv()
                 
                 elif choice == "6":
+                    self.search_transactions()
+                
+                elif choice == "7":
+                    self.manage_budgets()
+                
+                elif choice == "8":
                     print("\nДо встречи!")
                     break  # Выход из цикла = завершение программы
                 
                 else:
-                    print("\nВыберите от 1 до 6")
+                    print("\nВыберите от 1 до 8")
+                
+                self.show_alerts()
             
             except KeyboardInterrupt:
                 # Если нажали Ctrl+C
@@ -402,6 +580,9 @@ class FinanceApp:
                 print(f"\nОшибка: {e}")
                 print("Попробуйте снова")
 
+        # Дописываем на диск всё что ещё не записал фоновый поток
+        self.manager.close()
+
 
 # ==========================================
 # ЗАПУСК ПРОГРАММЫ
@@ -409,7 +590,13 @@ class FinanceApp:
 
 if __name__ == "__main__":
     # Создаём приложение
-    app = FinanceApp()
+    try:
+        app = FinanceApp()
+    except CorruptedLedgerError as e:
+        # Не начинаем с пустого списка - иначе затрём данные
+        print(f"\n{e}")
+        print("Восстановите файл из резервной копии или исправьте его вручную")
+        raise SystemExit(1)
     
     # Запускаем главный цикл
     app.run()        
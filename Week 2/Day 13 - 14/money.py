@@ -0,0 +1,80 @@
+from array import array
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# Сколько копеек в рубле
+MINOR_UNITS = 100
+CENT = Decimal("0.01")
+
+
+def to_minor(value):
+    """
+    Сумма -> целое число копеек
+
+    100 -> 10000, 100.5 -> 10050, Decimal("0.1") -> 10, "99.99" -> 9999
+
+    ПОЧЕМУ ЧЕРЕЗ str:
+    float 0.1 на самом деле 0.1000000000000000055...
+    Decimal(str(0.1)) = Decimal("0.1") - ровно то, что ввёл человек.
+    Доли копейки округляем по правилам (0.005 -> 0.01).
+
+    ValueError - если это не число (или бесконечность / NaN)
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Сумма должна быть числом, получено {type(value)}")
+    if isinstance(value, int):
+        return value * MINOR_UNITS
+
+    try:
+        amount = Decimal(str(value)) if isinstance(value, float) else Decimal(value)
+        return int(amount.quantize(CENT, rounding=ROUND_HALF_UP) * MINOR_UNITS)
+    except (InvalidOperation, TypeError, ValueError):
+        raise ValueError(f"Сумма должна быть числом, получено {value!r}") from None
+
+
+def from_minor(minor):
+    """
+    Копейки -> Decimal
+
+    10000 -> Decimal("100"), 10050 -> Decimal("100.50")
+    Decimal точно сравнивается с int и float: Decimal("100.50") == 100.5
+    """
+    if minor % MINOR_UNITS == 0:
+        return Decimal(minor // MINOR_UNITS)
+    return Decimal(minor).scaleb(-2)
+
+
+def to_number(minor):
+    """
+    Копейки -> число для JSON (формат файлов не меняется)
+
+    10000 -> 100 (int), 10050 -> 100.5 (float)
+    float из двух знаков после точки читается обратно без потерь
+    """
+    if minor % MINOR_UNITS == 0:
+        return minor // MINOR_UNITS
+    return float(from_minor(minor))
+
+
+def minor_array(values=()):
+    """
+    Компактный массив копеек: array('q') - 8 байт на сумму вместо объекта int
+
+    'q' - знаковое 64-битное целое. Хватает на 92 квадриллиона рублей
+    """
+    return array("q", values)
+
+
+def sum_minor(values):
+    """
+    Точная сумма копеек
+
+    Для array('q') при установленном NumPy складываем векторно (int64 без копирования),
+    иначе встроенный sum - целые числа в Python складываются без погрешности
+    """
+    if isinstance(values, array) and values.typecode == "q" and len(values) > 0:
+        try:
+            import numpy as np
+        except ImportError:
+            return sum(values)
+        return int(np.frombuffer(values, dtype=np.int64).sum())
+    return sum(values)
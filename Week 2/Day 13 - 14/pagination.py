@@ -0,0 +1,103 @@
+from itertools import islice
+
+
+def cursor_of(transaction):
+    """Ключ транзакции в индексе дат: (timestamp, id)"""
+    return (transaction.timestamp, transaction.id)
+
+
+class TransactionPager:
+    """
+    Постраничный просмотр транзакций (по дате, от старых к новым)
+
+    КАК РАБОТАЕТ (keyset / cursor pagination):
+    Страница запоминает ключ первой и последней транзакции.
+    - next_page: берём page_size транзакций ПОСЛЕ последнего ключа
+    - prev_page: берём page_size транзакций ДО первого ключа (идём назад)
+    - jump_to_date: начинаем с первой транзакции указанного дня
+
+    Каждый раз создаётся только page_size объектов, сколько бы
+    транзакций ни было. Фильтры передаются в FinanceManager.iter_transactions.
+
+    ПРИМЕР:
+    pager = TransactionPager(manager, page_size=20, category="Еда")
+    page = pager.first_page()
+    page = pager.next_page()
+    """
+
+    def __init__(self, manager, page_size=20, **filters):
+        self.manager = manager
+        self.page_size = page_size
+        self.filters = filters
+        self.page = []
+        self.has_next = False
+        self.has_prev = False
+
+    def _iter(self, cursor=None, reverse=False, start=None):
+        filters = dict(self.filters)
+        if start is not None:
+            # Переход к дате заменяет фильтр start
+            filters["start"] = start
+        return self.manager.iter_transactions(cursor=cursor, reverse=reverse, **filters)
+
+    def _fetch(self, cursor=None, reverse=False, start=None):
+        # Берём на одну больше - так узнаём есть ли следующая страница
+        items = list(islice(self._iter(cursor, reverse, start), self.page_size + 1))
+        more = len(items) > self.page_size
+        return items[:self.page_size], more
+
+    def first_page(self):
+        self.page, self.has_next = self._fetch()
+        self.has_prev = False
+        return self.page
+
+    def last_page(self):
+        items, self.has_prev = self._fetch(reverse=True)
+        self.page = items[::-1]
+        self.has_next = False
+        return self.page
+
+    def next_page(self):
+        """Следующая страница (если её нет - остаёмся на текущей)"""
+        if not self.page:
+            return self.first_page()
+
+        items, more = self._fetch(cursor=cursor_of(self.page[-1]))
+        if items:
+            self.page = items
+            self.has_next = more
+            self.has_prev = True
+        else:
+            self.has_next = False
+        return self.page
+
+    def prev_page(self):
+        """Предыдущая страница (если её нет - остаёмся на текущей)"""
+        if not self.page:
+            return self.first_page()
+
+        items, more = self._fetch(cursor=cursor_of(self.page[0]), reverse=True)
+        if items:
+            # Шли назад - разворачиваем в порядок по возрастанию даты
+            self.page = items[::-1]
+            self.has_prev = more
+            self.has_next = True
+        else:
+            self.has_prev = False
+        return self.page
+
+    def jump_to_date(self, day):
+        """
+        Страница начиная с дня day (date или строка "2025-11-16")
+
+        Если в этот день и позже транзакций нет - показываем последнюю страницу
+        """
+        items, more = self._fetch(start=day)
+        if not items:
+            return self.last_page()
+
+        self.page = items
+        self.has_next = more
+        # Есть ли что-то раньше: одна транзакция назад от первой на странице
+        self.has_prev = next(self._iter(cursor_of(items[0]), reverse=True), None) is not None
+        return self.page
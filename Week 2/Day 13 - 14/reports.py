@@ -0,0 +1,156 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+from money import from_minor
+from transaction import DEFAULT_CURRENCY
+
+# Поддерживаемые периоды отчёта
+PERIODS = ("day", "week", "month", "year")
+
+
+def parse_day(value):
+    """
+    Превратить границу периода в date
+
+    Принимает date, datetime или строку "2025-11-16"
+    """
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def bucket_key(day, period):
+    """
+    Ключ периода для дня
+
+    day   -> "2025-11-16"
+    week  -> "2025-W47" (неделя по ISO: с понедельника)
+    month -> "2025-11"
+    year  -> "2025"
+    """
+    if period == "day":
+        return day.isoformat()
+    if period == "week":
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    if period == "month":
+        return f"{day.year}-{day.month:02d}"
+    if period == "year":
+        return str(day.year)
+    raise ValueError(f"Период должен быть одним из {PERIODS}")
+
+
+class DailyRollups:
+    """
+    Заранее посчитанные суммы по дням
+
+    КАК РАБОТАЕТ:
+    Для каждой пары (валюта, день) храним (суммы - целые копейки, см. money.py):
+        {"income": ..., "expense": ..., "count": ...,
+         "categories": {категория: сумма}, "category_counts": {категория: количество}}
+    и отсортированный список дней каждой валюты (self.days).
+    Рубли и доллары не складываются - отчёт всегда в одной валюте.
+
+    - add/remove обновляют один день - O(категорий дня)
+    - Отчёт за год = пройти максимум 366 дней и сложить их в недели/месяцы,
+      сколько бы транзакций ни было в каждом дне
+    """
+
+    def __init__(self):
+        self.by_day = {}  # (валюта, date) -> суммы за день
+        self.days = {}    # валюта -> отсортированные дни (для поиска диапазона через bisect)
+
+    def add(self, transaction):
+        day = date.fromtimestamp(transaction.timestamp)
+        key = (transaction.currency, day)
+        rollup = self.by_day.get(key)
+        if rollup is None:
+            rollup = {"income": 0, "expense": 0, "count": 0, "categories": {}, "category_counts": {}}
+            self.by_day[key] = rollup
+            # insort вставляет в отсортированный список, не нарушая порядок
+            insort(self.days.setdefault(transaction.currency, []), day)
+
+        rollup[transaction.transaction_type] += transaction.amount_minor
+        rollup["count"] += 1
+        categories = rollup["categories"]
+        categories[transaction.category] = categories.get(transaction.category, 0) + transaction.amount_minor
+        counts = rollup["category_counts"]
+        counts[transaction.category] = counts.get(transaction.category, 0) + 1
+
+    def remove(self, transaction):
+        day = date.fromtimestamp(transaction.timestamp)
+        key = (transaction.currency, day)
+        rollup = self.by_day[key]
+
+        rollup["count"] -= 1
+        if rollup["count"] == 0:
+            # День опустел - убираем его целиком
+            del self.by_day[key]
+            days = self.days[transaction.currency]
+            del days[bisect_left(days, day)]
+            if not days:
+                del self.days[transaction.currency]
+            return
+
+        rollup[transaction.transaction_type] -= transaction.amount_minor
+        counts = rollup["category_counts"]
+        counts[transaction.category] -= 1
+        if counts[transaction.category] == 0:
+            del counts[transaction.category]
+            del rollup["categories"][transaction.category]
+        else:
+            rollup["categories"][transaction.category] -= transaction.amount_minor
+
+    def currencies(self):
+        """Валюты, в которых есть транзакции"""
+        return list(self.days)
+
+    def report(self, period="month", start=None, end=None, currency=DEFAULT_CURRENCY):
+        """
+        Отчёт по периодам за дни [start, end] (обе границы включительно)
+        по транзакциям в валюте currency
+
+        ВОЗВРАЩАЕТ:
+        Список словарей по возрастанию периода:
+            {"period": "2025-11", "income": ..., "expenses": ..., "balance": ...,
+             "count": ..., "categories": {...}}
+        Периоды без транзакций не включаются. Суммы - Decimal
+        """
+        if period not in PERIODS:
+            raise ValueError(f"Период должен быть одним из {PERIODS}")
+
+        start = parse_day(start)
+        end = parse_day(end)
+
+        # Границы диапазона в отсортированном списке дней
+        days = self.days.get(currency, [])
+        first = bisect_left(days, start) if start else 0
+        last = bisect_right(days, end) if end else len(days)
+
+        buckets = {}  # dict помнит порядок, а дни идут по возрастанию
+        for day in days[first:last]:
+            rollup = self.by_day[(currency, day)]
+            key = bucket_key(day, period)
+
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = {"period": key, "income": 0, "expenses": 0, "balance": 0,
+                          "count": 0, "categories": {}}
+                buckets[key] = bucket
+
+            bucket["income"] += rollup["income"]
+            bucket["expenses"] += rollup["expense"]
+            bucket["count"] += rollup["count"]
+            for category, amount in rollup["categories"].items():
+                bucket["categories"][category] = bucket["categories"].get(category, 0) + amount
+
+        # Складывали копейки, наружу отдаём рубли
+        for bucket in buckets.values():
+            bucket["balance"] = from_minor(bucket["income"] - bucket["expenses"])
+            bucket["income"] = from_minor(bucket["income"])
+            bucket["expenses"] = from_minor(bucket["expenses"])
+            bucket["categories"] = {category: from_minor(total)
+                                    for category, total in bucket["categories"].items()}
+
+        return list(buckets.values())
@@ -0,0 +1,111 @@
+import re
+from bisect import bisect_left
+
+# Слово = буквы/цифры подряд (\w понимает и кириллицу)
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """
+    Текст -> слова в нижнем регистре
+
+    "Купил ХЛЕБ, молоко" -> ["купил", "хлеб", "молоко"]
+    casefold() - как lower(), но правильно для всех языков
+    """
+    return TOKEN_PATTERN.findall(text.casefold())
+
+
+class SearchIndex:
+    """
+    Обратный (inverted) индекс: слово -> ID транзакций с этим словом в описании
+
+    ПРОБЛЕМА:
+    Поиск подстроки = пройти все описания, O(n) на каждый запрос.
+
+    КАК РАБОТАЕТ:
+        "хлеб"   -> {101, 205}
+        "хлебцы" -> {310}
+        "метро"  -> {102}
+    - Запрос "хле" ищет все слова, начинающиеся на "хле" (префикс).
+      Слова лежат в отсортированном списке self.words, поэтому
+      все слова с одним префиксом идут подряд - находим их через bisect
+    - Несколько слов в запросе = транзакция должна содержать каждое (И)
+    - add/remove обновляют только слова одной транзакции
+    - Новые слова не вставляются в self.words сразу (insort на каждое
+      слово при загрузке миллиона строк - O(n²)), а список пересобирается
+      одним sorted() при следующем поиске
+    """
+
+    def __init__(self):
+        self.postings = {}    # слово -> множество ID
+        self.words = []       # отсортированный список всех слов
+        self._sorted = True   # False - появились слова, которых нет в self.words
+
+    def add(self, transaction):
+        for word in set(tokenize(transaction.description)):
+            ids = self.postings.get(word)
+            if ids is None:
+                ids = set()
+                self.postings[word] = ids
+                self._sorted = False
+            ids.add(transaction.id)
+
+    def remove(self, transaction):
+        for word in set(tokenize(transaction.description)):
+            ids = self.postings[word]
+            ids.discard(transaction.id)
+            if not ids:
+                # Слово больше нигде не встречается - убираем его совсем
+                del self.postings[word]
+                if self._sorted:
+                    del self.words[bisect_left(self.words, word)]
+
+    def _prefix_ids(self, prefix):
+        # Все слова с этим префиксом стоят подряд начиная с bisect_left
+        position = bisect_left(self.words, prefix)
+        matched = []
+        while position < len(self.words) and self.words[position].startswith(prefix):
+            matched.append(self.postings[self.words[position]])
+            position += 1
+
+        if len(matched) == 1:
+            return matched[0]  # Одно слово - его множество без копирования
+        return set().union(*matched)
+
+    def match_sets(self, query, prefix=True):
+        """
+        Множество ID для каждого слова запроса, от меньшего к большему
+
+        Результат - транзакции, которые есть в КАЖДОМ множестве.
+        Множества нельзя менять - это сам индекс.
+
+        prefix=True  - "хле" найдёт "хлеб" и "хлебцы"
+        prefix=False - только слово целиком
+
+        Пустой запрос -> None (фильтра по тексту нет)
+        """
+        words = tokenize(query)
+        if not words:
+            return None
+
+        if not self._sorted:
+            self.words = sorted(self.postings)
+            self._sorted = True
+
+        sets = []
+        for word in set(words):
+            ids = self._prefix_ids(word) if prefix else self.postings.get(word, set())
+            if not ids:
+                return [set()]  # Одно слово не нашлось - не найдётся ничего
+            sets.append(ids)
+
+        sets.sort(key=len)
+        return sets
+
+    def match(self, query, prefix=True):
+        """ID транзакций, в описании которых есть все слова запроса (None - пустой запрос)"""
+        sets = self.match_sets(query, prefix=prefix)
+        if sets is None:
+            return None
+        # Пересекаем начиная с самого маленького множества - меньше работы
+        return sets[0].intersection(*sets[1:])
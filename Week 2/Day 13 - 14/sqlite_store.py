@@ -0,0 +1,379 @@
+import sqlite3
+from transaction import Transaction, DEFAULT_ACCOUNT, DEFAULT_CURRENCY
+from id_generator import default_generator
+from money import from_minor
+from reports import parse_day
+from search_index import tokenize
+
+
+def dict_factory(cursor, row):
+    """
+    Преобразовать строку БД в словарь (как в Week 3/Day 17/database.py)
+
+    Вместо: (1, 100, 'Еда')
+    Получим: {'id': 1, 'amount': 100, 'category': 'Еда'}
+    """
+    d = {}
+    for idx, col in enumerate(cursor.description):
+        d[col[0]] = row[idx]
+    return d
+
+
+class SQLiteFinanceStore:
+    """
+    Альтернатива FinanceManager: транзакции хранятся в SQLite
+
+    ОТЛИЧИЯ ОТ FinanceManager:
+    - Ничего не загружается в память при запуске - старт мгновенный
+    - Фильтры используют индексы (transaction_type, category, date)
+    - Суммы и статистику считает SQL (SUM, COUNT, GROUP BY),
+      Python получает только готовые числа
+    - Суммы хранятся целыми копейками (amount_minor INTEGER):
+      SUM по целым точный, в отличие от REAL
+    - Поиск по описанию - полнотекстовый индекс FTS5 (таблица transactions_fts)
+    - Балансы по счетам и валютам - один GROUP BY account, currency
+
+    Публичные методы те же что у FinanceManager,
+    поэтому его можно подставить вместо менеджера.
+    """
+
+    def __init__(self, filename="transactions.db"):
+        self.filename = filename
+        # Одно соединение на всё время жизни хранилища:
+        # открывать новое на каждый запрос - дорого
+        self.conn = sqlite3.connect(filename)
+        self.conn.row_factory = dict_factory
+        self.init_db()
+
+    def init_db(self):
+        """Создать таблицу и индексы"""
+        with self.conn:
+            cursor = self.conn.cursor()
+
+            self._migrate_amounts(cursor)
+
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS transactions (
+                id INTEGER PRIMARY KEY,
+                amount_minor INTEGER NOT NULL,
+                category TEXT NOT NULL,
+                description TEXT NOT NULL DEFAULT '',
+                transaction_type TEXT NOT NULL,
+                date TEXT NOT NULL,
+                account TEXT NOT NULL DEFAULT '{DEFAULT_ACCOUNT}',
+                currency TEXT NOT NULL DEFAULT '{DEFAULT_CURRENCY}'
+            )
+            """.format(DEFAULT_ACCOUNT=DEFAULT_ACCOUNT, DEFAULT_CURRENCY=DEFAULT_CURRENCY))
+
+            self._migrate_accounts(cursor)
+
+            # Индексы - чтобы WHERE transaction_type = ? не читал всю таблицу
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_transactions_type
+            ON transactions (transaction_type)
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_transactions_category
+            ON transactions (category)
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_transactions_date
+            ON transactions (date)
+            """)
+
+            self._init_search(cursor)
+
+            cursor.execute("SELECT MAX(id) AS last_id FROM transactions")
+            self._last_id = cursor.fetchone()["last_id"] or 0
+            default_generator.observe(self._last_id)
+
+    def _migrate_amounts(self, cursor):
+        """
+        Старая база: сумма в колонке amount REAL -> переносим в amount_minor
+
+        Колонку в SQLite нельзя просто поменять, поэтому пересоздаём таблицу.
+        Индексы старой таблицы удалятся вместе с ней и создадутся заново в init_db
+        """
+        cursor.execute("PRAGMA table_info(transactions)")
+        columns = {row["name"] for row in cursor.fetchall()}
+        if "amount" not in columns:
+            return  # Новая база или уже перенесена
+
+        cursor.execute("ALTER TABLE transactions RENAME TO transactions_old")
+        cursor.execute("""
+        CREATE TABLE transactions (
+            id INTEGER PRIMARY KEY,
+            amount_minor INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            description TEXT NOT NULL DEFAULT '',
+            transaction_type TEXT NOT NULL,
+            date TEXT NOT NULL
+        )
+        """)
+        cursor.execute("""
+        INSERT INTO transactions (id, amount_minor, category, description, transaction_type, date)
+        SELECT id, CAST(ROUND(amount * 100) AS INTEGER), category, description, transaction_type, date
+        FROM transactions_old
+        """)
+        cursor.execute("DROP TABLE transactions_old")
+
+    def _migrate_accounts(self, cursor):
+        """
+        База до счетов и валют: добавляем колонки account и currency
+
+        ADD COLUMN с DEFAULT не переписывает таблицу - старые строки
+        сразу читаются как "Основной" счёт в рублях
+        """
+        cursor.execute("PRAGMA table_info(transactions)")
+        columns = {row["name"] for row in cursor.fetchall()}
+        for column, default in (("account", DEFAULT_ACCOUNT), ("currency", DEFAULT_CURRENCY)):
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE transactions ADD COLUMN {column} TEXT NOT NULL DEFAULT '{default}'")
+
+    def _init_search(self, cursor):
+        """
+        Полнотекстовый индекс FTS5 по описаниям
+
+        content='transactions' - FTS не хранит копию текста, только индекс слов.
+        Триггеры обновляют индекс при каждом INSERT/DELETE в transactions
+        """
+        cursor.execute("""
+        SELECT COUNT(*) AS found FROM sqlite_master WHERE name = 'transactions_fts'
+        """)
+        existed = cursor.fetchone()["found"] > 0
+
+        cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts
+        USING fts5(description, content='transactions', content_rowid='id')
+        """)
+        if not existed:
+            # База создана до поиска - проиндексировать уже записанные транзакции
+            cursor.execute("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')")
+
+        cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS transactions_fts_insert AFTER INSERT ON transactions BEGIN
+            INSERT INTO transactions_fts (rowid, description) VALUES (new.id, new.description);
+        END
+        """)
+        cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS transactions_fts_delete AFTER DELETE ON transactions BEGIN
+            INSERT INTO transactions_fts (transactions_fts, rowid, description)
+            VALUES ('delete', old.id, old.description);
+        END
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    def _insert(self, cursor, transaction):
+        # id - PRIMARY KEY, поэтому повторяться не может.
+        # Новые ID и так растут, но импортированные из старых файлов могут
+        # совпадать или быть меньше уже записанных - сдвигаем
+        if transaction.id <= self._last_id:
+            transaction.id = self._last_id + 1
+        self._last_id = transaction.id
+
+        cursor.execute("""
+        INSERT INTO transactions (id, amount_minor, category, description, transaction_type, date,
+                                  account, currency)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (transaction.id, transaction.amount_minor, transaction.category,
+              transaction.description, transaction.transaction_type, transaction.date,
+              transaction.account, transaction.currency))
+
+    def add_transaction(self, amount, category, description="", transaction_type="expense",
+                        account=DEFAULT_ACCOUNT, currency=DEFAULT_CURRENCY):
+        # Валидация та же самая - её делает Transaction
+        transaction = Transaction(amount, category, description, transaction_type, account, currency)
+
+        with self.conn:
+            self._insert(self.conn.cursor(), transaction)
+
+        return transaction
+
+    def import_transactions(self, transactions):
+        """
+        Записать готовые Transaction одной транзакцией БД
+
+        ЗАЧЕМ:
+        Перенести данные из JSON файла FinanceManager в SQLite
+        """
+        with self.conn:
+            cursor = self.conn.cursor()
+            for t in transactions:
+                self._insert(cursor, t)
+
+    def remove_transaction(self, transaction_id):
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute("DELETE FROM transactions WHERE id = ?", (transaction_id,))
+            return cursor.rowcount > 0
+
+    def _select(self, where="", params=()):
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+        SELECT id, amount_minor, category, description, transaction_type, date, account, currency
+        FROM transactions {where}
+        ORDER BY id
+        """, params)
+        return self._to_transactions(cursor.fetchall())
+
+    @staticmethod
+    def _to_transactions(rows):
+        transactions = []
+        for row in rows:
+            row["amount"] = from_minor(row.pop("amount_minor"))
+            transactions.append(Transaction.from_dict(row))
+        return transactions
+
+    def get_all_transactions(self):
+        return self._select()
+
+    def get_transactions_by_type(self, transaction_type):
+        return self._select("WHERE transaction_type = ?", (transaction_type,))
+
+    def get_transactions_by_category(self, category):
+        return self._select("WHERE category = ?", (category,))
+
+    def get_transactions_by_account(self, account):
+        return self._select("WHERE account = ?", (account,))
+
+    def get_account_balances(self):
+        """
+        Балансы по счетам - как FinanceManager.get_account_balances
+
+        ВОЗВРАЩАЕТ:
+        {"Основной": {"RUB": Decimal("4300")}, "Карта USD": {"USD": Decimal("120.50")}}
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+        SELECT account, currency,
+               SUM(CASE WHEN transaction_type = 'income' THEN amount_minor ELSE -amount_minor END) AS balance
+        FROM transactions
+        GROUP BY account, currency
+        """)
+        balances = {}
+        for row in cursor.fetchall():
+            balances.setdefault(row["account"], {})[row["currency"]] = from_minor(row["balance"])
+        return balances
+
+    def search(self, query, category=None, start=None, end=None, prefix=True, limit=None):
+        """
+        Поиск по описанию через FTS5 - то же что FinanceManager.search
+
+        Слова запроса берём через tokenize и каждое ставим в кавычки:
+        так символы вроде * или " в запросе не ломают синтаксис MATCH.
+        "хле"* - все слова, начинающиеся на "хле"
+        """
+        where = []
+        params = []
+
+        words = tokenize(query)
+        if words:
+            where.append("t.id IN (SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH ?)")
+            params.append(" ".join(f'"{word}"*' if prefix else f'"{word}"' for word in words))
+        if category is not None:
+            where.append("t.category = ?")
+            params.append(category)
+        # Дата хранится строкой "2025-11-16 10:00:00" - строки сравниваются как даты
+        if start is not None:
+            where.append("t.date >= ?")
+            params.append(f"{parse_day(start).isoformat()} 00:00:00")
+        if end is not None:
+            where.append("t.date <= ?")
+            params.append(f"{parse_day(end).isoformat()} 23:59:59")
+
+        sql = """
+        SELECT t.id, t.amount_minor, t.category, t.description, t.transaction_type, t.date,
+               t.account, t.currency
+        FROM transactions t
+        """
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY t.date, t.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        cursor = self.conn.cursor()
+        cursor.execute(sql, params)
+        return self._to_transactions(cursor.fetchall())
+
+    def _totals_by_type(self, currency):
+        # Один запрос вместо двух проходов по списку
+        # Суммы только в одной валюте - рубли с долларами не складываем
+        cursor = self.conn.cursor()
+        cursor.execute("""
+        SELECT transaction_type, SUM(amount_minor) AS total
+        FROM transactions
+        WHERE currency = ?
+        GROUP BY transaction_type
+        """, (currency,))
+        # Копейки - в рубли переводим только при выдаче наружу
+        totals = {"income": 0, "expense": 0}
+        for row in cursor.fetchall():
+            totals[row["transaction_type"]] = row["total"]
+        return totals
+
+    def get_currencies(self):
+        """Валюты, в которых есть транзакции"""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT DISTINCT currency FROM transactions ORDER BY currency")
+        return [row["currency"] for row in cursor.fetchall()]
+
+    def get_balance(self, currency=DEFAULT_CURRENCY):
+        totals = self._totals_by_type(currency)
+        return from_minor(totals["income"] - totals["expense"])
+
+    def get_total_income(self, currency=DEFAULT_CURRENCY):
+        """Общая сумма доходов в валюте currency"""
+        return from_minor(self._totals_by_type(currency)["income"])
+
+    def get_total_expenses(self, currency=DEFAULT_CURRENCY):
+        """Общая сумма расходов в валюте currency"""
+        return from_minor(self._totals_by_type(currency)["expense"])
+
+    def get_statistics(self, currency=DEFAULT_CURRENCY):
+        cursor = self.conn.cursor()
+
+        cursor.execute("SELECT COUNT(*) AS total FROM transactions")
+        total_transactions = cursor.fetchone()["total"]
+
+        cursor.execute("""
+        SELECT category, SUM(amount_minor) AS total
+        FROM transactions
+        WHERE currency = ?
+        GROUP BY category
+        """, (currency,))
+        categories = {row["category"]: from_minor(row["total"]) for row in cursor.fetchall()}
+
+        totals = self._totals_by_type(currency)
+
+        return {
+            "total_transactions": total_transactions,
+            "currency": currency,
+            "total_income": from_minor(totals["income"]),
+            "total_expenses": from_minor(totals["expense"]),
+            "balance": from_minor(totals["income"] - totals["expense"]),
+            "categories": categories
+        }
+
+
+if __name__ == "__main__":
+    print("=== Примеры SQLiteFinanceStore ===\n")
+
+    store = SQLiteFinanceStore("test_finances.db")
+    store.add_transaction(50000, "Зарплата", "Зарплата за ноябрь", "income")
+    store.add_transaction(500, "Еда", "Продукты", "expense")
+
+    stats = store.get_statistics()
+    print(f"Всего транзакций: {stats['total_transactions']}")
+    print(f"Баланс: {stats['balance']} руб")
+
+    # Посмотреть как SQLite выполняет запрос (использует ли индекс)
+    cursor = store.conn.cursor()
+    cursor.execute("EXPLAIN QUERY PLAN SELECT * FROM transactions WHERE category = 'Еда'")
+    for row in cursor.fetchall():
+        print(row["detail"])
+
+    store.close()
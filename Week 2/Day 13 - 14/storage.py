@@ -0,0 +1,403 @@
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from transaction import Transaction
+
+try:
+    import fcntl  # Linux / macOS
+except ImportError:
+    fcntl = None
+    import msvcrt  # Windows
+
+
+class CorruptedLedgerError(Exception):
+    """Файл с транзакциями повреждён - читать его дальше нельзя"""
+    def __init__(self, filename, reason):
+        self.filename = filename
+        self.reason = reason
+        super().__init__(f"Файл {filename} повреждён: {reason}")
+
+
+@contextmanager
+def file_lock(filename):
+    """
+    Рекомендательная (advisory) блокировка файла между процессами
+
+    КАК РАБОТАЕТ:
+    Рядом создаётся filename.lock, и на него берётся эксклюзивная блокировка.
+    Пока один процесс внутри with, другой ждёт на входе.
+    "Рекомендательная" - работает только между теми, кто тоже берёт блокировку.
+    """
+    with open(filename + ".lock", "a") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def atomic_write_json(filename, data):
+    """
+    Записать JSON так, чтобы файл был либо старым, либо новым - никогда не половинчатым
+
+    КАК РАБОТАЕТ:
+    1. Пишем во временный файл в той же папке
+    2. fsync - ждём пока данные реально окажутся на диске
+    3. os.replace - атомарно подменяем старый файл новым
+    4. fsync папки - чтобы на диске сохранилась и сама подмена (Linux/macOS)
+
+    Если программа упадёт на шагах 1-2, старый файл не тронут.
+    """
+    folder = os.path.dirname(os.path.abspath(filename))
+    fd, temp_name = tempfile.mkstemp(dir=folder, prefix=os.path.basename(filename) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_name, filename)
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+        raise
+
+    _fsync_folder(folder)
+
+
+def _fsync_folder(folder):
+    # На Windows папку так открыть нельзя - там достаточно os.replace
+    if os.name == "nt":
+        return
+    fd = os.open(folder, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class JsonFileStorage:
+    """
+    Хранилище: весь список транзакций в одном JSON файле
+
+    КАК РАБОТАЕТ:
+    Каждое изменение перезаписывает файл целиком.
+    Просто и наглядно, но на больших файлах медленно:
+    добавить одну транзакцию = записать все n транзакций.
+    Запись атомарная (atomic_write_json) и под блокировкой (file_lock).
+
+    ИНТЕРФЕЙС ХРАНИЛИЩА (его реализуют все классы в этом файле):
+    - load()                  -> список Transaction
+    - save_all(transactions)  -> записать всё состояние
+    - record_changes(transactions, added, removed_ids) -> записать изменения
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def load(self):
+        with file_lock(self.filename):
+            return self._load_snapshot()
+
+    def _load_snapshot(self):
+        # FileNotFoundError пробрасываем наверх - FinanceManager начнёт с пустого списка.
+        # Повреждённый файл - ошибка: молча начать с нуля значит
+        # затереть данные при следующем сохранении
+        with open(self.filename, "r", encoding="utf-8") as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError as e:
+                raise CorruptedLedgerError(self.filename, e) from e
+        return [Transaction.from_dict(t) for t in data]
+
+    def save_all(self, transactions):
+        with file_lock(self.filename):
+            self._write_snapshot(transactions)
+
+    def _write_snapshot(self, transactions):
+        atomic_write_json(self.filename, [t.to_dict() for t in transactions])
+
+    def record_changes(self, transactions, added=(), removed_ids=()):
+        # Для обычного JSON нет другого способа - пишем всё заново.
+        # Несколько процессов с одним файлом: выигрывает последний записавший,
+        # для совместной работы есть JournalStorage
+        self.save_all(transactions)
+
+
+class JournalStorage(JsonFileStorage):
+    """
+    Хранилище: снимок (snapshot) + журнал изменений (JSON Lines)
+
+    ФАЙЛЫ:
+    - filename          - снимок, обычный JSON список (тот же формат что у JsonFileStorage)
+    - filename.journal  - журнал, одна операция = одна строка:
+        {"op": "add", "transaction": {...}}
+        {"op": "remove", "id": 123}
+
+    КАК РАБОТАЕТ:
+    - Добавление/удаление дописывает строку в конец журнала - O(1) записи
+    - Удаление не стирает данные, а пишет "надгробие" (tombstone)
+    - Когда в журнале накопилось compact_every операций,
+      делаем компактификацию: пишем новый снимок и очищаем журнал
+    - При запуске: читаем снимок и "проигрываем" журнал поверх него
+
+    НЕСКОЛЬКО ПРОЦЕССОВ:
+    Дописывание и компактификация идут под file_lock, поэтому строки
+    разных процессов не перемешиваются. Компактификация собирает снимок
+    из файлов на диске (а не из памяти), так что чужие изменения не теряются.
+    save_all пишет снимок из памяти, но сначала переносит в него то, что
+    другие процессы дописали после нашего load() (см. save_all).
+    """
+
+    def __init__(self, filename, compact_every=1000):
+        super().__init__(filename)
+        self.journal_filename = filename + ".journal"
+        self.compact_every = compact_every
+        self.journal_size = 0  # Сколько операций в журнале с последнего снимка
+        self._seen_ids = set()  # ID, которые этот процесс прочитал или записал сам
+
+    def load(self):
+        with file_lock(self.filename):
+            transactions = self._load_unlocked()
+        self._seen_ids = {t.id for t in transactions}
+        return transactions
+
+    def _load_unlocked(self):
+        try:
+            transactions = self._load_snapshot()
+            snapshot_found = True
+        except FileNotFoundError:
+            transactions = []
+            snapshot_found = False
+
+        try:
+            operations = self._read_journal()
+        except FileNotFoundError:
+            if not snapshot_found:
+                # Нет ни снимка, ни журнала - первый запуск
+                raise
+            operations = []
+
+        # ID из снимка: если программа упала между записью снимка и очисткой
+        # журнала, те же "add" встретятся второй раз - их пропускаем
+        snapshot_ids = {t.id for t in transactions}
+
+        # ID -> позиции в списке по порядку. "remove" не ищет транзакцию
+        # перебором списка (O(n) на каждое надгробие), а берёт первую
+        # позицию из словаря и помечает её; удалённые убираем одним проходом
+        positions = {}
+        for i, t in enumerate(transactions):
+            positions.setdefault(t.id, []).append(i)
+        removed = set()
+
+        for operation in operations:
+            if operation["op"] == "add":
+                if operation["transaction"]["id"] in snapshot_ids:
+                    continue
+                transaction = Transaction.from_dict(operation["transaction"])
+                positions.setdefault(transaction.id, []).append(len(transactions))
+                transactions.append(transaction)
+            elif operation["op"] == "remove":
+                # Удаляем первую транзакцию с таким ID (как remove_transaction)
+                same_id = positions.get(operation["id"])
+                if same_id:
+                    removed.add(same_id.pop(0))
+
+        if removed:
+            transactions = [t for i, t in enumerate(transactions) if i not in removed]
+
+        self.journal_size = len(operations)
+        return transactions
+
+    def _read_journal(self):
+        operations = []
+        with open(self.journal_filename, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    operations.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Недописанная последняя строка (программа упала во время записи)
+                    # Всё что до неё - целое, поэтому просто останавливаемся
+                    break
+        return operations
+
+    def _write_snapshot(self, transactions):
+        # Снимок пишем ДО очистки журнала: если упадём между шагами,
+        # load() проиграет старый журнал повторно, а он идемпотентен
+        # (повторный add пропускается, повторный remove ничего не найдёт)
+        super()._write_snapshot(transactions)
+        with open(self.journal_filename, "w", encoding="utf-8") as f:
+            os.fsync(f.fileno())
+        self.journal_size = 0
+
+    def save_all(self, transactions):
+        """
+        Снимок из transactions + пустой журнал, без потери чужих изменений
+
+        Под блокировкой сначала читаем снимок и журнал с диска: другой
+        процесс мог дописать туда что-то после нашего load().
+        - ID на диске, которого мы не видели - чужое добавление, переносим
+        - ID, который мы видели, а на диске его уже нет - чужое удаление
+        Остальное берём из transactions: в памяти бывает то, чего нет
+        в журнале (например, исправленные повторяющиеся ID)
+        """
+        with file_lock(self.filename):
+            try:
+                on_disk = self._load_unlocked()
+            except FileNotFoundError:
+                on_disk = []
+
+            disk_ids = {t.id for t in on_disk}
+            merged = [t for t in transactions if t.id in disk_ids or t.id not in self._seen_ids]
+            memory_ids = {t.id for t in merged}
+            merged.extend(t for t in on_disk
+                          if t.id not in self._seen_ids and t.id not in memory_ids)
+
+            self._write_snapshot(merged)
+            # Чужие добавления в памяти этого процесса нет - в _seen_ids их
+            # не заносим, иначе следующий save_all посчитает их удалёнными
+            self._seen_ids |= memory_ids
+
+    def compact(self, transactions=None):
+        """
+        Компактификация: снимок + пустой журнал
+
+        Без аргументов снимок собирается из файлов на диске
+        (в них есть и изменения других процессов)
+        """
+        with file_lock(self.filename):
+            if transactions is None:
+                transactions = self._load_unlocked()
+            self._write_snapshot(transactions)
+
+    def record_changes(self, transactions, added=(), removed_ids=()):
+        lines = []
+        for t in added:
+            lines.append(json.dumps({"op": "add", "transaction": t.to_dict()}, ensure_ascii=False))
+        for transaction_id in removed_ids:
+            lines.append(json.dumps({"op": "remove", "id": transaction_id}))
+
+        if not lines:
+            return
+
+        with file_lock(self.filename):
+            # Режим "a" - дописываем в конец, старое содержимое не трогаем
+            with open(self.journal_filename, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        self._seen_ids.update(t.id for t in added)
+
+        self.journal_size += len(lines)
+        if self.journal_size >= self.compact_every:
+            self.compact()
+
+
+class BackgroundWriter:
+    """
+    Обёртка над любым хранилищем: записывает изменения в фоновом потоке
+
+    ЗАЧЕМ:
+    Пачка быстрых изменений (например 100 добавлений подряд) превращается
+    в ОДНУ запись на диск вместо ста.
+
+    КАК РАБОТАЕТ:
+    - record_changes только запоминает изменения и будит поток - мгновенно
+    - Поток ждёт flush_interval секунд (собирает всё что пришло за это время)
+      и отдаёт накопленное настоящему хранилищу одним вызовом
+    - flush() - записать всё накопленное сейчас (после него данные на диске)
+    - close() - записать остаток и остановить поток (вызывать при выходе)
+
+    Пока изменения не записаны, они есть только в памяти -
+    поэтому перед выходом из программы обязательно close().
+    """
+
+    def __init__(self, storage, flush_interval=0.5):
+        self.storage = storage
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()        # защищает очередь изменений
+        self._write_lock = threading.Lock()  # в хранилище пишет только один поток
+        self._wake_up = threading.Event()
+        self._stop = threading.Event()
+        self._added = []
+        self._removed_ids = []
+        self._transactions = ()
+        self.last_error = None
+
+        # daemon=True - поток не помешает программе завершиться
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def load(self):
+        return self.storage.load()
+
+    def save_all(self, transactions):
+        self.flush()
+        with self._write_lock:
+            self.storage.save_all(transactions)
+
+    def record_changes(self, transactions, added=(), removed_ids=()):
+        if self._stop.is_set():
+            raise RuntimeError("BackgroundWriter уже закрыт")
+        with self._lock:
+            self._transactions = transactions
+            self._added.extend(added)
+            self._removed_ids.extend(removed_ids)
+        self._wake_up.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake_up.wait()
+            # Ждём ещё немного - вдруг придут новые изменения.
+            # close() прерывает ожидание сразу
+            self._stop.wait(self.flush_interval)
+            self._write_pending()
+
+    def _write_pending(self):
+        with self._write_lock:
+            with self._lock:
+                self._wake_up.clear()
+                added, self._added = self._added, []
+                removed_ids, self._removed_ids = self._removed_ids, []
+                # list(dict.values()) выполняется целиком без переключения потоков,
+                # поэтому получаем целостную копию даже если менеджер её меняет
+                transactions = list(self._transactions)
+
+            if not added and not removed_ids:
+                return
+
+            try:
+                self.storage.record_changes(transactions, added=added, removed_ids=removed_ids)
+                self.last_error = None
+            except Exception as e:
+                # Вернём изменения в начало очереди - попробуем в следующий раз
+                with self._lock:
+                    self._added[:0] = added
+                    self._removed_ids[:0] = removed_ids
+                self.last_error = e
+                print(f"Ошибка фоновой записи: {e}")
+
+    def flush(self):
+        """Записать всё накопленное прямо сейчас (в текущем потоке)"""
+        self._write_pending()
+        if self.last_error:
+            raise self.last_error
+
+    def close(self):
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._wake_up.set()
+        self._thread.join()
+        self.flush()
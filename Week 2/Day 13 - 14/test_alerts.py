@@ -0,0 +1,166 @@
+import pytest
+import statistics
+from decimal import Decimal
+from alerts import RunningStats, load_budgets, save_budgets
+from finance_manager import FinanceManager
+
+
+def test_running_stats_matches_statistics():
+    values = [120, 80, 100, 95, 300, 110, 90]
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(statistics.mean(values))
+    assert stats.std == pytest.approx(statistics.stdev(values))
+
+
+def test_running_stats_remove():
+    """remove() возвращает состояние как будто значения не было"""
+    stats = RunningStats()
+    for value in [10, 20, 30, 1000]:
+        stats.add(value)
+
+    stats.remove(1000)
+
+    assert stats.count == 3
+    assert stats.mean == pytest.approx(20)
+    assert stats.std == pytest.approx(statistics.stdev([10, 20, 30]))
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = FinanceManager(str(tmp_path / "test.json"))
+    manager.alerts = []
+    manager.add_alert_hook(manager.alerts.append)
+    return manager
+
+
+def kinds(alerts):
+    return [alert["kind"] for alert in alerts]
+
+
+def test_spike_alert(manager):
+    for amount in [100, 110, 90, 105, 95, 100, 102, 98, 101, 99]:
+        manager.add_transaction(amount, "Еда")
+    assert manager.alerts == []
+
+    t = manager.add_transaction(1000, "Еда")
+
+    assert kinds(manager.alerts) == ["spike"]
+    assert manager.alerts[0]["transaction_id"] == t.id
+    assert "Еда" in manager.alerts[0]["message"]
+
+
+def test_no_spike_without_history(manager):
+    """Пока расходов мало (меньше min_history), всплески не ищем"""
+    manager.add_transaction(100, "Еда")
+    manager.add_transaction(100000, "Еда")
+
+    assert manager.alerts == []
+
+
+def test_income_never_alerts(manager):
+    manager.set_budget("Зарплата", 10)
+    manager.add_transaction(50000, "Зарплата", transaction_type="income")
+
+    assert manager.alerts == []
+
+
+def test_budget_alert(manager):
+    manager.set_budget("Еда", 1000)
+
+    manager.add_transaction(600, "Еда")
+    assert manager.alerts == []
+
+    manager.add_transaction(500, "Еда")
+    assert kinds(manager.alerts) == ["budget"]
+
+
+def test_budget_ignores_other_currencies(manager):
+    """Бюджет в рублях: расход в долларах его не тратит"""
+    manager.set_budget("Еда", 1000)
+
+    manager.add_transaction(900, "Еда", currency="USD")
+    manager.add_transaction(200, "Еда")
+
+    assert manager.alerts == []
+    assert manager.get_budget_usage(manager.get_report("month")[0]["period"])["Еда"]["spent"] == 200
+
+    manager.add_transaction(900, "Еда")
+    assert kinds(manager.alerts) == ["budget"]
+    assert "1100 из 1000 руб" in manager.alerts[0]["message"]
+
+
+def test_spike_stats_per_currency(manager):
+    """
+    Траты в рублях и долларах - разные ряды
+
+    500$ на фоне рублёвых трат около 10000 не выделялись бы,
+    а на фоне долларовых около 10 - всплеск
+    """
+    for amount in [100, 110, 90, 105, 95, 100, 102, 98, 101, 99]:
+        manager.add_transaction(amount * 100, "Еда")
+    for amount in [10, 11, 9, 10, 10, 10, 11, 9, 10, 10]:
+        manager.add_transaction(amount, "Еда", currency="USD")
+    manager.add_transaction(500, "Еда", currency="USD")
+
+    assert kinds(manager.alerts) == ["spike"]
+    assert manager.alerts[0]["message"].startswith("Необычно крупный расход в 'Еда': 500 $")
+
+
+def test_budget_usage_after_remove(manager):
+    manager.set_budget("Еда", 1000)
+    t = manager.add_transaction(600.5, "Еда")
+    month = t.date[:7]
+
+    assert manager.get_budget_usage(month)["Еда"] == {
+        "budget": Decimal("1000"), "spent": Decimal("600.50"), "left": Decimal("399.50")}
+
+    manager.remove_transaction(t.id)
+    assert manager.get_budget_usage(month)["Еда"]["spent"] == 0
+
+
+def test_bulk_add_alerts_after_save(manager):
+    """Пачка: предупреждения приходят один раз, после сохранения"""
+    manager.set_budget("Еда", 150)
+    manager.add_transactions([{"amount": 100, "category": "Еда"} for _ in range(3)])
+
+    assert kinds(manager.alerts) == ["budget", "budget"]
+
+
+def test_no_alerts_when_save_fails(manager, monkeypatch):
+    manager.set_budget("Еда", 10)
+
+    def broken(*args, **kwargs):
+        raise OSError("Диск переполнен")
+    monkeypatch.setattr(manager.storage, "record_changes", broken)
+
+    with pytest.raises(OSError):
+        manager.add_transaction(100, "Еда")
+    assert manager.alerts == []
+    assert manager.get_budget_usage("2000-01")["Еда"]["spent"] == 0
+
+
+def test_state_rebuilt_on_load(tmp_path):
+    path = str(tmp_path / "test.json")
+    manager = FinanceManager(path)
+    for amount in [100] * 10:
+        manager.add_transaction(amount, "Еда")
+
+    loaded = FinanceManager(path)
+    alerts = []
+    loaded.add_alert_hook(alerts.append)
+    loaded.add_transaction(5000, "Еда")
+
+    assert kinds(alerts) == ["spike"]
+
+
+def test_budgets_file(tmp_path):
+    path = str(tmp_path / "budgets.json")
+    assert load_budgets(path) == {}
+
+    save_budgets(path, {"Еда": Decimal("15000"), "Кафе": Decimal("2500.50")})
+
+    assert load_budgets(path) == {"Еда": 15000, "Кафе": 2500.5}
@@ -0,0 +1,42 @@
+import pytest
+from benchmark_suite import BENCHMARKS, make_ledger, run, compare, main, save_results
+
+
+def test_ledger_is_reproducible():
+    """Один seed - одни и те же данные, другой seed - другие"""
+    assert make_ledger(100) == make_ledger(100)
+    assert make_ledger(100, seed=1) != make_ledger(100, seed=2)
+
+
+def test_run_covers_all_benchmarks():
+    results = run(sizes=[50], repeat=1, progress=None)
+
+    assert set(results["results"]) == {f"{name}@50" for name in BENCHMARKS}
+    for result in results["results"].values():
+        assert result["ops_per_sec"] > 0
+
+
+def fake_results(**ops):
+    return {"meta": {}, "results": {name: {"ops_per_sec": value} for name, value in ops.items()}}
+
+
+def test_compare_flags_only_real_slowdowns():
+    baseline = fake_results(**{"save@1000": 1000, "stats@1000": 1000, "load@1000": 1000})
+    current = fake_results(**{"save@1000": 500, "stats@1000": 900})
+
+    regressions = compare(baseline, current, threshold=0.25)
+
+    # stats медленнее на 11% - в пределах порога, load нет в новых замерах
+    assert [(name, slowdown) for name, _, _, slowdown in regressions] == [("save@1000", 2.0)]
+
+
+def test_compare_command_exit_code(tmp_path):
+    baseline = str(tmp_path / "baseline.json")
+    slow = str(tmp_path / "slow.json")
+    same = str(tmp_path / "same.json")
+    save_results(baseline, fake_results(**{"save@1000": 1000}))
+    save_results(slow, fake_results(**{"save@1000": 100}))
+    save_results(same, fake_results(**{"save@1000": 990}))
+
+    assert main(["compare", baseline, slow]) == 1
+    assert main(["compare", baseline, same]) == 0
@@ -0,0 +1,134 @@
+import os
+import pytest
+from decimal import Decimal
+from binary_ledger import BinaryLedger, BinaryStorage
+from finance_manager import FinanceManager
+from storage import CorruptedLedgerError
+from transaction import Transaction
+
+
+def make_transactions():
+    first = Transaction(5000, "Зарплата", "Ноябрь", "income")
+    second = Transaction(0.1, "Еда", "Хлеб", "expense")
+    third = Transaction(200, "Еда", "", "expense", account="Карта USD", currency="USD")
+    return [first, second, third]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "ledger.bin")
+
+
+def test_create_and_read(path):
+    transactions = make_transactions()
+
+    with BinaryLedger.create(path, transactions) as ledger:
+        assert len(ledger) == 3
+        restored = list(ledger)
+
+    for original, copy in zip(transactions, restored):
+        assert copy.to_dict() == original.to_dict()
+
+
+def test_random_access_is_lazy(path):
+    """ledger[i] читает одну запись, отрицательные номера - с конца"""
+    BinaryLedger.create(path, make_transactions()).close()
+
+    with BinaryLedger(path) as ledger:
+        assert ledger[-1].amount == 200
+        assert ledger[1].amount == Decimal("0.10")
+        with pytest.raises(IndexError):
+            ledger[3]
+
+
+def test_totals_without_objects(path):
+    BinaryLedger.create(path, make_transactions()).close()
+
+    with BinaryLedger(path) as ledger:
+        assert ledger.totals() == {"RUB": {"income": 500000, "expense": 10},
+                                   "USD": {"income": 0, "expense": 20000}}
+
+
+def test_append_and_delete(path):
+    with BinaryLedger.create(path, make_transactions()) as ledger:
+        ledger.append([Transaction(50, "Еда", "Кофе")])
+        ledger.mark_deleted([0])
+
+        assert len(ledger) == 4
+        assert ledger[0] is None
+        assert [t.description for t in ledger] == ["Хлеб", "", "Кофе"]
+
+
+def test_categories_written_once(path):
+    """Категория в куче одна, сколько бы записей на неё ни ссылалось"""
+    transactions = [Transaction(100, "Еда") for _ in range(1000)]
+
+    with BinaryLedger.create(path, transactions) as ledger:
+        heap_name = BinaryLedger.heap_filename(path, ledger.generation)
+        heap_size = os.path.getsize(heap_name)
+
+    assert heap_size < 100
+
+    # Журнал открыт заново: строки уже в куче, append их не повторяет
+    with BinaryLedger(path) as ledger:
+        ledger.append([Transaction(100, "Еда")])
+    assert os.path.getsize(heap_name) == heap_size
+
+    # Добавление по одной через BinaryStorage (каждое - record_changes)
+    manager = FinanceManager(path, storage=BinaryStorage(path))
+    for _ in range(100):
+        manager.add_transaction(100, "Еда")
+    manager.close()
+    assert os.path.getsize(heap_name) == heap_size
+
+    # Новый процесс, новая категория - в кучу только она
+    manager = FinanceManager(path, storage=BinaryStorage(path))
+    manager.add_transaction(100, "Еда")
+    manager.add_transaction(100, "Кафе")
+    manager.close()
+    assert os.path.getsize(heap_name) == heap_size + BinaryLedger.STRING_LENGTH.size + len("Кафе".encode("utf-8"))
+
+
+def test_truncated_record_is_ignored(path):
+    """Программа упала во время записи: половинка записи не читается и затирается"""
+    BinaryLedger.create(path, make_transactions()).close()
+    with open(path, "ab") as f:
+        f.write(b"\x01" * 20)
+
+    with BinaryLedger(path) as ledger:
+        assert len(ledger) == 3
+        ledger.append([Transaction(50, "Еда", "Кофе")])
+        assert [t.description for t in ledger][-1] == "Кофе"
+
+
+def test_rewrite_removes_old_heap(path, tmp_path):
+    BinaryLedger.create(path, make_transactions()).close()
+    BinaryLedger.create(path, make_transactions()[:1]).close()
+
+    heaps = [name for name in os.listdir(tmp_path) if ".heap-" in name]
+    assert len(heaps) == 1
+
+
+def test_bad_file(path):
+    with open(path, "wb") as f:
+        f.write(b"not a ledger at all, definitely")
+
+    with pytest.raises(CorruptedLedgerError):
+        BinaryLedger(path)
+
+
+def test_storage_with_finance_manager(path):
+    manager = FinanceManager(path, storage=BinaryStorage(path))
+    manager.add_transaction(5000, "Зарплата", "Ноябрь", "income")
+    t = manager.add_transaction(300, "Еда", "Кафе")
+    manager.add_transactions([{"amount": 100, "category": "Еда"}])
+    manager.remove_transaction(t.id)
+
+    loaded = FinanceManager(path, storage=BinaryStorage(path))
+
+    assert [t.to_dict() for t in loaded.transactions] == [t.to_dict() for t in manager.transactions]
+    assert loaded.get_balance() == 4900
+
+    loaded.save_to_file()
+    with BinaryLedger(path) as ledger:
+        assert len(ledger) == 2  # Удалённая запись выброшена при перезаписи
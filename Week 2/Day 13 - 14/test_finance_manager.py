@@ -1,8 +1,10 @@
 import pytest
 import os
 import json
+from decimal import Decimal
 from finance_manager import FinanceManager
-from transaction import Transaction
+from transaction import Transaction, BulkValidationError
+from money import sum_minor, from_minor
 
 
 @pytest.fixture
@@ -283,3 +285,364 @@ def test_various_balances(empty_manager, amount, category, transaction_type, exp
     if amount > 0:  # Пропускаем нулевые
         empty_manager.add_transaction(amount, category, transaction_type=transaction_type)
         assert empty_manager.get_balance() == expected_balance
+
+
+def test_aggregates_after_add_and_remove(manager_with_data):
+    """
+    Накопленные суммы обновляются при добавлении и удалении
+
+    ПРОВЕРЯЕМ:
+    После каждой операции check_aggregates() совпадает с пересчётом с нуля
+    """
+    t = manager_with_data.add_transaction(300, "Еда", "Кафе", "expense")
+    assert manager_with_data.check_aggregates()
+    assert manager_with_data.get_statistics()["categories"]["Еда"] == 800
+    assert manager_with_data.get_category_counts()["Еда"] == 2
+
+    manager_with_data.remove_transaction(t.id)
+    assert manager_with_data.check_aggregates()
+    assert manager_with_data.get_total_expenses() == 700
+
+
+def test_category_disappears_when_empty(manager_with_data):
+    """Когда удалена последняя транзакция категории - категории нет в статистике"""
+    income_id = manager_with_data.get_transactions_by_type("income")[0].id
+
+    manager_with_data.remove_transaction(income_id)
+
+    assert "Зарплата" not in manager_with_data.get_statistics()["categories"]
+    assert manager_with_data.check_aggregates()
+
+
+def test_aggregates_after_load(tmp_path):
+    """Суммы восстанавливаются после загрузки из файла"""
+    test_file = str(tmp_path / "test.json")
+    manager1 = FinanceManager(test_file)
+    manager1.add_transaction(100, "Еда", transaction_type="expense")
+    manager1.add_transaction(5000, "Зарплата", transaction_type="income")
+
+    manager2 = FinanceManager(test_file)
+
+    assert manager2.get_balance() == 4900
+    assert manager2.check_aggregates()
+
+
+def test_check_aggregates_detects_mismatch(manager_with_data):
+    """Если суммы испортились - проверка это замечает"""
+    manager_with_data._totals["RUB"]["income"] += 1
+
+    assert manager_with_data.check_aggregates() == False
+
+
+def test_ids_unique_in_manager(manager_with_data):
+    """Транзакции добавленные в одну миллисекунду всё равно получают разные ID"""
+    ids = [t.id for t in manager_with_data.transactions]
+
+    assert len(set(ids)) == len(ids)
+
+
+def test_get_transaction_by_id(manager_with_data):
+    t = manager_with_data.transactions[1]
+
+    assert manager_with_data.get_transaction(t.id) is t
+    assert manager_with_data.get_transaction(999999999) is None
+
+
+def test_remove_keeps_order(manager_with_data):
+    """После удаления из середины порядок остальных не меняется"""
+    first, middle, last = manager_with_data.transactions
+
+    manager_with_data.remove_transaction(middle.id)
+
+    assert manager_with_data.transactions == [first, last]
+
+
+def test_remove_transactions_batch(manager_with_data):
+    """
+    Пакетное удаление
+
+    ПРОВЕРЯЕМ:
+    - возвращается количество реально удалённых
+    - несуществующие ID пропускаются
+    - суммы пересчитаны
+    """
+    ids = [t.id for t in manager_with_data.get_transactions_by_type("expense")]
+
+    removed = manager_with_data.remove_transactions(ids + [999999999])
+
+    assert removed == 2
+    assert len(manager_with_data) == 1
+    assert manager_with_data.get_total_expenses() == 0
+    assert manager_with_data.check_aggregates()
+
+
+def test_remove_transactions_saves_once(manager_with_data, monkeypatch):
+    """Пакетное удаление сохраняет в хранилище один раз"""
+    calls = []
+    monkeypatch.setattr(manager_with_data.storage, "record_changes",
+                        lambda transactions, added=(), removed_ids=(): calls.append(list(removed_ids)))
+
+    ids = [t.id for t in manager_with_data.transactions]
+    manager_with_data.remove_transactions(ids)
+
+    assert calls == [ids]
+
+
+def test_add_transactions_bulk(empty_manager):
+    """Пакетное добавление: все строки добавлены, суммы посчитаны"""
+    rows = [
+        {"amount": 5000, "category": "Зарплата", "transaction_type": "income"},
+        {"amount": 500, "category": "Еда", "description": "Продукты"},
+        {"amount": 200, "category": "Транспорт", "date": "2025-11-16 10:00:00"},
+    ]
+
+    added = empty_manager.add_transactions(rows)
+
+    assert len(added) == 3
+    assert len(empty_manager) == 3
+    assert empty_manager.get_balance() == 4300
+    assert added[1].transaction_type == "expense"  # тип по умолчанию
+    assert added[2].date == "2025-11-16 10:00:00"
+    assert empty_manager.check_aggregates()
+
+
+def test_add_transactions_reports_all_errors(empty_manager):
+    """
+    Плохие строки: сообщаем обо всех сразу и ничего не добавляем
+
+    ПРОВЕРЯЕМ:
+    errors содержит номера всех плохих строк
+    """
+    rows = [
+        {"amount": 100, "category": "Еда"},
+        {"amount": -5, "category": "Еда"},
+        {"amount": 100, "category": "Еда", "transaction_type": "wrong"},
+        {"category": "Еда"},
+        {"amount": 100, "category": "Еда", "date": "вчера"},
+    ]
+
+    with pytest.raises(BulkValidationError) as error:
+        empty_manager.add_transactions(rows)
+
+    assert [index for index, _ in error.value.errors] == [1, 2, 3, 4]
+    assert len(empty_manager) == 0
+
+
+def test_add_transactions_saves_once(empty_manager, monkeypatch):
+    calls = []
+    monkeypatch.setattr(empty_manager.storage, "record_changes",
+                        lambda transactions, added=(), removed_ids=(): calls.append(len(added)))
+
+    empty_manager.add_transactions({"amount": i + 1, "category": "Еда"} for i in range(50))
+
+    assert calls == [50]
+
+
+def test_add_transactions_rolls_back_on_save_error(manager_with_data, monkeypatch):
+    """Если сохранение упало - в памяти не остаётся ни одной новой строки"""
+    def broken_save(transactions, added=(), removed_ids=()):
+        raise OSError("диск заполнен")
+
+    monkeypatch.setattr(manager_with_data.storage, "record_changes", broken_save)
+
+    with pytest.raises(OSError):
+        manager_with_data.add_transactions([{"amount": 100, "category": "Еда"}] * 10)
+
+    assert len(manager_with_data) == 3
+    assert manager_with_data.get_balance() == 4300
+    assert manager_with_data.check_aggregates()
+
+
+def test_add_transactions_persisted(tmp_path):
+    test_file = str(tmp_path / "test.json")
+    FinanceManager(test_file).add_transactions([{"amount": 100, "category": "Еда"}] * 3)
+
+    assert len(FinanceManager(test_file)) == 3
+
+
+def test_float_amounts_do_not_drift(tmp_path):
+    """
+    Суммы хранятся копейками: 1000 расходов по 0.1 - ровно 100 руб
+
+    Раньше баланс был -99.9999999999986, и :.2f это скрывал
+    """
+    manager = FinanceManager(str(tmp_path / "test.json"))
+    manager.add_transactions([{"amount": 0.1, "category": "Еда"} for _ in range(1000)])
+
+    assert manager.get_total_expenses() == Decimal("100")
+    assert manager.get_balance() == Decimal("-100")
+    assert manager.get_statistics()["categories"] == {"Еда": Decimal("100")}
+    assert manager.check_aggregates()
+
+
+def test_amounts_survive_save_and_load(tmp_path):
+    path = str(tmp_path / "test.json")
+    manager = FinanceManager(path)
+    manager.add_transaction(0.1, "Еда")
+    manager.add_transaction(Decimal("19.99"), "Еда")
+
+    loaded = FinanceManager(path)
+
+    assert [t.amount for t in loaded.transactions] == [Decimal("0.10"), Decimal("19.99")]
+    assert loaded.get_total_expenses() == Decimal("20.09")
+
+
+def test_amounts_minor(manager_with_data):
+    assert sum_minor(manager_with_data.amounts_minor()) == 5000 * 100 + sum(
+        t.amount_minor for t in manager_with_data.get_transactions_by_type("expense"))
+    assert list(manager_with_data.amounts_minor("income")) == [500000]
+
+
+def test_amounts_minor_per_currency(tmp_path):
+    """amounts_minor не смешивает валюты - суммы как у get_total_income"""
+    manager = FinanceManager(str(tmp_path / "test.json"))
+    manager.add_transaction(100, "Зарплата", "", "income")
+    manager.add_transaction(100, "Зарплата", "", "income", account="Карта USD", currency="USD")
+    manager.add_transaction(30, "Еда", "", "expense", account="Карта USD", currency="USD")
+
+    for currency in ("RUB", "USD", "EUR"):
+        assert from_minor(sum_minor(manager.amounts_minor("income", currency))) == \
+            manager.get_total_income(currency)
+        assert from_minor(sum_minor(manager.amounts_minor("expense", currency))) == \
+            manager.get_total_expenses(currency)
+    assert from_minor(sum_minor(manager.amounts_minor("income"))) == 100
+    assert list(manager.amounts_minor(currency="USD")) == [10000, 3000]
+
+
+@pytest.fixture
+def manager_for_search(tmp_path):
+    manager = FinanceManager(str(tmp_path / "test.json"))
+    manager.add_transactions([
+        {"amount": 100, "category": "Еда", "description": "Купил хлеб", "date": "2025-11-01 10:00:00"},
+        {"amount": 200, "category": "Еда", "description": "Хлебцы и молоко", "date": "2025-11-05 10:00:00"},
+        {"amount": 300, "category": "Транспорт", "description": "Метро", "date": "2025-11-10 10:00:00"},
+        {"amount": 400, "category": "Еда", "description": "хлеб, сыр", "date": "2025-11-20 10:00:00"},
+    ])
+    return manager
+
+
+def descriptions(transactions):
+    return [t.description for t in transactions]
+
+
+def test_search_prefix_and_case(manager_for_search):
+    assert descriptions(manager_for_search.search("ХЛЕБ")) == \
+        ["Купил хлеб", "Хлебцы и молоко", "хлеб, сыр"]
+    assert descriptions(manager_for_search.search("хлеб", prefix=False)) == ["Купил хлеб", "хлеб, сыр"]
+    assert descriptions(manager_for_search.search("хлеб молоко")) == ["Хлебцы и молоко"]
+
+
+def test_search_filters(manager_for_search):
+    assert descriptions(manager_for_search.search("хлеб", start="2025-11-02", end="2025-11-30")) == \
+        ["Хлебцы и молоко", "хлеб, сыр"]
+    assert descriptions(manager_for_search.search("метро", category="Еда")) == []
+    assert descriptions(manager_for_search.search("", category="Транспорт")) == ["Метро"]
+    assert len(manager_for_search.search("хлеб", limit=2)) == 2
+
+
+def test_search_index_updates_on_add_and_remove(manager_for_search):
+    t = manager_for_search.add_transaction(50, "Еда", "Свежий багет")
+    assert manager_for_search.search("баг") == [t]
+
+    manager_for_search.remove_transaction(t.id)
+    assert manager_for_search.search("баг") == []
+    assert manager_for_search.check_aggregates()
+
+
+def test_search_scans_date_index_for_frequent_words(manager_for_search, monkeypatch):
+    """
+    Частое слово + limit: поиск идёт по индексу дат, а не сортирует все найденные
+
+    Результат должен быть тем же самым
+    """
+    expected = manager_for_search.search("хлеб", limit=2)
+    monkeypatch.setattr(FinanceManager, "SEARCH_SCAN_THRESHOLD", 0)
+
+    assert manager_for_search.search("хлеб", limit=2) == expected
+    assert manager_for_search.search("хлеб сыр", limit=5) == manager_for_search.search("хлеб сыр")
+
+
+@pytest.fixture
+def manager_with_accounts(empty_manager):
+    """Фикстура: рублёвый счёт и долларовая карта"""
+    empty_manager.add_transaction(50000, "Зарплата", "Ноябрь", "income")
+    empty_manager.add_transaction(3500, "Еда", "Продукты")
+    empty_manager.add_transaction(200, "Фриланс", "Заказ", "income", account="Карта USD", currency="USD")
+    empty_manager.add_transaction(79.50, "Развлечения", "Подписка", account="Карта USD", currency="USD")
+    return empty_manager
+
+
+def test_account_partitions(manager_with_accounts):
+    assert manager_with_accounts.get_accounts() == ["Основной", "Карта USD"]
+    assert [t.description for t in manager_with_accounts.get_transactions_by_account("Карта USD")] == \
+        ["Заказ", "Подписка"]
+    assert manager_with_accounts.get_transactions_by_account("Нет такого") == []
+
+
+def test_account_balances(manager_with_accounts):
+    assert manager_with_accounts.get_account_balances() == {
+        "Основной": {"RUB": Decimal("46500")},
+        "Карта USD": {"USD": Decimal("120.50")},
+    }
+
+
+def test_consolidated_balance(manager_with_accounts):
+    from fx import RateTable, MissingRateError
+    rates = RateTable()
+    rates.add_rate("USD", "2025-11-01", "80")
+
+    assert manager_with_accounts.get_consolidated_balance(rates, day="2025-11-16") == Decimal("56140")
+    assert manager_with_accounts.get_consolidated_balance(rates, "USD", "2025-11-16") == Decimal("701.75")
+    assert manager_with_accounts.get_consolidated_balance(rates, day="2025-11-16",
+                                                          accounts=["Карта USD"]) == Decimal("9640")
+    with pytest.raises(MissingRateError):
+        manager_with_accounts.get_consolidated_balance(rates, day="2025-10-01")
+
+
+def test_totals_kept_per_currency(manager_with_accounts):
+    """
+    Доллары и рубли не складываются
+
+    ПРОВЕРЯЕМ:
+    Суммы, баланс и категории - отдельно по валютам
+    """
+    manager_with_accounts.add_transaction(900, "Еда", "Ресторан", account="Карта USD", currency="USD")
+
+    assert manager_with_accounts.get_currencies() == ["RUB", "USD"]
+    assert manager_with_accounts.get_total_expenses() == 3500
+    assert manager_with_accounts.get_total_expenses("USD") == Decimal("979.50")
+    assert manager_with_accounts.get_balance("USD") == Decimal("-779.50")
+
+    stats = manager_with_accounts.get_statistics("USD")
+    assert stats["total_transactions"] == 5
+    assert stats["currency"] == "USD"
+    assert stats["categories"] == {"Фриланс": 200, "Развлечения": Decimal("79.50"), "Еда": 900}
+    assert manager_with_accounts.get_statistics()["categories"] == {"Зарплата": 50000, "Еда": 3500}
+    assert manager_with_accounts.get_category_counts()["Еда"] == 2
+    assert manager_with_accounts.check_aggregates()
+
+
+def test_currency_disappears_with_last_transaction(manager_with_accounts):
+    for t in manager_with_accounts.get_transactions_by_account("Карта USD"):
+        manager_with_accounts.remove_transaction(t.id)
+
+    assert manager_with_accounts.get_currencies() == ["RUB"]
+    assert manager_with_accounts.get_balance("USD") == 0
+    assert manager_with_accounts.check_aggregates()
+
+
+def test_account_partitions_follow_remove(manager_with_accounts):
+    for t in manager_with_accounts.get_transactions_by_account("Карта USD"):
+        manager_with_accounts.remove_transaction(t.id)
+
+    assert manager_with_accounts.get_accounts() == ["Основной"]
+    assert "Карта USD" not in manager_with_accounts.get_account_balances()
+    assert manager_with_accounts.check_aggregates()
+
+
+def test_accounts_survive_save_and_load(manager_with_accounts):
+    reloaded = FinanceManager(manager_with_accounts.filename)
+
+    assert reloaded.get_account_balances() == manager_with_accounts.get_account_balances()
+    assert reloaded.get_statistics("USD") == manager_with_accounts.get_statistics("USD")
+    assert reloaded.check_aggregates()
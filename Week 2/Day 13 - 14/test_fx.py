@@ -0,0 +1,81 @@
+import pytest
+from decimal import Decimal
+from datetime import date
+from fx import RateTable, MissingRateError
+
+
+@pytest.fixture
+def rates():
+    """Фикстура: курсы USD на два дня и EUR на один"""
+    table = RateTable()
+    table.add_rate("USD", "2025-11-01", "80")
+    table.add_rate("USD", "2025-11-15", "90")
+    table.add_rate("EUR", "2025-11-01", "100")
+    return table
+
+
+def test_rate_uses_last_known_day(rates):
+    assert rates.rate("USD", "2025-11-01") == Decimal("80")
+    assert rates.rate("USD", "2025-11-10") == Decimal("80")
+    assert rates.rate("USD", "2025-11-15") == Decimal("90")
+    assert rates.rate("USD", date(2025, 12, 31)) == Decimal("90")
+
+
+def test_base_currency_rate_is_one(rates):
+    assert rates.rate("RUB", "1999-01-01") == 1
+
+
+def test_missing_rate(rates):
+    """Раньше первого курса и для неизвестной валюты курса нет"""
+    with pytest.raises(MissingRateError):
+        rates.rate("USD", "2025-10-31")
+    with pytest.raises(MissingRateError):
+        rates.rate("GBP", "2025-11-15")
+
+
+def test_repeated_lookups_hit_cache(rates):
+    for _ in range(100):
+        rates.rate("USD", "2025-11-20")
+
+    info = rates.cache_info()
+    assert info.misses == 1
+    assert info.hits == 99
+
+
+def test_add_rate_clears_cache(rates):
+    """Новый курс меняет ответ, запомненный в кэше"""
+    assert rates.rate("USD", "2025-11-20") == Decimal("90")
+
+    rates.add_rate("USD", "2025-11-20", "95")
+
+    assert rates.rate("USD", "2025-11-20") == Decimal("95")
+
+
+def test_convert_minor(rates):
+    assert rates.convert_minor(1000, "USD", "RUB", "2025-11-01") == 80000
+    assert rates.convert_minor(80000, "RUB", "USD", "2025-11-01") == 1000
+    # Через рубли: 1 EUR = 100 руб = 1.25 USD
+    assert rates.convert_minor(100, "EUR", "USD", "2025-11-01") == 125
+    assert rates.convert_minor(12345, "USD", "USD") == 12345
+
+
+def test_convert_minor_rounds_half_up(rates):
+    # 1 коп. USD = 0.8 коп. -> 1 коп.; 0.5 коп. округляется вверх
+    assert rates.convert_minor(1, "USD", "RUB", "2025-11-01") == 80
+    assert rates.convert_minor(1, "RUB", "EUR", "2025-11-01") == 0
+    assert rates.convert_minor(50, "RUB", "EUR", "2025-11-01") == 1
+
+
+def test_load_csv(tmp_path):
+    path = tmp_path / "rates.csv"
+    path.write_text("date,currency,rate\n2025-11-01,USD,81.25\n2025-11-01,EUR, 93.80\n", encoding="utf-8")
+
+    table = RateTable.load(str(path))
+
+    assert table.rate("USD", "2025-11-02") == Decimal("81.25")
+    assert table.rate("EUR", "2025-11-02") == Decimal("93.80")
+
+
+def test_load_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        RateTable.load(str(tmp_path / "nope.csv"))
@@ -0,0 +1,111 @@
+import threading
+import time
+from id_generator import IdGenerator
+from transaction import Transaction
+
+
+def test_million_transactions_no_duplicates():
+    """
+    Миллион транзакций в плотном цикле - ни одного повтора ID
+
+    ЗАЧЕМ:
+    Раньше ID = миллисекунды, и транзакции из одной миллисекунды совпадали
+    """
+    ids = set()
+    count = 1_000_000
+
+    for _ in range(count):
+        ids.add(Transaction(100, "Еда").id)
+
+    assert len(ids) == count
+
+
+def test_ids_are_monotonic():
+    generator = IdGenerator()
+    ids = [generator.next_id() for _ in range(10000)]
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_unique_across_threads():
+    """
+    Несколько потоков берут ID одновременно
+
+    ПРОВЕРЯЕМ:
+    Lock внутри генератора не даёт двум потокам получить один ID
+    """
+    generator = IdGenerator()
+    results = []
+
+    def worker():
+        ids = [generator.next_id() for _ in range(20000)]
+        results.append(ids)  # list.append потокобезопасен
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    all_ids = [i for ids in results for i in ids]
+    assert len(all_ids) == 8 * 20000
+    assert len(set(all_ids)) == len(all_ids)
+
+
+def test_clock_going_backwards(monkeypatch):
+    """Если системные часы перевели назад, ID всё равно растут"""
+    generator = IdGenerator()
+    first = generator.next_id()
+
+    monkeypatch.setattr(time, "time", lambda: 0.0)
+    second = generator.next_id()
+
+    assert second == first + 1
+
+
+def test_observe_existing_id():
+    """После observe() новые ID больше уже существующего"""
+    generator = IdGenerator()
+    far_future = generator.next_id() * 2
+
+    generator.observe(far_future)
+
+    assert generator.next_id() > far_future
+
+
+def test_new_ids_larger_than_legacy_ids():
+    """Старые ID (миллисекунды) меньше новых - пересечений нет"""
+    legacy_id = int(time.time() * 1000)
+
+    assert Transaction(100, "Еда").id > legacy_id
+
+
+def test_different_nodes_never_collide(monkeypatch):
+    """
+    Два процесса (разные node_id) в одну и ту же миллисекунду
+
+    ПРОВЕРЯЕМ:
+    ID не совпадают даже когда номер внутри миллисекунды переполнен
+    """
+    monkeypatch.setattr(time, "time", lambda: 1763830873.247)
+    first = IdGenerator(node_id=1)
+    second = IdGenerator(node_id=2)
+
+    ids_first = {first.next_id() for _ in range(10000)}
+    ids_second = {second.next_id() for _ in range(10000)}
+
+    assert len(ids_first) == len(ids_second) == 10000
+    assert not ids_first & ids_second
+
+
+def test_observe_foreign_id_keeps_node(monkeypatch):
+    """После observe() чужого ID наши ID всё равно несут наш node_id"""
+    generator = IdGenerator(node_id=5)
+    other = IdGenerator(node_id=7)
+    generator.observe(other.next_id() + 1000)
+
+    new_id = generator.next_id()
+
+    node_mask = (1 << IdGenerator.NODE_BITS) - 1
+    assert (new_id >> IdGenerator.SEQUENCE_BITS) & node_mask == 5
@@ -0,0 +1,154 @@
+import csv
+import gzip
+import pytest
+from finance_manager import FinanceManager
+from transaction import BulkValidationError
+from import_export import read_csv, parse_amount
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = FinanceManager(str(tmp_path / "test.json"))
+    manager.add_transaction(5000, "Зарплата", "Ноябрь", "income")
+    manager.add_transaction(500, "Еда", 'Хлеб, молоко и "сыр"', "expense")
+    manager.add_transaction(200.5, "Транспорт", "Метро", "expense")
+    return manager
+
+
+@pytest.fixture
+def empty(tmp_path):
+    return FinanceManager(str(tmp_path / "other.json"))
+
+
+def test_csv_quotes_commas(manager, tmp_path):
+    """
+    Описание с запятой и кавычками не ломает CSV
+
+    ПРОВЕРЯЕМ:
+    csv.reader читает ровно 8 столбцов и исходное описание
+    """
+    path = str(tmp_path / "export.csv")
+    manager.export_csv(path)
+
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+
+    assert rows[0] == ["ID", "Дата", "Тип", "Сумма", "Категория", "Описание", "Счёт", "Валюта"]
+    assert all(len(row) == 8 for row in rows)
+    assert rows[2][5] == 'Хлеб, молоко и "сыр"'
+
+
+def test_export_to_csv_still_returns_bool(manager, tmp_path):
+    assert manager.export_to_csv(str(tmp_path / "export.csv")) == True
+
+
+@pytest.mark.parametrize("name, export, do_import", [
+    ("data.csv", "export_csv", "import_csv"),
+    ("data.csv.gz", "export_csv", "import_csv"),
+    ("data.jsonl", "export_jsonl", "import_jsonl"),
+    ("data.jsonl.gz", "export_jsonl", "import_jsonl"),
+])
+def test_roundtrip(manager, empty, tmp_path, name, export, do_import):
+    """Экспорт и импорт обратно дают те же суммы, категории и даты"""
+    path = str(tmp_path / name)
+
+    assert getattr(manager, export)(path) == 3
+    assert getattr(empty, do_import)(path) == 3
+
+    assert empty.get_statistics() == manager.get_statistics()
+    assert [t.date for t in empty.transactions] == [t.date for t in manager.transactions]
+    assert empty.transactions[1].description == 'Хлеб, молоко и "сыр"'
+
+
+def test_gzip_file_is_compressed(manager, tmp_path):
+    path = str(tmp_path / "data.csv.gz")
+    manager.export_csv(path)
+
+    # Файл открывается gzip - значит действительно сжат
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert f.readline().startswith("ID,")
+
+
+def test_import_in_batches(manager, empty, tmp_path):
+    """batch_size=2: три строки загружаются двумя пачками"""
+    path = str(tmp_path / "data.csv")
+    manager.export_csv(path)
+
+    calls = []
+    original = empty.add_transactions
+    empty.add_transactions = lambda rows: calls.append(len(rows)) or original(rows)
+
+    empty.import_csv(path, batch_size=2)
+
+    assert calls == [2, 1]
+
+
+def test_import_reports_row_numbers_from_file_start(empty, tmp_path):
+    """Ошибка во второй пачке: номер строки считается от начала файла"""
+    path = str(tmp_path / "bad.csv")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("Дата,Тип,Сумма,Категория,Описание\n")
+        f.write("2025-11-16 10:00:00,expense,100,Еда,\n")
+        f.write("2025-11-16 10:00:00,expense,100,Еда,\n")
+        f.write("2025-11-16 10:00:00,expense,abc,Еда,\n")
+
+    with pytest.raises(BulkValidationError) as error:
+        empty.import_csv(path, batch_size=2)
+
+    assert error.value.errors[0][0] == 2
+    # Первая пачка уже добавлена
+    assert len(empty) == 2
+
+
+def test_progress_callback(manager, tmp_path):
+    path = str(tmp_path / "data.csv")
+    manager.export_csv(path)
+
+    seen = []
+    list(read_csv(path, progress=seen.append, progress_every=2))
+
+    assert seen == [2, 3]
+
+
+def test_read_csv_is_lazy(manager, tmp_path):
+    """read_csv - генератор: ничего не читается пока не попросили"""
+    path = str(tmp_path / "data.csv")
+    manager.export_csv(path)
+
+    rows = read_csv(path)
+    first = next(rows)
+
+    assert first["category"] == "Зарплата"
+    assert first["amount"] == 5000
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("100", 100),
+    ("100.50", 100.5),
+    ("abc", "abc"),
+])
+def test_parse_amount(text, expected):
+    assert parse_amount(text) == expected
+
+
+def test_csv_keeps_account_and_currency(tmp_path, empty):
+    path = str(tmp_path / "accounts.csv")
+    source = FinanceManager(str(tmp_path / "source.json"))
+    source.add_transaction(12.5, "Кафе", "Кофе", account="Карта USD", currency="USD")
+    source.export_csv(path)
+
+    empty.import_csv(path)
+
+    t = empty.transactions[0]
+    assert (t.account, t.currency, t.amount) == ("Карта USD", "USD", 12.5)
+
+
+def test_csv_without_currency_uses_defaults(tmp_path, empty):
+    path = str(tmp_path / "old.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Дата,Тип,Сумма,Категория,Описание,Счёт,Валюта\n")
+        f.write("2025-11-16 10:00:00,expense,100,Еда,Хлеб,,\n")
+
+    empty.import_csv(path)
+
+    assert (empty.transactions[0].account, empty.transactions[0].currency) == ("Основной", "RUB")
@@ -0,0 +1,49 @@
+import pytest
+from decimal import Decimal
+from money import to_minor, from_minor, to_number, minor_array, sum_minor
+
+
+@pytest.mark.parametrize("value, expected", [
+    (100, 10000),
+    (100.5, 10050),
+    (0.1, 10),              # float 0.1 неточен, но копейки - ровно 10
+    (Decimal("99.99"), 9999),
+    ("12.34", 1234),
+    (0.005, 1),             # доли копейки округляются
+])
+def test_to_minor(value, expected):
+    assert to_minor(value) == expected
+
+
+@pytest.mark.parametrize("value", ["abc", float("nan"), float("inf"), None, True])
+def test_to_minor_rejects_non_numbers(value):
+    with pytest.raises(ValueError):
+        to_minor(value)
+
+
+def test_from_minor_and_to_number():
+    assert from_minor(10000) == Decimal("100")
+    assert from_minor(10050) == Decimal("100.50")
+    assert from_minor(-5) == Decimal("-0.05")
+
+    # В JSON - то же число что было раньше
+    assert to_number(10000) == 100 and isinstance(to_number(10000), int)
+    assert to_number(10050) == 100.5
+
+
+def test_sum_minor_is_exact():
+    """
+    Десять тысяч раз по 0.10 руб
+
+    float даёт 999.9999999999..., копейки - ровно 1000
+    """
+    assert sum([0.1] * 10000) != 1000
+
+    amounts = minor_array(to_minor(0.1) for _ in range(10000))
+
+    assert sum_minor(amounts) == 100000
+    assert from_minor(sum_minor(amounts)) == 1000
+
+
+def test_sum_minor_empty():
+    assert sum_minor(minor_array()) == 0
@@ -0,0 +1,106 @@
+import pytest
+from finance_manager import FinanceManager
+from pagination import TransactionPager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """
+    Фикстура: 25 транзакций, по одной в день с 1 по 25 ноября
+
+    Чётные дни - доходы, нечётные - расходы, сумма = номер дня * 100
+    """
+    manager = FinanceManager(str(tmp_path / "test.json"))
+    manager.add_transactions([
+        {
+            "amount": day * 100,
+            "category": "Еда" if day % 3 else "Транспорт",
+            "transaction_type": "income" if day % 2 == 0 else "expense",
+            "date": f"2025-11-{day:02d} 12:00:00",
+        }
+        for day in range(1, 26)
+    ])
+    return manager
+
+
+def days(page):
+    # Номера дней на странице - удобно сравнивать
+    return [int(t.date[8:10]) for t in page]
+
+
+def test_iter_transactions_is_lazy(manager):
+    """iter_transactions - генератор: next() даёт первую по дате"""
+    first = next(manager.iter_transactions())
+
+    assert first.date == "2025-11-01 12:00:00"
+
+
+def test_iter_transactions_filters(manager):
+    result = list(manager.iter_transactions(transaction_type="expense", min_amount=500, max_amount=1100))
+
+    assert days(result) == [5, 7, 9, 11]
+
+
+def test_iter_transactions_reverse_with_cursor(manager):
+    cursor_t = list(manager.iter_transactions())[10]  # 11 ноября
+    before = list(manager.iter_transactions(cursor=(cursor_t.timestamp, cursor_t.id), reverse=True))
+
+    assert days(before) == list(range(10, 0, -1))
+
+
+def test_pages_forward_and_back(manager):
+    pager = TransactionPager(manager, page_size=10)
+
+    assert days(pager.first_page()) == list(range(1, 11))
+    assert pager.has_next and not pager.has_prev
+
+    assert days(pager.next_page()) == list(range(11, 21))
+    assert days(pager.next_page()) == list(range(21, 26))
+    assert not pager.has_next
+
+    # Дальше некуда - остаёмся на последней странице
+    assert days(pager.next_page()) == list(range(21, 26))
+
+    assert days(pager.prev_page()) == list(range(11, 21))
+    assert days(pager.prev_page()) == list(range(1, 11))
+    assert not pager.has_prev
+
+
+def test_pager_with_filters(manager):
+    pager = TransactionPager(manager, page_size=3, category="Транспорт")
+
+    assert days(pager.first_page()) == [3, 6, 9]
+    assert days(pager.next_page()) == [12, 15, 18]
+
+
+def test_jump_to_date(manager):
+    pager = TransactionPager(manager, page_size=5)
+
+    page = pager.jump_to_date("2025-11-14")
+
+    assert days(page) == [14, 15, 16, 17, 18]
+    assert pager.has_prev and pager.has_next
+    assert days(pager.prev_page()) == [9, 10, 11, 12, 13]
+
+
+def test_jump_after_last_date_shows_last_page(manager):
+    pager = TransactionPager(manager, page_size=5)
+
+    assert days(pager.jump_to_date("2026-01-01")) == [21, 22, 23, 24, 25]
+
+
+def test_pager_sees_new_transactions(manager):
+    """Курсор - ключ, а не номер позиции: добавление не сбивает страницы"""
+    pager = TransactionPager(manager, page_size=5)
+    pager.first_page()
+
+    manager.add_transactions([{"amount": 1, "category": "Еда", "date": "2025-10-01 12:00:00"}])
+
+    assert days(pager.next_page()) == [6, 7, 8, 9, 10]
+
+
+def test_empty_manager(tmp_path):
+    pager = TransactionPager(FinanceManager(str(tmp_path / "empty.json")))
+
+    assert pager.first_page() == []
+    assert pager.next_page() == []
@@ -0,0 +1,111 @@
+import pytest
+from datetime import date
+from finance_manager import FinanceManager
+from reports import bucket_key
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """
+    Фикстура: транзакции за несколько дней и месяцев
+
+    add_transactions с полем date - чтобы задать даты в прошлом
+    """
+    manager = FinanceManager(str(tmp_path / "test.json"))
+    manager.add_transactions([
+        {"amount": 50000, "category": "Зарплата", "transaction_type": "income", "date": "2025-10-01 09:00:00"},
+        {"amount": 500, "category": "Еда", "date": "2025-10-15 12:00:00"},
+        {"amount": 300, "category": "Еда", "date": "2025-10-15 18:00:00"},
+        {"amount": 1000, "category": "Транспорт", "date": "2025-11-03 08:00:00"},
+        {"amount": 60000, "category": "Зарплата", "transaction_type": "income", "date": "2025-11-05 09:00:00"},
+        {"amount": 200, "category": "Еда", "date": "2026-01-02 10:00:00"},
+    ])
+    return manager
+
+
+def test_monthly_report(manager):
+    report = manager.get_report("month")
+
+    assert [r["period"] for r in report] == ["2025-10", "2025-11", "2026-01"]
+    october = report[0]
+    assert october["income"] == 50000
+    assert october["expenses"] == 800
+    assert october["balance"] == 49200
+    assert october["count"] == 3
+    assert october["categories"] == {"Зарплата": 50000, "Еда": 800}
+
+
+def test_report_date_range(manager):
+    """Границы включительно: 15 октября - 3 ноября"""
+    report = manager.get_report("day", "2025-10-15", date(2025, 11, 3))
+
+    assert [r["period"] for r in report] == ["2025-10-15", "2025-11-03"]
+    assert report[0]["expenses"] == 800
+
+
+@pytest.mark.parametrize("period, expected", [
+    ("day", "2025-11-16"),
+    ("week", "2025-W46"),
+    ("month", "2025-11"),
+    ("year", "2025"),
+])
+def test_bucket_key(period, expected):
+    assert bucket_key(date(2025, 11, 16), period) == expected
+
+
+def test_unknown_period(manager):
+    with pytest.raises(ValueError):
+        manager.get_report("quarter")
+
+
+def test_report_updates_on_remove(manager):
+    """Удаление обновляет суммы по дням, пустой день исчезает из отчёта"""
+    january = manager.get_transactions_between("2026-01-01", "2026-01-31")
+    assert len(january) == 1
+
+    manager.remove_transaction(january[0].id)
+
+    assert [r["period"] for r in manager.get_report("year")] == ["2025"]
+    assert manager.check_aggregates()
+
+
+def test_report_equals_statistics(manager):
+    """Сумма отчёта за всё время = общая статистика"""
+    (year_2025, year_2026) = manager.get_report("year")
+    stats = manager.get_statistics()
+
+    assert year_2025["income"] + year_2026["income"] == stats["total_income"]
+    assert year_2025["expenses"] + year_2026["expenses"] == stats["total_expenses"]
+
+
+def test_report_per_currency(manager):
+    """Отчёт только по одной валюте, доллары в рублёвый отчёт не попадают"""
+    manager.add_transactions([
+        {"amount": 900, "category": "Еда", "currency": "USD", "date": "2025-10-20 12:00:00"},
+    ])
+
+    (october_usd,) = manager.get_report("month", currency="USD")
+    october_rub = manager.get_report("month")[0]
+
+    assert october_usd["expenses"] == 900
+    assert october_usd["count"] == 1
+    assert october_rub["expenses"] == 800
+    assert manager.get_report("month", currency="EUR") == []
+    assert manager.check_aggregates()
+
+
+def test_transactions_between_sorted_by_date(manager):
+    """Результат отсортирован по дате, а не по порядку добавления"""
+    manager.add_transactions([{"amount": 1, "category": "Еда", "date": "2025-10-10 10:00:00"}])
+
+    dates = [t.date for t in manager.get_transactions_between("2025-10-01", "2025-10-31")]
+
+    assert dates == sorted(dates)
+    assert len(dates) == 4
+
+
+def test_rollups_rebuilt_after_load(manager):
+    reloaded = FinanceManager(manager.filename)
+
+    assert reloaded.get_report("month") == manager.get_report("month")
+    assert reloaded.check_aggregates()
@@ -0,0 +1,58 @@
+import pytest
+from search_index import SearchIndex, tokenize
+from transaction import Transaction
+
+
+def make(description):
+    return Transaction(100, "Еда", description)
+
+
+def test_tokenize():
+    assert tokenize("Купил ХЛЕБ, молоко!") == ["купил", "хлеб", "молоко"]
+    assert tokenize("   ") == []
+
+
+def test_exact_and_prefix():
+    index = SearchIndex()
+    bread, crisps, metro = make("Купил хлеб"), make("Хлебцы"), make("Метро")
+    for t in (bread, crisps, metro):
+        index.add(t)
+
+    assert index.match("хлеб", prefix=False) == {bread.id}
+    assert index.match("ХЛЕ") == {bread.id, crisps.id}
+    assert index.match("такси") == set()
+    assert index.match("") is None
+
+
+def test_all_words_required():
+    index = SearchIndex()
+    both, only_milk = make("Хлеб и молоко"), make("Молоко")
+    index.add(both)
+    index.add(only_milk)
+
+    assert index.match("молоко хлеб") == {both.id}
+    assert index.match("мол") == {both.id, only_milk.id}
+
+
+def test_remove_forgets_words():
+    index = SearchIndex()
+    t = make("Хлеб")
+    index.add(t)
+    index.match("х")  # Список слов отсортирован
+
+    index.remove(t)
+
+    assert index.postings == {}
+    assert index.words == []
+    assert index.match("хлеб") == set()
+
+
+def test_match_does_not_modify_index():
+    """match отдаёт новое множество - изменения результата не портят индекс"""
+    index = SearchIndex()
+    t = make("Хлеб")
+    index.add(t)
+
+    index.match("хлеб").add(12345)
+
+    assert index.postings["хлеб"] == {t.id}
@@ -0,0 +1,189 @@
+import pytest
+import sqlite3
+from decimal import Decimal
+from sqlite_store import SQLiteFinanceStore
+from transaction import Transaction
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Фикстура: SQLite хранилище во временной папке с тремя транзакциями"""
+    store = SQLiteFinanceStore(str(tmp_path / "test.db"))
+
+    store.add_transaction(5000, "Зарплата", "Ноябрь", "income")
+    store.add_transaction(500, "Еда", "Продукты", "expense")
+    store.add_transaction(200, "Транспорт", "Метро", "expense")
+
+    yield store
+    store.close()
+
+
+def test_add_returns_transaction(store):
+    t = store.add_transaction(100, "Еда", "Хлеб", "expense")
+
+    assert isinstance(t, Transaction)
+    assert len(store.get_all_transactions()) == 4
+
+
+def test_ids_are_unique(store):
+    """Три транзакции созданы в одну миллисекунду - ID всё равно разные"""
+    ids = [t.id for t in store.get_all_transactions()]
+
+    assert len(set(ids)) == len(ids)
+
+
+def test_filters(store):
+    assert len(store.get_transactions_by_type("expense")) == 2
+    assert len(store.get_transactions_by_type("income")) == 1
+    assert store.get_transactions_by_category("Еда")[0].description == "Продукты"
+
+
+def test_aggregates(store):
+    assert store.get_total_income() == 5000
+    assert store.get_total_expenses() == 700
+    assert store.get_balance() == 4300
+
+
+def test_statistics(store):
+    stats = store.get_statistics()
+
+    assert stats["total_transactions"] == 3
+    assert stats["balance"] == 4300
+    assert stats["categories"] == {"Зарплата": 5000, "Еда": 500, "Транспорт": 200}
+
+
+def test_aggregates_per_currency(store):
+    store.add_transaction(900, "Еда", "Ресторан", "expense", currency="USD")
+
+    assert store.get_currencies() == ["RUB", "USD"]
+    assert store.get_total_expenses() == 700
+    assert store.get_total_expenses("USD") == 900
+    assert store.get_statistics("USD")["categories"] == {"Еда": 900}
+    assert store.get_statistics()["categories"]["Еда"] == 500
+
+
+def test_empty_store_statistics(tmp_path):
+    """Пустая БД: SUM() вернёт NULL, а мы должны вернуть нули"""
+    store = SQLiteFinanceStore(str(tmp_path / "empty.db"))
+
+    assert store.get_balance() == 0
+    assert store.get_statistics()["total_transactions"] == 0
+    store.close()
+
+
+def test_remove(store):
+    first_id = store.get_all_transactions()[0].id
+
+    assert store.remove_transaction(first_id) == True
+    assert store.remove_transaction(first_id) == False
+    assert store.get_total_income() == 0
+
+
+def test_reopen_keeps_data(tmp_path):
+    """Данные живут в файле БД, новое соединение их видит"""
+    path = str(tmp_path / "ledger.db")
+    store = SQLiteFinanceStore(path)
+    store.add_transaction(100, "Еда", transaction_type="expense")
+    store.close()
+
+    reopened = SQLiteFinanceStore(path)
+    assert reopened.get_total_expenses() == 100
+    reopened.close()
+
+
+def test_queries_use_indexes(store):
+    """
+    EXPLAIN QUERY PLAN показывает как SQLite выполняет запрос
+
+    ПРОВЕРЯЕМ:
+    Фильтр по категории идёт через индекс, а не через полный просмотр таблицы
+    """
+    cursor = store.conn.cursor()
+    cursor.execute("EXPLAIN QUERY PLAN SELECT * FROM transactions WHERE category = ?", ("Еда",))
+    plan = " ".join(row["detail"] for row in cursor.fetchall())
+
+    assert "idx_transactions_category" in plan
+
+
+def test_amounts_are_exact(tmp_path):
+    """SUM по целым копейкам: 1000 x 0.1 = ровно 100"""
+    store = SQLiteFinanceStore(str(tmp_path / "money.db"))
+    store.import_transactions(Transaction(0.1, "Еда") for _ in range(1000))
+
+    assert store.get_total_expenses() == Decimal("100")
+    assert store.get_all_transactions()[0].amount == Decimal("0.10")
+    store.close()
+
+
+def test_old_database_is_migrated(tmp_path):
+    """База со старой колонкой amount REAL переносится в amount_minor"""
+    path = str(tmp_path / "old.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("""
+        CREATE TABLE transactions (
+            id INTEGER PRIMARY KEY, amount REAL NOT NULL, category TEXT NOT NULL,
+            description TEXT NOT NULL DEFAULT '', transaction_type TEXT NOT NULL, date TEXT NOT NULL
+        )
+        """)
+        conn.execute("INSERT INTO transactions VALUES (1, 19.99, 'Еда', '', 'expense', '2025-11-16 10:00:00')")
+    conn.close()
+
+    store = SQLiteFinanceStore(path)
+
+    assert store.get_total_expenses() == Decimal("19.99")
+    store.add_transaction(0.01, "Еда")
+    assert store.get_total_expenses() == Decimal("20.00")
+    store.close()
+
+
+def test_search(store):
+    store.add_transaction(100, "Еда", "Хлебцы и МОЛОКО", "expense")
+    removed = store.add_transaction(100, "Еда", "Хлеб", "expense")
+    store.remove_transaction(removed.id)
+
+    assert [t.description for t in store.search("хле")] == ["Хлебцы и МОЛОКО"]
+    assert [t.description for t in store.search("молоко хлебцы", category="Еда")] == ["Хлебцы и МОЛОКО"]
+    assert store.search("хле", category="Транспорт") == []
+    assert store.search("хле", prefix=False) == []
+    assert len(store.search("", limit=2)) == 2
+
+
+def test_search_indexes_existing_rows(tmp_path):
+    """База без FTS таблицы: при открытии старые описания индексируются"""
+    path = str(tmp_path / "old.db")
+    store = SQLiteFinanceStore(path)
+    store.add_transaction(100, "Еда", "Купил хлеб", "expense")
+    store.conn.execute("DROP TABLE transactions_fts")
+    store.close()
+
+    store = SQLiteFinanceStore(path)
+
+    assert [t.description for t in store.search("хлеб")] == ["Купил хлеб"]
+    store.close()
+
+
+def test_account_balances(store):
+    store.add_transaction(20, "Кафе", "Кофе", account="Карта USD", currency="USD")
+
+    assert store.get_account_balances() == {"Основной": {"RUB": 4300}, "Карта USD": {"USD": -20}}
+    assert store.get_transactions_by_account("Карта USD")[0].currency == "USD"
+
+
+def test_database_without_accounts_is_migrated(tmp_path):
+    """Старые строки без account/currency читаются как основной счёт в рублях"""
+    path = str(tmp_path / "old.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("""
+        CREATE TABLE transactions (
+            id INTEGER PRIMARY KEY, amount_minor INTEGER NOT NULL, category TEXT NOT NULL,
+            description TEXT NOT NULL DEFAULT '', transaction_type TEXT NOT NULL, date TEXT NOT NULL
+        )
+        """)
+        conn.execute("INSERT INTO transactions VALUES (1, 1999, 'Еда', '', 'expense', '2025-11-16 10:00:00')")
+    conn.close()
+
+    store = SQLiteFinanceStore(path)
+    t = store.get_all_transactions()[0]
+
+    assert (t.account, t.currency, t.amount) == ("Основной", "RUB", Decimal("19.99"))
+    store.close()
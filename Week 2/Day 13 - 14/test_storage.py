@@ -0,0 +1,326 @@
+import json
+import multiprocessing
+import os
+import pytest
+import storage as storage_module
+from finance_manager import FinanceManager
+from storage import (JsonFileStorage, JournalStorage, BackgroundWriter,
+                     CorruptedLedgerError, atomic_write_json)
+
+
+@pytest.fixture
+def journal_manager(tmp_path):
+    """
+    Фикстура: менеджер с журнальным хранилищем
+
+    compact_every большой, чтобы компактификация не мешала тестам журнала
+    """
+    test_file = str(tmp_path / "ledger.json")
+    manager = FinanceManager(test_file, storage=JournalStorage(test_file, compact_every=100))
+    return manager
+
+
+def test_default_storage_is_json(tmp_path):
+    """По умолчанию FinanceManager использует обычный JSON файл"""
+    manager = FinanceManager(str(tmp_path / "test.json"))
+
+    assert isinstance(manager.storage, JsonFileStorage)
+
+
+def test_journal_appends_instead_of_rewriting(journal_manager):
+    """
+    Добавление пишет строку в журнал, а снимок не создаётся
+
+    ПРОВЕРЯЕМ:
+    Одна транзакция = одна строка в .journal
+    """
+    journal_manager.add_transaction(100, "Еда", "Хлеб", "expense")
+    journal_manager.add_transaction(200, "Транспорт", "Метро", "expense")
+
+    storage = journal_manager.storage
+    with open(storage.journal_filename, encoding="utf-8") as f:
+        lines = f.readlines()
+
+    assert len(lines) == 2
+    assert json.loads(lines[0])["op"] == "add"
+    assert storage.journal_size == 2
+
+
+def test_journal_remove_writes_tombstone(journal_manager):
+    """Удаление дописывает "надгробие", а не переписывает файл"""
+    t = journal_manager.add_transaction(100, "Еда", "Хлеб", "expense")
+    journal_manager.remove_transaction(t.id)
+
+    with open(journal_manager.storage.journal_filename, encoding="utf-8") as f:
+        last = json.loads(f.readlines()[-1])
+
+    assert last == {"op": "remove", "id": t.id}
+
+
+def test_journal_replay_after_restart(tmp_path, journal_manager):
+    """
+    Перезапуск: снимок + журнал дают то же состояние
+
+    ПРОВЕРЯЕМ:
+    Новый менеджер с тем же файлом видит добавления и удаления
+    """
+    t = journal_manager.add_transaction(100, "Еда", "Хлеб", "expense")
+    journal_manager.add_transaction(5000, "Зарплата", transaction_type="income")
+    journal_manager.remove_transaction(t.id)
+
+    filename = journal_manager.filename
+    restarted = FinanceManager(filename, storage=JournalStorage(filename))
+
+    assert len(restarted.transactions) == 1
+    assert restarted.transactions[0].amount == 5000
+
+
+def test_compaction_writes_snapshot(tmp_path):
+    """
+    Компактификация: после compact_every операций журнал пустеет,
+    а снимок содержит все транзакции
+    """
+    test_file = str(tmp_path / "ledger.json")
+    manager = FinanceManager(test_file, storage=JournalStorage(test_file, compact_every=3))
+
+    for amount in (100, 200, 300):
+        manager.add_transaction(amount, "Еда", transaction_type="expense")
+
+    with open(test_file, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    with open(manager.storage.journal_filename, encoding="utf-8") as f:
+        journal = f.read()
+
+    assert len(snapshot) == 3
+    assert journal == ""
+
+    # Снимок читается и обычным JSON хранилищем - формат тот же
+    assert len(FinanceManager(test_file).transactions) == 3
+
+
+def test_truncated_journal_line_is_ignored(journal_manager):
+    """
+    Недописанная строка в конце журнала (падение во время записи)
+    не ломает загрузку - всё что до неё восстанавливается
+    """
+    journal_manager.add_transaction(100, "Еда", transaction_type="expense")
+
+    storage = journal_manager.storage
+    with open(storage.journal_filename, "a", encoding="utf-8") as f:
+        f.write('{"op": "add", "transac')
+
+    transactions = JournalStorage(journal_manager.filename).load()
+
+    assert len(transactions) == 1
+
+
+def test_atomic_write_keeps_old_file_on_crash(tmp_path, monkeypatch):
+    """
+    Падение во время записи не портит старый файл
+
+    КАК ПРОВЕРЯЕМ:
+    Подменяем json.dump на функцию которая пишет половину и падает
+    """
+    path = str(tmp_path / "data.json")
+    atomic_write_json(path, [1, 2, 3])
+
+    def crash(data, f, **kwargs):
+        f.write("[1, 2")
+        raise OSError("питание пропало")
+
+    monkeypatch.setattr(storage_module.json, "dump", crash)
+    with pytest.raises(OSError):
+        atomic_write_json(path, [4, 5, 6])
+
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == [1, 2, 3]
+    # Временный файл убран
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_corrupted_file_is_not_silently_replaced(tmp_path):
+    """
+    Повреждённый файл: ошибка вместо пустого менеджера, файл не тронут
+    """
+    path = tmp_path / "broken.json"
+    path.write_text('[{"id": 1, "amount": ', encoding="utf-8")
+
+    with pytest.raises(CorruptedLedgerError):
+        FinanceManager(str(path))
+
+    assert path.read_text(encoding="utf-8") == '[{"id": 1, "amount": '
+
+
+def test_failed_save_rolls_back_add(tmp_path, monkeypatch):
+    """Если запись на диск не удалась, транзакции нет и в памяти"""
+    manager = FinanceManager(str(tmp_path / "test.json"))
+
+    def broken(transactions, added=(), removed_ids=()):
+        raise OSError("диск заполнен")
+
+    monkeypatch.setattr(manager.storage, "record_changes", broken)
+
+    with pytest.raises(OSError):
+        manager.add_transaction(100, "Еда")
+
+    assert len(manager) == 0
+    assert manager.check_aggregates()
+
+
+def test_background_writer_coalesces_writes(tmp_path):
+    """
+    100 добавлений подряд - одна запись в хранилище
+
+    flush_interval большой, поэтому поток не успевает записать
+    до явного flush()
+    """
+    path = str(tmp_path / "test.json")
+    inner = JsonFileStorage(path)
+    calls = []
+    original = inner.record_changes
+    inner.record_changes = lambda transactions, added=(), removed_ids=(): (
+        calls.append(len(added)), original(transactions, added, removed_ids))
+
+    writer = BackgroundWriter(inner, flush_interval=60)
+    manager = FinanceManager(path, storage=writer)
+    for i in range(100):
+        manager.add_transaction(i + 1, "Еда")
+
+    manager.close()
+
+    assert calls == [100]
+    assert len(FinanceManager(path)) == 100
+
+
+def test_background_writer_flushes_by_itself(tmp_path):
+    """Без flush() поток сам записывает изменения через flush_interval"""
+    path = str(tmp_path / "test.json")
+    writer = BackgroundWriter(JournalStorage(path), flush_interval=0.01)
+    manager = FinanceManager(path, storage=writer)
+    manager.add_transaction(100, "Еда")
+
+    for _ in range(500):
+        if os.path.exists(path + ".journal"):
+            break
+        writer._stop.wait(0.01)
+
+    assert len(JournalStorage(path).load()) == 1
+    writer.close()
+
+
+def _append_from_process(path, count):
+    # Запускается в отдельном процессе
+    manager = FinanceManager(path, storage=JournalStorage(path, compact_every=50))
+    for i in range(count):
+        manager.add_transaction(i + 1, "Еда")
+
+
+def test_several_processes_share_journal(tmp_path):
+    """
+    Несколько процессов дописывают в один журнал одновременно
+
+    ПРОВЕРЯЕМ:
+    Блокировка не даёт строкам перемешаться, а компактификация
+    не теряет чужие транзакции
+    """
+    path = str(tmp_path / "shared.json")
+    processes = [multiprocessing.Process(target=_append_from_process, args=(path, 100))
+                 for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert all(process.exitcode == 0 for process in processes)
+    assert len(JournalStorage(path).load()) == 400
+
+
+def test_save_all_keeps_other_process_changes(tmp_path):
+    """
+    Другой процесс дописал журнал после нашего load(), потом мы save_to_file
+
+    ПРОВЕРЯЕМ:
+    Снимок из памяти не затирает чужое добавление и не возвращает
+    транзакцию, которую другой процесс удалил
+    """
+    path = str(tmp_path / "ledger.json")
+    first = FinanceManager(path, storage=JournalStorage(path))
+    kept = first.add_transaction(100, "Еда")
+    removed = first.add_transaction(200, "Еда")
+
+    other = FinanceManager(path, storage=JournalStorage(path))
+    foreign = other.add_transaction(300, "Транспорт")
+    other.remove_transaction(removed.id)
+
+    mine = first.add_transaction(400, "Кафе")
+    first.save_to_file()
+
+    loaded = JournalStorage(path).load()
+    assert sorted(t.id for t in loaded) == sorted([kept.id, foreign.id, mine.id])
+
+    # Второй save_all: чужое добавление всё ещё на месте
+    first.save_to_file()
+    assert len(JournalStorage(path).load()) == 3
+
+
+def test_replay_many_tombstones(tmp_path):
+    """
+    Много надгробий в журнале поверх большого снимка
+
+    ПРОВЕРЯЕМ:
+    Удалены ровно те транзакции, что в журнале, порядок остальных
+    сохранён (remove не перебирает список - иначе загрузка O(k*n))
+    """
+    path = str(tmp_path / "ledger.json")
+    manager = FinanceManager(path, storage=JournalStorage(path, compact_every=10**6))
+    manager.add_transactions({"amount": i + 1, "category": "Еда"} for i in range(5000))
+    manager.save_to_file()  # Снимок
+
+    removed_ids = [t.id for t in manager.transactions[::3]]
+    for transaction_id in removed_ids:
+        manager.remove_transaction(transaction_id)
+    # Надгробие для ID которого нет - пропускается
+    manager.storage.record_changes(manager.transactions, removed_ids=[-1])
+
+    expected = [t.id for t in manager.transactions]
+    loaded = JournalStorage(path).load()
+
+    assert len(removed_ids) > 1000
+    assert [t.id for t in loaded] == expected
+
+
+def test_replay_remove_after_add_in_journal(tmp_path):
+    """Добавление и удаление одной транзакции в журнале - её нет после загрузки"""
+    path = str(tmp_path / "ledger.json")
+    manager = FinanceManager(path, storage=JournalStorage(path))
+    kept = manager.add_transaction(100, "Еда")
+    gone = manager.add_transaction(200, "Еда")
+    manager.remove_transaction(gone.id)
+
+    assert [t.id for t in JournalStorage(path).load()] == [kept.id]
+
+
+def test_duplicate_legacy_ids_removed_after_restart(tmp_path):
+    """
+    В старом снимке две транзакции с одним ID, удаляем вторую
+
+    ПРОВЕРЯЕМ:
+    Сдвинутый ID записан на диск при загрузке, поэтому надгробие
+    в журнале находит нужную транзакцию - после перезапуска её нет
+    """
+    path = str(tmp_path / "ledger.json")
+    atomic_write_json(path, [
+        {"id": 7, "amount": 100, "category": "Еда", "description": "Хлеб",
+         "transaction_type": "expense", "date": "2025-11-16 10:00:00"},
+        {"id": 7, "amount": 200, "category": "Еда", "description": "Сыр",
+         "transaction_type": "expense", "date": "2025-11-16 11:00:00"},
+    ])
+
+    manager = FinanceManager(path, storage=JournalStorage(path))
+    shifted = manager.transactions[1]
+    assert shifted.id != 7
+    manager.remove_transaction(shifted.id)
+
+    loaded = FinanceManager(path, storage=JournalStorage(path))
+
+    assert [t.description for t in loaded.transactions] == ["Хлеб"]
@@ -1,6 +1,7 @@
 import pytest
 from transaction import Transaction
 from datetime import datetime
+from decimal import Decimal
 
 def test_create_expense():
 
@@ -230,3 +231,58 @@ def test_invalid_amounts(invalid_amount):
 
 
 
+
+
+def test_transaction_has_no_dict():
+    """
+    __slots__: у объекта нет __dict__, нельзя добавить случайное поле
+    """
+    t = Transaction(100, "Еда")
+
+    assert not hasattr(t, "__dict__")
+    with pytest.raises(AttributeError):
+        t.unknown_field = 1
+
+
+def test_date_stored_as_timestamp():
+    """Дата хранится числом (epoch), строка собирается по запросу"""
+    t = Transaction(100, "Еда")
+    t.date = "2025-11-16 10:00:00"
+
+    assert isinstance(t.timestamp, int)
+    assert t.date == "2025-11-16 10:00:00"
+    assert t.timestamp == int(datetime(2025, 11, 16, 10, 0, 0).timestamp())
+
+
+def test_amount_stored_in_minor_units():
+    """float превращается в копейки на входе, наружу - Decimal"""
+    t = Transaction(0.1, "Еда")
+
+    assert t.amount_minor == 10
+    assert t.amount == Decimal("0.10")
+    assert t.to_dict()["amount"] == 0.1
+
+
+@pytest.mark.parametrize("amount", [float("nan"), float("inf"), 0.001, True])
+def test_validate_rejects_bad_amounts(amount):
+    assert Transaction.validate(amount, "expense") is not None
+
+
+def test_default_account_and_currency():
+    t = Transaction(100, "Еда")
+
+    assert (t.account, t.currency) == ("Основной", "RUB")
+    assert Transaction.from_dict({"amount": 100, "category": "Еда", "transaction_type": "expense",
+                                  "date": "2025-11-16 10:00:00", "id": 1}).currency == "RUB"
+
+
+@pytest.mark.parametrize("currency", ["usd", "US", "RUBL", "", "12$"])
+def test_invalid_currency(currency):
+    with pytest.raises(ValueError):
+        Transaction(100, "Еда", currency=currency)
+
+
+def test_str_shows_currency():
+    t = Transaction(12.5, "Кафе", "Кофе", account="Карта USD", currency="USD")
+
+    assert "12.50 $" in str(t)
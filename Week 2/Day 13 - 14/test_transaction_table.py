@@ -0,0 +1,93 @@
+import pytest
+from datetime import datetime
+
+# Без NumPy эти тесты пропускаются, остальные работают
+np = pytest.importorskip("numpy")
+
+from finance_manager import FinanceManager
+from transaction import Transaction
+from transaction_table import TransactionTable
+
+
+@pytest.fixture
+def table(tmp_path):
+    manager = FinanceManager(str(tmp_path / "test.json"))
+    manager.add_transaction(5000, "Зарплата", "Ноябрь", "income")
+    manager.add_transaction(500, "Еда", "Продукты", "expense")
+    manager.add_transaction(300, "Еда", "Кафе", "expense")
+    manager.add_transaction(200, "Транспорт", "Метро", "expense")
+    return manager.to_table()
+
+
+def test_table_length(table):
+    assert len(table) == 4
+
+
+def test_categories_dictionary_encoded(table):
+    """Каждая категория хранится один раз, в массиве - только номера"""
+    assert table.categories == ["Зарплата", "Еда", "Транспорт"]
+    assert list(table.category_codes) == [0, 1, 1, 2]
+
+
+def test_table_totals(table):
+    assert table.get_total_income() == 5000
+    assert table.get_total_expenses() == 1000
+    assert table.get_balance() == 4000
+
+
+def test_table_category_totals(table):
+    assert table.get_category_totals() == {"Зарплата": 5000, "Еда": 800, "Транспорт": 200}
+
+
+def test_between_filters_by_time():
+    old = Transaction(100, "Еда")
+    old.date = "2024-01-01 12:00:00"
+    new = Transaction(200, "Еда")
+    new.date = "2025-01-01 12:00:00"
+
+    table = TransactionTable.from_transactions([old, new])
+    start = int(datetime(2024, 6, 1).timestamp())
+
+    recent = table.between(start, 2**62)
+
+    assert len(recent) == 1
+    assert recent.get_total_expenses() == 200
+
+
+@pytest.fixture
+def mixed_manager(tmp_path):
+    """Рубли и доллары в одних категориях"""
+    manager = FinanceManager(str(tmp_path / "test.json"))
+    manager.add_transaction(100, "Зарплата", "", "income")
+    manager.add_transaction(100, "Зарплата", "", "income", account="Карта USD", currency="USD")
+    manager.add_transaction(30, "Еда", "", "expense")
+    manager.add_transaction(7, "Еда", "", "expense", account="Карта USD", currency="USD")
+    manager.add_transaction(5, "Кафе", "", "expense", account="Карта USD", currency="USD")
+    return manager
+
+
+def test_currencies_dictionary_encoded(mixed_manager):
+    table = mixed_manager.to_table()
+
+    assert table.get_currencies() == ["RUB", "USD"]
+    assert list(table.currency_codes) == [0, 1, 0, 1, 1]
+
+
+@pytest.mark.parametrize("currency", ["RUB", "USD", "EUR"])
+def test_table_matches_manager_per_currency(mixed_manager, currency):
+    """Колоночные суммы те же, что у FinanceManager - валюты не смешиваются"""
+    table = mixed_manager.to_table()
+    stats = mixed_manager.get_statistics(currency)
+
+    assert table.get_total_income(currency) == mixed_manager.get_total_income(currency)
+    assert table.get_total_expenses(currency) == mixed_manager.get_total_expenses(currency)
+    assert table.get_balance(currency) == mixed_manager.get_balance(currency)
+    assert table.get_category_totals(currency) == stats["categories"]
+
+
+def test_table_default_currency(mixed_manager):
+    table = mixed_manager.to_table()
+
+    assert table.get_total_income() == 100
+    assert table.get_category_totals() == {"Зарплата": 100, "Еда": 30}
+    assert table.between(0, 2**62).get_total_expenses("USD") == 12
@@ -1,35 +1,151 @@
+import re
+import time
 from datetime import datetime
+from decimal import Decimal
+from id_generator import next_id
+from money import to_minor, from_minor, to_number
+
+# Формат даты в файлах и на экране
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Счёт и валюта по умолчанию - все транзакции из старых файлов
+DEFAULT_ACCOUNT = "Основной"
+DEFAULT_CURRENCY = "RUB"
+
+# Как показывать валюту на экране (остальные - кодом: "USD", "EUR")
+CURRENCY_NAMES = {"RUB": "руб", "USD": "$", "EUR": "€"}
+
+# Код валюты по ISO 4217 - три заглавные латинские буквы
+CURRENCY_PATTERN = re.compile(r"^[A-Z]{3}$")
+
+class BulkValidationError(ValueError):
+    """
+    Ошибка пакетной проверки: сразу все плохие строки
+
+    errors - список пар (номер строки, сообщение)
+    """
+    def __init__(self, errors):
+        self.errors = errors
+        lines = [f"строка {index}: {message}" for index, message in errors]
+        super().__init__(f"Некорректных строк: {len(errors)}\n" + "\n".join(lines))
+
 
 class Transaction:
-     def __init__(self, amount, category, description="", transaction_type="expense"):
+     # __slots__ - фиксированный список полей вместо словаря __dict__
+     # Каждый объект занимает в несколько раз меньше памяти,
+     # что заметно когда транзакций миллионы
+     #
+     # Сумма хранится целым числом копеек (amount_minor), а не float:
+     # сложение целых точное, баланс миллиона транзакций не "уплывает"
+     #
+     # Копейки - в единицах валюты currency (центы для USD и т.д.)
+     __slots__ = ("amount_minor", "category", "description", "transaction_type",
+                  "timestamp", "id", "account", "currency")
+
+     def __init__(self, amount, category, description="", transaction_type="expense",
+                  account=DEFAULT_ACCOUNT, currency=DEFAULT_CURRENCY):
           
-        if not isinstance(amount, (int, float)):
-               raise ValueError(f"Сумма должна быть числом, получено {type(amount)}")
-        if amount <= 0:
-            raise ValueError("Сумма должна быть больше нуля")
-        
-        # Проверяем тип транзакции
-        # Разрешены только "income" или "expense"
-        if transaction_type not in ["income", "expense"]:
-            raise ValueError("Тип должен быть 'income' или 'expense'")
+        error = Transaction.validate(amount, transaction_type, currency)
+        if error:
+            raise ValueError(error)
         
         self.amount = amount
         self.category = category
         self.description = description
         self.transaction_type = transaction_type
+        self.account = account
+        self.currency = currency
 
-        self.date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # Храним целое число секунд (epoch) - дёшево создать и сравнивать
+        # Строку даты собираем только когда её просят (свойство date)
+        self.timestamp = int(time.time())
 
-        self.id = int(datetime.now().timestamp() * 1000) # Уникальный ID
+        self.id = next_id() # Уникальный ID (см. id_generator.py)
+
+     @staticmethod
+     def validate(amount, transaction_type, currency=DEFAULT_CURRENCY):
+        """
+        Проверить данные транзакции
+
+        ВОЗВРАЩАЕТ:
+        None если всё хорошо, иначе текст ошибки
+
+        ЗАЧЕМ ОТДЕЛЬНО ОТ __init__:
+        Пакетная загрузка (FinanceManager.add_transactions) проверяет
+        все строки и собирает все ошибки, не создавая объектов
+        """
+        if isinstance(amount, bool) or not isinstance(amount, (int, float, Decimal)):
+            return f"Сумма должна быть числом, получено {type(amount)}"
+        try:
+            minor = to_minor(amount)
+        except ValueError as e:
+            return str(e)
+        if minor <= 0:
+            # 0.001 округляется до 0 копеек - это тоже "не больше нуля"
+            return "Сумма должна быть больше нуля"
+        
+        # Проверяем тип транзакции
+        # Разрешены только "income" или "expense"
+        if transaction_type not in ("income", "expense"):
+            return "Тип должен быть 'income' или 'expense'"
+
+        if not isinstance(currency, str) or not CURRENCY_PATTERN.match(currency):
+            return f"Валюта - код из трёх заглавных букв (RUB, USD), получено {currency!r}"
+        
+        return None
+
+     @staticmethod
+     def create_validated(amount, category, description, transaction_type, timestamp=None,
+                          account=DEFAULT_ACCOUNT, currency=DEFAULT_CURRENCY):
+        """
+        Создать транзакцию из УЖЕ проверенных данных (без повторной validate)
+
+        Используется пакетной загрузкой: она проверила все строки заранее
+        """
+        # __new__ создаёт пустой объект, __init__ не вызывается
+        transaction = Transaction.__new__(Transaction)
+        transaction.amount = amount
+        transaction.category = category
+        transaction.description = description
+        transaction.transaction_type = transaction_type
+        transaction.account = account
+        transaction.currency = currency
+        transaction.timestamp = int(time.time()) if timestamp is None else timestamp
+        transaction.id = next_id()
+        return transaction
+
+     @property
+     def amount(self):
+         """Сумма в валюте транзакции - Decimal, например Decimal("100.50")"""
+         return from_minor(self.amount_minor)
+
+     @amount.setter
+     def amount(self, value):
+         # float/int/Decimal превращаются в копейки здесь, на входе
+         self.amount_minor = to_minor(value)
+
+     @property
+     def date(self):
+         """Дата строкой, например: 2025-11-16 10:00:00"""
+         return datetime.fromtimestamp(self.timestamp).strftime(DATE_FORMAT)
+
+     @date.setter
+     def date(self, value):
+         # Строку из файла превращаем обратно в epoch
+         # fromisoformat понимает "2025-11-16 10:00:00" (наш DATE_FORMAT)
+         # и в разы быстрее strptime - важно при загрузке больших файлов
+         self.timestamp = int(datetime.fromisoformat(value).timestamp())
 
      def to_dict(self):    
          return {
             "id": self.id,
-            "amount": self.amount,
+            "amount": to_number(self.amount_minor),  # 100 или 100.5 - как раньше
             "category": self.category,
             "description": self.description,
             "transaction_type": self.transaction_type,
-            "date": self.date
+            "date": self.date,
+            "account": self.account,
+            "currency": self.currency,
         }
      
 
@@ -41,7 +157,10 @@ class Transaction:
             amount=data["amount"],
             category=data["category"],
             description=data.get("description", ""),  # .get с дефолтом на случай если ключа нет
-            transaction_type=data["transaction_type"]
+            transaction_type=data["transaction_type"],
+            # В файлах до появления счетов этих ключей нет
+            account=data.get("account", DEFAULT_ACCOUNT),
+            currency=data.get("currency", DEFAULT_CURRENCY),
         )
 
         # Восстанавливаем сохранённые дату и ID
@@ -54,7 +173,9 @@ class Transaction:
      def __str__(self):
         symbol = "+" if self.transaction_type == "income" else "-"
 
-        return f"{symbol}{self.amount} руб | {self.category} | {self.description}"
+        currency = CURRENCY_NAMES.get(self.currency, self.currency)
+
+        return f"{symbol}{self.amount} {currency} | {self.category} | {self.description}"
      
      def __repr__(self): 
          return f"Transaction(id={self.id}, amount={self.amount}, type={self.transaction_type})"
@@ -0,0 +1,154 @@
+import numpy as np
+from money import from_minor
+from transaction import DEFAULT_CURRENCY
+
+
+class TransactionTable:
+    """
+    Колоночное (columnar) представление транзакций на NumPy
+
+    ЗАЧЕМ:
+    Список объектов Transaction удобен, но для аналитики по миллионам строк
+    дорог: каждый объект - отдельный кусок памяти, каждая сумма - отдельный float.
+    Здесь каждое поле - один массив NumPy:
+
+        ids          [101, 102, 103]      int64
+        amounts      [50000, 500000, 20000] int64 (копейки, см. money.py)
+        is_income    [False, True, False] bool
+        timestamps   [...]                int64 (epoch секунды)
+        category_codes [0, 1, 2]          int32
+        currency_codes [0, 0, 1]          int8
+
+    КАТЕГОРИИ И ВАЛЮТЫ (dictionary encoding):
+    Строка категории хранится один раз в self.categories,
+    а в массиве - только её номер. "Еда" x 1 000 000 = одна строка + миллион int32.
+    Валюты так же: self.currencies + номер в currency_codes.
+
+    Суммы, как и у FinanceManager, считаются в одной валюте
+    (currency, по умолчанию DEFAULT_CURRENCY) - рубли с долларами не складываем.
+
+    Описания не хранятся - таблица только для аналитики.
+    """
+
+    def __init__(self, ids, amounts, is_income, timestamps, category_codes, categories,
+                 currency_codes, currencies):
+        self.ids = ids
+        self.amounts = amounts
+        self.is_income = is_income
+        self.timestamps = timestamps
+        self.category_codes = category_codes
+        self.categories = categories  # номер -> название категории
+        self.currency_codes = currency_codes
+        self.currencies = currencies  # номер -> код валюты
+
+    @classmethod
+    def from_transactions(cls, transactions):
+        """Собрать таблицу из любого итерируемого набора Transaction"""
+        codes = {}       # название категории -> номер
+        categories = []  # номер -> название
+        currency_numbers = {}  # код валюты -> номер
+        currencies = []
+
+        ids = []
+        amounts = []
+        is_income = []
+        timestamps = []
+        category_codes = []
+        currency_codes = []
+
+        for t in transactions:
+            code = codes.get(t.category)
+            if code is None:
+                code = len(categories)
+                codes[t.category] = code
+                categories.append(t.category)
+
+            currency_code = currency_numbers.get(t.currency)
+            if currency_code is None:
+                currency_code = len(currencies)
+                currency_numbers[t.currency] = currency_code
+                currencies.append(t.currency)
+
+            ids.append(t.id)
+            amounts.append(t.amount_minor)
+            is_income.append(t.transaction_type == "income")
+            timestamps.append(t.timestamp)
+            category_codes.append(code)
+            currency_codes.append(currency_code)
+
+        return cls(
+            ids=np.array(ids, dtype=np.int64),
+            amounts=np.array(amounts, dtype=np.int64),
+            is_income=np.array(is_income, dtype=bool),
+            timestamps=np.array(timestamps, dtype=np.int64),
+            category_codes=np.array(category_codes, dtype=np.int32),
+            categories=categories,
+            # Валют немного - номер помещается в один байт
+            currency_codes=np.array(currency_codes, dtype=np.int8),
+            currencies=currencies,
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def nbytes(self):
+        """Сколько байт занимают массивы (без списка названий категорий)"""
+        return (self.ids.nbytes + self.amounts.nbytes + self.is_income.nbytes
+                + self.timestamps.nbytes + self.category_codes.nbytes
+                + self.currency_codes.nbytes)
+
+    def get_currencies(self):
+        """Валюты, в которых есть транзакции"""
+        return list(self.currencies)
+
+    def _in_currency(self, currency):
+        """Маска: транзакции в валюте currency (нет такой валюты - все False)"""
+        if currency not in self.currencies:
+            return np.zeros(len(self), dtype=bool)
+        return self.currency_codes == self.currencies.index(currency)
+
+    def get_total_income(self, currency=DEFAULT_CURRENCY):
+        # Маски выбирают нужные элементы без цикла в Python
+        # Сумма int64 точная - в Decimal переводим один итог
+        mask = self.is_income & self._in_currency(currency)
+        return from_minor(int(self.amounts[mask].sum()))
+
+    def get_total_expenses(self, currency=DEFAULT_CURRENCY):
+        mask = ~self.is_income & self._in_currency(currency)
+        return from_minor(int(self.amounts[mask].sum()))
+
+    def get_balance(self, currency=DEFAULT_CURRENCY):
+        return self.get_total_income(currency) - self.get_total_expenses(currency)
+
+    def get_category_totals(self, currency=DEFAULT_CURRENCY):
+        """
+        Суммы по категориям в валюте currency
+
+        np.add.at(totals, codes, amounts) складывает суммы
+        для каждого номера категории за один проход.
+        (bincount с weights считал бы во float64 - теряли бы копейки)
+        Категории без транзакций в этой валюте в ответ не попадают -
+        как в FinanceManager.get_statistics
+        """
+        mask = self._in_currency(currency)
+        codes = self.category_codes[mask]
+        totals = np.zeros(len(self.categories), dtype=np.int64)
+        np.add.at(totals, codes, self.amounts[mask])
+        counts = np.bincount(codes, minlength=len(self.categories))
+        return {name: from_minor(int(total))
+                for name, total, count in zip(self.categories, totals, counts) if count}
+
+    def between(self, start_timestamp, end_timestamp):
+        """Новая таблица только с транзакциями в [start, end)"""
+        mask = (self.timestamps >= start_timestamp) & (self.timestamps < end_timestamp)
+        return TransactionTable(
+            ids=self.ids[mask],
+            amounts=self.amounts[mask],
+            is_income=self.is_income[mask],
+            timestamps=self.timestamps[mask],
+            category_codes=self.category_codes[mask],
+            categories=self.categories,
+            currency_codes=self.currency_codes[mask],
+            currencies=self.currencies,
+        )
@@ -154,6 +154,9 @@ def add_comment(post_id):
     return redirect(url_for('view_post', post_id=post_id))
 
 
+SEARCH_PAGE_SIZE = 10  # Результатов поиска на странице
+
+
 @app.route('/search')
 def search():
     """Поиск постов"""
@@ -163,13 +166,16 @@ def search():
         flash('Введите запрос для поиска', 'warning')
         return redirect(url_for('index'))
     
-    posts = db.search_posts(query)
-    
-    # Добавить количество комментариев
-    for post in posts:
-        post['comment_count'] = db.get_comment_count(post['id'])
+    page = max(request.args.get('page', default=1, type=int), 1)
+
+    # Полнотекстовый поиск (FTS5): по релевантности, с подсветкой, постранично
+    posts, total = db.search_posts(query, limit=SEARCH_PAGE_SIZE,
+                                   offset=(page - 1) * SEARCH_PAGE_SIZE)
+    pages = max(-(-total // SEARCH_PAGE_SIZE), 1)  # Деление с округлением вверх
+    # comment_count уже в результатах (один подзапрос в поиске, а не запрос на пост)
 
-    return render_template('search.html', posts=posts, query=query)
+    return render_template('search.html', posts=posts, query=query,
+                           total=total, page=page, pages=pages)
 
 
 @app.route('/stats')
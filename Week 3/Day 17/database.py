@@ -1,5 +1,6 @@
 import sqlite3
 from datetime import datetime
+from search import init_search, find_posts
 
 DATABASE = 'blog.db'
 
@@ -42,6 +43,8 @@ def init_db():
         Это значит:
         Комментарий всегда привязан к конкретному посту
         """
+
+        init_search(cursor)
         
         conn.commit()
         print("✓ База данных инициализирована")
@@ -134,17 +137,22 @@ def increment_views(post_id):
         conn.commit()
 
 
-def search_posts(query):
-    """Поиск постов"""
+def search_posts(query, limit=10, offset=0, prefix=True):
+    """
+    Поиск постов через FTS5 (см. search.py)
+
+    - Сначала самые подходящие (bm25, совпадение в заголовке весит в 10 раз больше)
+    - snippet - кусок текста с найденными словами в <mark> (HTML экранирован)
+    - prefix=True - "pyth" найдёт "python"
+    - comment_count - уже посчитан, отдельный запрос на каждый пост не нужен
+
+    ВОЗВРАЩАЕТ:
+    (посты страницы, сколько всего найдено)
+    """
     with sqlite3.connect(DATABASE) as conn:
-        conn.row_factory = dict_factory
         cursor = conn.cursor()
-        cursor.execute("""
-        SELECT * FROM posts 
-        WHERE title LIKE ? OR content LIKE ?
-        ORDER BY created_at DESC
-        """, (f'%{query}%', f'%{query}%'))
-        return cursor.fetchall()
+        cursor.row_factory = dict_factory
+        return find_posts(cursor, query, limit, offset, prefix)
 
 
 def add_comment(post_id, author, content):
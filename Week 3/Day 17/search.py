@@ -0,0 +1,184 @@
+"""
+Полнотекстовый поиск постов (FTS5) - общий для блога Day 17 и Day 18
+
+ПРОБЛЕМА:
+LIKE '%python%' не может использовать индекс - каждый поиск
+читает все посты целиком, и результаты никак не упорядочены по смыслу.
+
+КАК РАБОТАЕТ:
+posts_fts - виртуальная таблица FTS5: слово -> в каких постах оно есть.
+content='posts' - текст не копируется, FTS хранит только индекс слов
+и берёт текст из posts (для snippet).
+Триггеры обновляют индекс при INSERT / UPDATE / DELETE в posts.
+
+Если SQLite собран без FTS5, индекса нет - find_posts ищет
+по-старому, через LIKE (медленно, но поиск работает).
+
+ИСПОЛЬЗОВАНИЕ (database.py):
+    init_search(cursor)                          # в init_db
+    cursor.row_factory = dict_factory
+    posts, total = find_posts(cursor, "python")  # поиск
+"""
+import html
+import re
+import sqlite3
+
+# Границы найденных слов в snippet. Служебные символы, а не <mark>:
+# сначала экранируем HTML из текста поста, потом ставим <mark> (highlight)
+MATCH_START = '\x02'
+MATCH_END = '\x03'
+
+# Вес совпадения в заголовке и в тексте для bm25 (заголовок важнее)
+TITLE_WEIGHT = 10.0
+CONTENT_WEIGHT = 1.0
+
+# Сколько символов текста показывать в результатах без FTS5
+EXCERPT_LENGTH = 200
+
+
+def init_search(cursor):
+    """
+    Создать индекс posts_fts и триггеры (если их ещё нет)
+
+    ВОЗВРАЩАЕТ:
+    True - индекс есть, False - SQLite без FTS5 (поиск будет через LIKE)
+    """
+    cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'posts_fts'")
+    existed = cursor.fetchone()[0] > 0
+
+    try:
+        cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts
+        USING fts5(title, content, content='posts', content_rowid='id')
+        """)
+    except sqlite3.OperationalError as e:
+        # "no such module: fts5"
+        print(f"⚠ Полнотекстовый поиск недоступен ({e}), поиск через LIKE")
+        return False
+
+    if not existed:
+        # Посты, написанные до появления поиска - проиндексировать
+        cursor.execute("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')")
+
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """)
+    # Удалить из индекса FTS5 (content=...) можно только передав старый текст
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS posts_fts_delete AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts (posts_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """)
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS posts_fts_update AFTER UPDATE OF title, content ON posts BEGIN
+        INSERT INTO posts_fts (posts_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO posts_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """)
+    return True
+
+
+def has_search_index(cursor):
+    """Есть ли индекс posts_fts (cursor с dict_factory)"""
+    cursor.execute("SELECT COUNT(*) AS total FROM sqlite_master WHERE name = 'posts_fts'")
+    return cursor.fetchone()['total'] > 0
+
+
+def build_match_query(query, prefix=True):
+    """
+    Запрос пользователя -> выражение для MATCH
+
+    Каждое слово в кавычках: символы вроде " * : ( в запросе
+    не ломают синтаксис FTS5. "pyth"* - все слова на "pyth".
+    Слова через пробел - пост должен содержать каждое (И).
+    Пустая строка - в запросе нет ни одного слова
+    """
+    words = re.findall(r'\w+', query)
+    return ' '.join(f'"{word}"*' if prefix else f'"{word}"' for word in words)
+
+
+def highlight(snippet):
+    """Фрагмент из snippet() -> безопасный HTML с <mark> вокруг найденных слов"""
+    return (html.escape(snippet)
+            .replace(MATCH_START, '<mark>')
+            .replace(MATCH_END, '</mark>'))
+
+
+def find_posts(cursor, query, limit=20, offset=0, prefix=True):
+    """
+    Поиск постов: страница результатов + comment_count
+
+    cursor - курсор с row_factory = dict_factory (строки - словари)
+
+    - Порядок - по релевантности bm25 (чем меньше, тем лучше;
+      совпадение в заголовке весит TITLE_WEIGHT, в тексте - CONTENT_WEIGHT)
+    - snippet - кусок текста вокруг найденных слов, слова в <mark>
+      (HTML уже экранирован). Колонка -1: SQLite сам выбирает, где
+      совпадение - в заголовке или в тексте
+    - prefix=True - "pyth" найдёт "python"
+    - comment_count - подзапрос по индексу comments(post_id),
+      только для постов страницы (а не отдельный запрос на каждый пост)
+
+    ВОЗВРАЩАЕТ:
+    (посты страницы, сколько всего найдено)
+    """
+    if not has_search_index(cursor):
+        return _find_posts_like(cursor, query, limit, offset)
+
+    match = build_match_query(query, prefix)
+    if not match:
+        return [], 0
+
+    cursor.execute("SELECT COUNT(*) AS total FROM posts_fts WHERE posts_fts MATCH ?", (match,))
+    total = cursor.fetchone()['total']
+
+    cursor.execute("""
+    SELECT p.*,
+           snippet(posts_fts, -1, ?, ?, '…', 16) AS snippet,
+           bm25(posts_fts, ?, ?) AS score,
+           (SELECT COUNT(*) FROM comments c WHERE c.post_id = p.id) AS comment_count
+    FROM posts_fts
+    JOIN posts p ON p.id = posts_fts.rowid
+    WHERE posts_fts MATCH ?
+    ORDER BY score
+    LIMIT ? OFFSET ?
+    """, (MATCH_START, MATCH_END, TITLE_WEIGHT, CONTENT_WEIGHT, match, limit, offset))
+    posts = cursor.fetchall()
+
+    for post in posts:
+        post['snippet'] = highlight(post['snippet'])
+    return posts, total
+
+
+def _find_posts_like(cursor, query, limit, offset):
+    # Без FTS5: LIKE по всей таблице, новые сверху, фраза целиком
+    query = query.strip()
+    if not query:
+        return [], 0
+
+    pattern = f'%{query}%'
+    cursor.execute("""
+    SELECT COUNT(*) AS total FROM posts WHERE title LIKE ? OR content LIKE ?
+    """, (pattern, pattern))
+    total = cursor.fetchone()['total']
+
+    cursor.execute("""
+    SELECT p.*,
+           (SELECT COUNT(*) FROM comments c WHERE c.post_id = p.id) AS comment_count
+    FROM posts p
+    WHERE p.title LIKE ? OR p.content LIKE ?
+    ORDER BY p.created_at DESC
+    LIMIT ? OFFSET ?
+    """, (pattern, pattern, limit, offset))
+    posts = cursor.fetchall()
+
+    for post in posts:
+        excerpt = post['content'][:EXCERPT_LENGTH]
+        if len(post['content']) > EXCERPT_LENGTH:
+            excerpt += '…'
+        post['snippet'] = html.escape(excerpt)
+    return posts, total
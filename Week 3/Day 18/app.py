@@ -9,6 +9,8 @@ app.secret_key = 'your-secret-key-change-in-production'
 
 # Инициализация БД при запуске
 db.init_db()
+# Одно соединение на запрос (из пула), возвращается в пул после ответа
+db.init_app(app)
 
 # ==========================================
 # РЕГИСТРАЦИЯ
@@ -99,11 +101,9 @@ def logout():
 @app.route('/')
 def index():
     """Главная - список всех постов"""
-    posts = db.get_all_posts()
-    
-    for post in posts:
-        post['comment_count'] = db.get_comment_count(post['id'])
-    
+    # Посты сразу с количеством комментариев - один запрос вместо N+1
+    posts = db.get_all_posts_with_comment_counts()
+
     return render_template('index.html', posts=posts)
 
 
@@ -239,6 +239,9 @@ def add_comment(post_id):
 # ПОИСК
 # ==========================================
 
+SEARCH_PAGE_SIZE = 10  # Результатов поиска на странице
+
+
 @app.route('/search')
 def search():
     """Поиск постов"""
@@ -248,12 +251,15 @@ def search():
         flash('Введите запрос для поиска', 'warning')
         return redirect(url_for('index'))
     
-    posts = db.search_posts(query)
-    
-    for post in posts:
-        post['comment_count'] = db.get_comment_count(post['id'])
-    
-    return render_template('search.html', posts=posts, query=query)
+    page = max(request.args.get('page', default=1, type=int), 1)
+
+    # Полнотекстовый поиск (FTS5): по релевантности, с подсветкой, постранично
+    posts, total = db.search_posts_fts(query, limit=SEARCH_PAGE_SIZE,
+                                       offset=(page - 1) * SEARCH_PAGE_SIZE)
+    pages = max(-(-total // SEARCH_PAGE_SIZE), 1)  # Деление с округлением вверх
+
+    return render_template('search.html', posts=posts, query=query,
+                           total=total, page=page, pages=pages)
 
 
 # ==========================================
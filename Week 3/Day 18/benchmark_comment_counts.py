@@ -0,0 +1,89 @@
+"""
+Главная страница: посты + количество комментариев
+
+ЗАПУСК:
+python benchmark_comment_counts.py                 # 10, 100, 500, 2000 постов
+python benchmark_comment_counts.py 100 1000 5000
+
+Сравнивает:
+- N+1: список постов и COUNT(*) для каждого поста, каждый запрос -
+  в новом соединении (как было до пула соединений и JOIN)
+- get_all_posts_with_comment_counts(): один LEFT JOIN + GROUP BY
+
+БД создаётся во временной папке, blog.db не трогается.
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import closing
+import database as db
+
+COMMENTS_PER_POST = 5  # В среднем
+
+
+def fill(count):
+    """count постов и около COMMENTS_PER_POST комментариев на пост"""
+    random.seed(1)
+    with sqlite3.connect(db.DATABASE) as conn:
+        conn.executemany(
+            "INSERT INTO posts (title, content, author) VALUES (?, ?, ?)",
+            [(f"Пост {i}", "Содержимое поста " * 20, "ivan") for i in range(count)])
+        conn.executemany(
+            "INSERT INTO comments (post_id, author, content) VALUES (?, ?, ?)",
+            [(random.randint(1, count), "maria", "Отличный пост!")
+             for _ in range(count * COMMENTS_PER_POST)])
+
+
+def query_new_connection(sql, params=()):
+    """
+    Запрос в НОВОМ соединении - как работали функции database.py раньше
+
+    db.get_all_posts() / db.get_comment_count() теперь берут соединение
+    потока (get_db) и не показали бы цену открытия соединения
+    """
+    with closing(sqlite3.connect(db.DATABASE)) as conn:
+        conn.row_factory = db.dict_factory
+        return conn.execute(sql, params).fetchall()
+
+
+def n_plus_one():
+    posts = query_new_connection("SELECT * FROM posts ORDER BY created_at DESC")
+    for post in posts:
+        post['comment_count'] = query_new_connection(
+            "SELECT COUNT(*) AS total FROM comments WHERE post_id = ?", (post['id'],))[0]['total']
+    return posts
+
+
+def timed(action, repeat=3):
+    # Лучший из нескольких запусков
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(sizes):
+    print(f"{'постов':>8} {'N+1, мс':>12} {'JOIN, мс':>12} {'быстрее':>10}")
+    for count in sizes:
+        with tempfile.TemporaryDirectory() as folder:
+            db.DATABASE = os.path.join(folder, "bench.db")
+            db.init_db()
+            fill(count)
+
+            # Результаты должны совпадать
+            assert {p['id']: p['comment_count'] for p in n_plus_one()} == \
+                   {p['id']: p['comment_count'] for p in db.get_all_posts_with_comment_counts()}
+
+            slow = timed(n_plus_one)
+            fast = timed(db.get_all_posts_with_comment_counts)
+            print(f"{count:8} {slow * 1000:12.2f} {fast * 1000:12.2f} {slow / fast:9.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 100, 500, 2000])
@@ -0,0 +1,85 @@
+"""
+Поиск постов: LIKE '%...%' против FTS5
+
+ЗАПУСК:
+python benchmark_search.py            # 100 000 постов
+python benchmark_search.py 10000
+
+Сравнивает:
+- like_search(): LIKE по title и content + comment_count (перебор всей таблицы, как до FTS)
+- search_posts_fts(): индекс FTS5, bm25, snippet, первая страница (20)
+
+БД создаётся во временной папке, blog.db не трогается.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import database as db
+
+WORDS = ["python", "flask", "sqlite", "шаблон", "запрос", "индекс", "сервер", "форма",
+         "сессия", "пароль", "маршрут", "таблица", "кэш", "тест", "ошибка", "деплой"]
+
+# "слово42" - префикс: найдёт и слово420..слово4299 (как и LIKE '%слово42%')
+QUERIES = ["python", "flask sqlite", "слово42", "деплой кэш пароль", "несуществующееслово"]
+
+
+# Обычные слова: большой словарь, каждое встречается редко
+FILLER = [f"слово{i}" for i in range(5000)]
+
+
+def make_text(words, topics=2):
+    # Пост = обычные слова + несколько слов "темы" из WORDS
+    text = random.choices(FILLER, k=words) + random.choices(WORDS, k=topics)
+    random.shuffle(text)
+    return " ".join(text)
+
+
+def fill(count):
+    random.seed(1)
+    with db.get_db() as conn:
+        conn.executemany(
+            "INSERT INTO posts (title, content, author) VALUES (?, ?, ?)",
+            ((make_text(4, topics=1), make_text(120), "ivan") for _ in range(count)))
+
+
+def like_search(query):
+    """Поиск как до FTS5: все посты, где фраза есть в заголовке или тексте"""
+    return db.get_posts_with_comment_counts(
+        "WHERE p.title LIKE ? OR p.content LIKE ?",
+        (f'%{query}%', f'%{query}%'))
+
+
+def timed(action, repeat=3):
+    # Лучший из нескольких запусков
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = action()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(count):
+    with tempfile.TemporaryDirectory() as folder:
+        db.DATABASE = os.path.join(folder, "bench.db")
+        db.init_db()
+
+        start = time.perf_counter()
+        fill(count)
+        print(f"=== {count} постов (запись с индексом FTS: {time.perf_counter() - start:.1f} с) ===\n")
+
+        print(f"{'запрос':25} {'LIKE, мс':>10} {'найдено':>8} {'FTS5, мс':>10} {'найдено':>8}")
+        for query in QUERIES:
+            # LIKE ищет подстроку целиком, поэтому для сравнения - одно слово
+            # или фраза; FTS - все слова в любом месте поста
+            like_time, like_posts = timed(lambda: like_search(query))
+            fts_time, (_, total) = timed(lambda: db.search_posts_fts(query, limit=20))
+            print(f"{query:25} {like_time * 1000:10.1f} {len(like_posts):8} "
+                  f"{fts_time * 1000:10.1f} {total:8}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
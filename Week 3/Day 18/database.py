@@ -1,11 +1,196 @@
+import atexit
+import base64
+import importlib.util
+import json
+import os
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from flask import g, has_app_context
+
+
+def _load_blog_search():
+    """
+    Поиск (FTS5) - общий модуль блога из Day 17 (Day 17/search.py)
+
+    Загружаем файл по пути под своим именем, а не через sys.path:
+    так не меняется путь поиска модулей для всей программы, и чужой
+    модуль search не подменит наш (и наоборот)
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Day 17', 'search.py')
+    spec = importlib.util.spec_from_file_location('blog_search', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# build_match_query, highlight, MATCH_* доступны и как db.highlight и т.д.
+_search = _load_blog_search()
+MATCH_START, MATCH_END = _search.MATCH_START, _search.MATCH_END
+init_search = _search.init_search
+build_match_query = _search.build_match_query
+highlight = _search.highlight
+find_posts = _search.find_posts
 
 DATABASE = 'blog.db'
 
+# ==========================================
+# СОЕДИНЕНИЯ
+# ==========================================
+"""
+ПРОБЛЕМА:
+Каждая функция открывала своё соединение: sqlite3.connect() - это
+открыть файл, прочитать схему, настроить соединение. Просмотр поста
+(get_post_by_id + increment_views + get_comments_for_post) = 3 соединения.
+
+КАК РАБОТАЕТ:
+- Во время запроса Flask: одно соединение на запрос, хранится в g.
+  Берётся из пула при первом get_db() и возвращается в пул
+  в конце запроса (close_db, подключается через init_app(app))
+- Вне Flask (скрипты, тесты): у каждого потока своё соединение (threading.local)
+- Фоновые потоки берут соединение из того же пула: with pooled_connection() as conn
+  (кроме счётчика просмотров - у него своё соединение, см. ViewCounter)
+- Соединение настраивается один раз при создании:
+  * journal_mode=WAL - читатели не ждут писателя (и наоборот)
+  * synchronous=NORMAL - в режиме WAL надёжно и без fsync на каждый коммит
+  * cached_statements - подготовленные запросы запоминаются в соединении,
+    раз оно живёт долго, повторный запрос не разбирается заново
+
+Функции пишут как раньше: with get_db() as conn - коммит или откат
+в конце блока, но соединение не закрывается.
+"""
+
+POOL_SIZE = 5           # Сколько соединений одновременно (потоков сервера)
+POOL_TIMEOUT = 10       # Сколько секунд ждать свободное соединение
+CACHED_STATEMENTS = 256
+
+
+def open_connection(database=None):
+    """Новое настроенное соединение"""
+    conn = sqlite3.connect(database or DATABASE,
+                           # Соединение из пула переходит между потоками
+                           check_same_thread=False,
+                           cached_statements=CACHED_STATEMENTS)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class ConnectionPool:
+    """
+    Ограниченный пул соединений
+
+    acquire() отдаёт свободное соединение или создаёт новое,
+    пока их меньше size. Если все заняты - ждёт timeout секунд
+    и бросает TimeoutError (значит где-то соединение не вернули)
+    """
+
+    def __init__(self, database, size=POOL_SIZE, timeout=POOL_TIMEOUT):
+        self.database = database
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()  # LIFO - чаще используем "тёплые" соединения
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return open_connection(self.database)
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"Нет свободного соединения с {self.database} (пул {self.size})")
+
+    def release(self, conn):
+        conn.rollback()  # Незавершённая транзакция не должна достаться следующему
+        self._idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_pool():
+    """Пул для текущего DATABASE (поменяли DATABASE - новый пул)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.database != DATABASE:
+            if _pool is not None:
+                _pool.close()
+            _pool = ConnectionPool(DATABASE)
+        return _pool
+
+
+def get_db():
+    """Соединение текущего запроса Flask (или текущего потока вне Flask)"""
+    if has_app_context():
+        if 'db' not in g:
+            pool = get_pool()
+            g.db = pool.acquire()
+            g.db_pool = pool  # Вернуть именно в тот пул, из которого взяли
+        return g.db
+
+    conn = getattr(_local, 'conn', None)
+    if conn is None or _local.database != DATABASE:
+        if conn is not None:
+            conn.close()
+        conn = _local.conn = open_connection()
+        _local.database = DATABASE
+    return conn
+
+
+def close_db(error=None):
+    """Вернуть соединение запроса в пул (teardown_appcontext)"""
+    conn = g.pop('db', None)
+    pool = g.pop('db_pool', None)
+    if conn is not None:
+        pool.release(conn)
+
+
+def init_app(app):
+    """Подключить возврат соединений в пул после каждого запроса"""
+    app.teardown_appcontext(close_db)
+
+
+@contextmanager
+def pooled_connection():
+    """
+    Соединение из пула для фонового потока
+
+    with db.pooled_connection() as conn:
+        conn.execute(...)
+    Коммит в конце блока, откат при ошибке, потом соединение возвращается в пул
+    """
+    pool = get_pool()
+    conn = pool.acquire()
+    try:
+        with conn:
+            yield conn
+    finally:
+        pool.release(conn)
+
+
 def init_db():
     """Создать БД и таблицы"""
-    with sqlite3.connect(DATABASE) as conn:
+    with get_db() as conn:
         cursor = conn.cursor()
         
         # Таблица постов
@@ -43,6 +228,22 @@ def init_db():
         Комментарий всегда привязан к конкретному посту
         """
 
+        # Индекс по post_id: комментарии поста (и их количество)
+        # находятся по индексу, а не перебором всей таблицы comments
+        cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_comments_post_id
+        ON comments (post_id)
+        """)
+
+        # Индекс в порядке ленты (новые сверху): страница постов читается
+        # прямо из индекса, без сортировки всей таблицы (get_posts_page)
+        cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_posts_created_at
+        ON posts (created_at DESC, id DESC)
+        """)
+
+        init_search(cursor)
+
         cursor.execute("""
         CREATE TABLE IF NOT EXISTS users (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -73,7 +274,7 @@ def dict_factory(cursor, row):
 
 def create_post(title, content, author, author_id=None):
     """Создать новый пост"""
-    with sqlite3.connect(DATABASE) as conn:
+    with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("""
         INSERT INTO posts (title, content, author, author_id)
@@ -84,9 +285,9 @@ def create_post(title, content, author, author_id=None):
     
 def get_all_posts():
     """Получить все посты"""
-    with sqlite3.connect(DATABASE) as conn:
-        conn.row_factory = dict_factory
+    with get_db() as conn:
         cursor = conn.cursor()
+        cursor.row_factory = dict_factory
         cursor.execute("""
         SELECT * FROM posts 
         ORDER BY created_at DESC
@@ -96,16 +297,21 @@ def get_all_posts():
 
 def get_post_by_id(post_id):
     """Получить пост по ID"""
-    with sqlite3.connect(DATABASE) as conn:
-        conn.row_factory = dict_factory
+    with get_db() as conn:
         cursor = conn.cursor()
+        cursor.row_factory = dict_factory
         cursor.execute("SELECT * FROM posts WHERE id = ?", (post_id,))
-        return cursor.fetchone()
+        post = cursor.fetchone()
+
+    if post:
+        # + просмотры, которые ещё не записаны в БД
+        post['views'] += view_counter.pending().get(post_id, 0)
+    return post
 
 
 def update_post(post_id, title, content):
     """Обновить пост"""
-    with sqlite3.connect(DATABASE) as conn:
+    with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("""
         UPDATE posts 
@@ -118,7 +324,7 @@ def update_post(post_id, title, content):
 
 def delete_post(post_id):
     """Удалить пост"""
-    with sqlite3.connect(DATABASE) as conn:
+    with get_db() as conn:
         cursor = conn.cursor()
         
         # Сначала удалить все комментарии к посту
@@ -132,23 +338,177 @@ def delete_post(post_id):
 
 
 
+VIEWS_FLUSH_INTERVAL = 0.5  # Секунд между записями просмотров в БД
+VIEWS_FLUSH_EVERY = 500     # ...или раньше, если накопилось столько просмотров
+
+
+class ViewCounter:
+    """
+    Счётчик просмотров с отложенной записью (write-behind)
+
+    ПРОБЛЕМА:
+    UPDATE posts SET views = views + 1 + коммит на КАЖДЫЙ просмотр.
+    Писать в SQLite может только один - при наплыве читателей
+    запросы выстраиваются в очередь за блокировкой записи.
+
+    КАК РАБОТАЕТ:
+    - increment() только прибавляет 1 в словаре {post_id: сколько просмотров}
+      (под threading.Lock - запросы Flask идут в разных потоках)
+    - Фоновый поток раз в flush_interval секунд (или сразу, как накопилось
+      flush_every просмотров) забирает словарь и пишет всё ОДНОЙ транзакцией:
+      горячий пост с 1000 просмотров = один UPDATE views = views + 1000
+    - Пока пачка пишется, она лежит в _in_flight: pending() видит и её,
+      иначе в этот момент просмотров не было бы ни в словаре, ни в БД
+    - При выходе из программы (atexit) остаток записывается,
+      после stop() каждый просмотр пишется в БД сразу
+    - Не удалось записать - просмотры возвращаются в словарь, попробуем снова.
+      Фоновый поток не умирает ни от какой ошибки, иначе просмотры
+      до выхода из программы так и остались бы в памяти
+    - У счётчика своё соединение, а не из пула: при наплыве читателей
+      все POOL_SIZE соединений заняты запросами, и запись просмотров
+      ждала бы вместе с ними (а через POOL_TIMEOUT - TimeoutError)
+    - pending() - ещё не записанные просмотры: get_post_by_id и get_stats
+      прибавляют их, чтобы числа на сайте не отставали
+      (сразу после коммита, пока пачка не убрана из _in_flight,
+      её просмотры на мгновение могут посчитаться дважды - не меньше, чем есть)
+    """
+
+    def __init__(self, flush_interval=VIEWS_FLUSH_INTERVAL, flush_every=VIEWS_FLUSH_EVERY):
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
+        self._pending = {}
+        self._in_flight = {}  # Пачка, которая сейчас пишется в БД
+        self._count = 0  # Сколько просмотров ждут записи (сумма _pending)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # Пачку пишет только один поток
+        self._wake = threading.Event()     # "пора записать" раньше срока
+        self._stopping = threading.Event()
+        self._thread = None
+        self._conn = None  # Своё соединение (открывается при первой записи)
+
+    def increment(self, post_id, count=1):
+        with self._lock:
+            self._pending[post_id] = self._pending.get(post_id, 0) + count
+            self._count += count
+            full = self._count >= self.flush_every
+            stopped = self._stopping.is_set()
+            if self._thread is None and not stopped:
+                # Поток запускается при первом просмотре, а не при import
+                self._thread = threading.Thread(target=self._run, name="view-counter", daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+        if stopped:
+            # Фонового потока больше нет - пишем сразу, иначе просмотр потеряется
+            self.flush()
+        elif full:
+            self._wake.set()
+
+    def pending(self):
+        """Копия ещё не записанных просмотров {post_id: сколько}"""
+        with self._lock:
+            pending = dict(self._in_flight)
+            for post_id, count in self._pending.items():
+                pending[post_id] = pending.get(post_id, 0) + count
+            return pending
+
+    def flush(self):
+        """Записать накопленные просмотры одной транзакцией"""
+        with self._flush_lock:
+            with self._lock:
+                pending = self._in_flight = self._pending
+                self._pending = {}
+                self._count = 0
+            if not pending:
+                return
+
+            try:
+                with self._connection() as conn:
+                    conn.executemany("UPDATE posts SET views = views + ? WHERE id = ?",
+                                     [(count, post_id) for post_id, count in pending.items()])
+            except BaseException:
+                # Не записалось - вернуть просмотры, чтобы они не потерялись
+                with self._lock:
+                    for post_id, count in pending.items():
+                        self._pending[post_id] = self._pending.get(post_id, 0) + count
+                    self._count += sum(pending.values())
+                    self._in_flight = {}
+                raise
+
+            with self._lock:
+                self._in_flight = {}
+
+    @contextmanager
+    def _connection(self):
+        """
+        Соединение счётчика: коммит в конце блока, откат при ошибке
+
+        Вызывается только под _flush_lock - одновременно им пользуется
+        один поток. Поменялся DATABASE - открываем соединение заново
+        """
+        if self._conn is None or self._database != DATABASE:
+            self._close_connection()
+            self._conn = open_connection()
+            self._database = DATABASE
+        with self._conn:
+            yield self._conn
+
+    def _close_connection(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                # Просмотры уже вернулись в _pending (см. flush) -
+                # поток продолжает работать и повторит запись
+                print(f"✗ Просмотры не записаны (повторим): {e!r}")
+
+    def stop(self):
+        """Остановить фоновый поток и записать остаток (вызывается при выходе)"""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        try:
+            self.flush()
+        finally:
+            # После stop() просмотры пишутся по одному - соединение
+            # откроется снова при следующей записи
+            with self._flush_lock:
+                self._close_connection()
+
+
+view_counter = ViewCounter()
+
+
 def increment_views(post_id):
-    """Увеличить счётчик просмотров"""
-    with sqlite3.connect(DATABASE) as conn:
+    """Увеличить счётчик просмотров (в памяти, в БД попадёт пачкой - см. ViewCounter)"""
+    view_counter.increment(post_id)
+
+
+def search_posts_fts(query, limit=20, offset=0, prefix=True):
+    """
+    Поиск постов через FTS5 (индекс, bm25, snippet - см. Day 17/search.py)
+
+    ВОЗВРАЩАЕТ:
+    (посты страницы, сколько всего найдено)
+    """
+    with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-        UPDATE posts 
-        SET views = views + 1
-        WHERE id = ?
-        """, (post_id,))
-        conn.commit()
+        cursor.row_factory = dict_factory
+        return find_posts(cursor, query, limit, offset, prefix)
 
 
 def search_posts(query):
-    """Поиск постов"""
-    with sqlite3.connect(DATABASE) as conn:
-        conn.row_factory = dict_factory
+    """Поиск постов (LIKE - перебор всей таблицы, см. search_posts_fts)"""
+    with get_db() as conn:
         cursor = conn.cursor()
+        cursor.row_factory = dict_factory
         cursor.execute("""
         SELECT * FROM posts 
         WHERE title LIKE ? OR content LIKE ?
@@ -159,7 +519,7 @@ def search_posts(query):
 
 def add_comment(post_id, author, content):
     """Добавить комментарий к посту"""
-    with sqlite3.connect(DATABASE) as conn:
+    with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("""
         INSERT INTO comments (post_id, author, content)
@@ -171,9 +531,9 @@ def add_comment(post_id, author, content):
 
 def get_comments_for_post(post_id):
     """Получить все комментарии к посту"""
-    with sqlite3.connect(DATABASE) as conn:
-        conn.row_factory = dict_factory
+    with get_db() as conn:
         cursor = conn.cursor()
+        cursor.row_factory = dict_factory
         cursor.execute("""
         SELECT * FROM comments 
         WHERE post_id = ?
@@ -184,16 +544,136 @@ def get_comments_for_post(post_id):
 
 def get_comment_count(post_id):
     """Получить количество комментариев"""
-    with sqlite3.connect(DATABASE) as conn:
+    with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("""
         SELECT COUNT(*) FROM comments WHERE post_id = ?
         """, (post_id,))
         return cursor.fetchone()[0]
 
+def get_posts_with_comment_counts(where="", params=()):
+    """
+    Посты вместе с количеством комментариев - ОДНИМ запросом
+
+    ПРОБЛЕМА (N+1):
+    get_all_posts() + get_comment_count() для каждого поста =
+    1 запрос на список + N запросов (и N новых соединений) на счётчики.
+    500 постов на странице - 501 запрос.
+
+    КАК РАБОТАЕТ:
+    LEFT JOIN - к каждому посту присоединяются его комментарии
+    (LEFT - посты без комментариев тоже остаются, с NULL вместо комментария)
+    GROUP BY p.id - строки одного поста схлопываются в одну,
+    COUNT(c.id) считает только настоящие комментарии (NULL не считается)
+
+    where/params - условие для постов, например "WHERE p.author = ?"
+    """
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = dict_factory
+        cursor.execute(f"""
+        SELECT p.*, COUNT(c.id) AS comment_count
+        FROM posts p
+        LEFT JOIN comments c ON c.post_id = p.id
+        {where}
+        GROUP BY p.id
+        ORDER BY p.created_at DESC
+        """, params)
+        return cursor.fetchall()
+
+
+def get_all_posts_with_comment_counts():
+    """Все посты + comment_count (для главной и списков в API)"""
+    return get_posts_with_comment_counts()
+
+
+# Поля поста, которые можно запросить в get_posts_page (fields)
+POST_FIELDS = ('id', 'title', 'content', 'author', 'views', 'created_at')
+
+
+def encode_cursor(post):
+    """Курсор страницы = (created_at, id) последнего поста, в виде строки для URL"""
+    data = json.dumps([post['created_at'], post['id']]).encode('utf-8')
+    return base64.urlsafe_b64encode(data).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Строка курсора -> (created_at, id). ValueError если курсор испорчен"""
+    try:
+        created_at, post_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise ValueError("Некорректный курсор") from e
+    if not isinstance(created_at, str) or not isinstance(post_id, int):
+        raise ValueError("Некорректный курсор")
+    return created_at, post_id
+
+
+def get_posts_page(limit=20, offset=0, cursor=None, fields=None):
+    """
+    Одна страница постов (новые сверху) + comment_count
+
+    ДВА СПОСОБА ЛИСТАТЬ:
+    - offset: LIMIT 20 OFFSET 1000 - просто, но SQLite всё равно
+      проходит и выбрасывает первые 1000 строк. Чем дальше страница, тем медленнее
+    - cursor (keyset): "посты старше последнего показанного" -
+      WHERE (created_at, id) < (?, ?). По индексу idx_posts_created_at
+      SQLite сразу встаёт на нужное место - любая страница одинаково быстрая.
+      id нужен потому что у нескольких постов created_at может совпасть
+
+    fields - какие поля вернуть (None = все). Для списка постов
+    content обычно не нужен, а это самое большое поле
+
+    comment_count - подзапрос по индексу idx_comments_post_id, выполняется
+    только для постов этой страницы
+
+    ВОЗВРАЩАЕТ:
+    (посты, next_cursor) - next_cursor None если это последняя страница
+    """
+    fields = list(fields or POST_FIELDS)
+    unknown = [field for field in fields if field not in POST_FIELDS]
+    if unknown:
+        raise ValueError(f"Неизвестные поля: {', '.join(unknown)}")
+    # Для курсора следующей страницы created_at и id нужны всегда
+    selected = list(dict.fromkeys(fields + ['created_at', 'id']))
+
+    where = ""
+    params = []
+    if cursor is not None:
+        where = "WHERE (p.created_at, p.id) < (?, ?)"
+        params.extend(decode_cursor(cursor))
+        offset = 0
+
+    with get_db() as conn:
+        db_cursor = conn.cursor()
+        db_cursor.row_factory = dict_factory
+        # Берём на один пост больше: если он есть - есть и следующая страница
+        db_cursor.execute(f"""
+        SELECT {', '.join('p.' + field for field in selected)},
+               (SELECT COUNT(*) FROM comments c WHERE c.post_id = p.id) AS comment_count
+        FROM posts p
+        {where}
+        ORDER BY p.created_at DESC, p.id DESC
+        LIMIT ? OFFSET ?
+        """, params + [limit + 1, offset])
+        posts = db_cursor.fetchall()
+
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode_cursor(posts[-1])
+
+    # Поля, которые добавили только ради курсора, наружу не отдаём
+    for post in posts:
+        for field in selected:
+            if field not in fields:
+                del post[field]
+
+    return posts, next_cursor
+
+
 def get_stats():
     """Получить статистику блога"""
-    with sqlite3.connect(DATABASE) as conn:
+    with get_db() as conn:
         cursor = conn.cursor()
         
         # Общее количество постов
@@ -214,6 +694,20 @@ def get_stats():
         ORDER BY views DESC LIMIT 1
         """)
         popular = cursor.fetchone()
+
+        # Просмотры, которые ещё не записаны (ViewCounter).
+        # Берём только существующие посты - удалённый пост мог успеть набрать просмотры
+        pending = view_counter.pending()
+        if pending:
+            cursor.execute(f"""
+            SELECT id, title, views FROM posts
+            WHERE id IN ({', '.join('?' * len(pending))})
+            """, list(pending))
+            for post_id, title, views in cursor.fetchall():
+                total_views += pending[post_id]
+                views += pending[post_id]
+                if popular is None or views > popular[1]:
+                    popular = (title, views)
         
         return {
             'total_posts': total_posts,
@@ -248,7 +742,7 @@ import bcrypt
 
 def create_users_table():
     """Создать таблицу пользователей"""
-    with sqlite3.connect(DATABASE) as conn:
+    with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("""
         CREATE TABLE IF NOT EXISTS users (
@@ -288,7 +782,7 @@ def register_user(username, email, password):
     
     # Сохранение
     try:
-        with sqlite3.connect(DATABASE) as conn:
+        with get_db() as conn:
             cursor = conn.cursor()
             cursor.execute("""
             INSERT INTO users (username, email, password_hash)
@@ -310,9 +804,9 @@ def login_user(username, password):
     Возвращает:
         (bool, dict или str): (успех, данные_пользователя или сообщение)
     """
-    with sqlite3.connect(DATABASE) as conn:
-        conn.row_factory = dict_factory
+    with get_db() as conn:
         cursor = conn.cursor()
+        cursor.row_factory = dict_factory
         
         cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
         user = cursor.fetchone()
@@ -333,9 +827,9 @@ def login_user(username, password):
         
 def get_user_by_id(user_id):
     """Получить пользователя по ID"""
-    with sqlite3.connect(DATABASE) as conn:
-        conn.row_factory = dict_factory
+    with get_db() as conn:
         cursor = conn.cursor()
+        cursor.row_factory = dict_factory
         cursor.execute("SELECT id, username, email, created_at FROM users WHERE id = ?", 
                       (user_id,))
         return cursor.fetchone()
@@ -343,9 +837,9 @@ def get_user_by_id(user_id):
 
 def get_user_by_username(username):
     """Получить пользователя по username"""
-    with sqlite3.connect(DATABASE) as conn:
-        conn.row_factory = dict_factory
+    with get_db() as conn:
         cursor = conn.cursor()
+        cursor.row_factory = dict_factory
         cursor.execute("SELECT id, username, email, created_at FROM users WHERE username = ?", 
                       (username,))
         return cursor.fetchone()
@@ -0,0 +1,55 @@
+import random
+import pytest
+import database as db
+
+
+@pytest.fixture
+def blog(tmp_path, monkeypatch):
+    """
+    Фикстура: 30 постов, у части нет ни одного комментария
+
+    seed фиксирован - данные одни и те же при каждом запуске
+    """
+    monkeypatch.setattr(db, 'DATABASE', str(tmp_path / 'blog.db'))
+    db.init_db()
+    random.seed(1)
+    with db.get_db() as conn:
+        conn.executemany("INSERT INTO posts (title, content, author) VALUES (?, ?, ?)",
+                         [(f"Пост {i}", "Текст", "ivan") for i in range(30)])
+        # Комментарии только к постам 1..20 - посты 21..30 без комментариев
+        conn.executemany("INSERT INTO comments (post_id, author, content) VALUES (?, ?, ?)",
+                         [(random.randint(1, 20), "maria", "Класс") for _ in range(100)])
+    return db
+
+
+def test_counts_match_get_comment_count(blog):
+    posts = db.get_all_posts_with_comment_counts()
+
+    assert len(posts) == 30
+    for post in posts:
+        assert post['comment_count'] == db.get_comment_count(post['id'])
+
+
+def test_posts_without_comments_have_zero(blog):
+    """LEFT JOIN оставляет посты без комментариев, COUNT(c.id) даёт 0, а не 1"""
+    counts = {post['id']: post['comment_count'] for post in db.get_all_posts_with_comment_counts()}
+
+    assert all(counts[post_id] == 0 for post_id in range(21, 31))
+    assert sum(counts.values()) == 100
+
+
+def test_same_posts_as_get_all_posts(blog):
+    """Те же посты и поля, что у get_all_posts, плюс comment_count"""
+    with_counts = db.get_all_posts_with_comment_counts()
+    for post in with_counts:
+        del post['comment_count']
+
+    assert sorted(with_counts, key=lambda p: p['id']) == \
+        sorted(db.get_all_posts(), key=lambda p: p['id'])
+
+
+def test_where_filter(blog):
+    posts = db.get_posts_with_comment_counts("WHERE p.id IN (?, ?)", (1, 25))
+
+    assert {post['id']: post['comment_count'] for post in posts} == \
+        {1: db.get_comment_count(1), 25: 0}
@@ -0,0 +1,99 @@
+import threading
+import pytest
+from flask import Flask
+import database as db
+
+
+@pytest.fixture
+def blog(tmp_path, monkeypatch):
+    """Фикстура: временная БД и свой пул на каждый тест"""
+    monkeypatch.setattr(db, 'DATABASE', str(tmp_path / 'blog.db'))
+    monkeypatch.setattr(db, '_pool', None)
+    db.init_db()
+    yield db
+    db.get_pool().close()
+
+
+@pytest.fixture
+def app(blog):
+    """Минимальное приложение Flask с возвратом соединений в пул"""
+    app = Flask(__name__)
+    db.init_app(app)
+    return app
+
+
+def test_one_connection_per_request(app):
+    with app.app_context():
+        assert db.get_db() is db.get_db()
+
+
+def test_connection_returned_to_pool(app):
+    """После запроса соединение в пуле - следующий запрос берёт его же"""
+    with app.app_context():
+        first = db.get_db()
+    assert db.get_pool()._idle.qsize() == 1
+
+    with app.app_context():
+        assert db.get_db() is first
+    assert db.get_pool()._created == 1
+
+
+def test_uncommitted_changes_rolled_back_on_release(app):
+    with app.app_context():
+        db.get_db().execute("INSERT INTO posts (title, content, author) VALUES ('a', 'b', 'c')")
+
+    with app.app_context():
+        assert db.get_db().execute("SELECT COUNT(*) FROM posts").fetchone()[0] == 0
+
+
+def test_wal_enabled(blog):
+    conn = db.open_connection()
+
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    # synchronous=NORMAL - это 1
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    conn.close()
+
+
+def test_thread_local_outside_app(blog):
+    """Вне Flask: у потока одно соединение, у другого потока - своё"""
+    conn = db.get_db()
+    assert db.get_db() is conn
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(db.get_db()))
+    thread.start()
+    thread.join()
+
+    assert other[0] is not conn
+
+
+def test_new_database_new_connection(blog, tmp_path, monkeypatch):
+    conn = db.get_db()
+    pool = db.get_pool()
+
+    monkeypatch.setattr(db, 'DATABASE', str(tmp_path / 'other.db'))
+
+    assert db.get_db() is not conn
+    assert db.get_pool() is not pool
+
+
+def test_pool_limit(blog):
+    """Все соединения заняты - ждём timeout и получаем TimeoutError"""
+    pool = db.ConnectionPool(db.DATABASE, size=1, timeout=0.05)
+    conn = pool.acquire()
+
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+
+    pool.release(conn)
+    assert pool.acquire() is conn
+    pool.close()
+
+
+def test_pooled_connection_commits(blog):
+    with db.pooled_connection() as conn:
+        conn.execute("INSERT INTO posts (title, content, author) VALUES ('a', 'b', 'c')")
+
+    assert db.get_db().execute("SELECT COUNT(*) FROM posts").fetchone()[0] == 1
+    assert db.get_pool()._idle.qsize() == 1
@@ -0,0 +1,102 @@
+import base64
+import pytest
+import database as db
+
+
+@pytest.fixture
+def blog(tmp_path, monkeypatch):
+    """
+    Фикстура: 47 постов во временной БД, у части - одинаковый created_at
+
+    Одинаковое время - чтобы проверить, что курсор различает посты по id
+    """
+    monkeypatch.setattr(db, 'DATABASE', str(tmp_path / 'blog.db'))
+    db.init_db()
+    with db.get_db() as conn:
+        conn.executemany(
+            "INSERT INTO posts (title, content, author, created_at) VALUES (?, ?, ?, ?)",
+            [(f"Пост {i}", "Текст", "ivan", f"2025-11-{1 + i // 3:02d} 10:00:00")
+             for i in range(47)])
+    return db
+
+
+def all_ids():
+    """ID всех постов в порядке ленты (новые сверху)"""
+    rows = db.get_db().execute("SELECT id FROM posts ORDER BY created_at DESC, id DESC")
+    return [row[0] for row in rows]
+
+
+def test_cursor_walks_every_post_once(blog):
+    """По next_cursor проходим все посты: без повторов и пропусков"""
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        posts, cursor = db.get_posts_page(limit=10, cursor=cursor)
+        seen.extend(post['id'] for post in posts)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert seen == all_ids()
+    assert pages == 5
+
+
+def test_offset_walks_every_post_once(blog):
+    seen = []
+    for offset in range(0, 50, 10):
+        posts, _ = db.get_posts_page(limit=10, offset=offset)
+        seen.extend(post['id'] for post in posts)
+
+    assert seen == all_ids()
+
+
+def test_last_page_has_no_cursor(blog):
+    """Ровно limit постов на последней странице - next_cursor всё равно None"""
+    posts, cursor = db.get_posts_page(limit=47)
+
+    assert len(posts) == 47
+    assert cursor is None
+
+
+def test_cursor_ignores_offset(blog):
+    _, cursor = db.get_posts_page(limit=10)
+
+    assert db.get_posts_page(limit=10, offset=30, cursor=cursor) == \
+        db.get_posts_page(limit=10, cursor=cursor)
+
+
+def test_fields(blog):
+    """Только запрошенные поля + comment_count, служебные created_at/id не добавляются"""
+    posts, cursor = db.get_posts_page(limit=5, fields=['title'])
+
+    assert set(posts[0]) == {'title', 'comment_count'}
+    assert cursor is not None
+
+    with pytest.raises(ValueError):
+        db.get_posts_page(fields=['title', 'password_hash'])
+
+
+def test_cursor_round_trip():
+    cursor = db.encode_cursor({'created_at': '2025-11-16 10:00:00', 'id': 42})
+
+    assert db.decode_cursor(cursor) == ('2025-11-16 10:00:00', 42)
+
+
+def b64(text):
+    return base64.urlsafe_b64encode(text.encode('utf-8')).decode('ascii')
+
+
+@pytest.mark.parametrize("cursor", [
+    "не base64",
+    "!!!",
+    b64("не json"),
+    b64("null"),
+    b64("[1, 2, 3]"),
+    b64('["2025-11-16 10:00:00"]'),
+    b64('[20251116, 42]'),
+    b64('["2025-11-16 10:00:00", "42"]'),
+])
+def test_bad_cursor_rejected(blog, cursor):
+    with pytest.raises(ValueError):
+        db.get_posts_page(cursor=cursor)
@@ -0,0 +1,92 @@
+import pytest
+import database as db
+
+
+@pytest.fixture
+def blog(tmp_path, monkeypatch):
+    """Фикстура: временная БД с индексом FTS5 и несколькими постами"""
+    monkeypatch.setattr(db, 'DATABASE', str(tmp_path / 'blog.db'))
+    db.init_db()
+    with db.get_db() as conn:
+        conn.executemany("INSERT INTO posts (title, content, author) VALUES (?, ?, ?)", [
+            ("Шаблоны Jinja", "В тексте один раз встречается python", "ivan"),
+            ("Python и Flask", "Про веб без того самого слова", "maria"),
+            ("Заметки", "python python python и ещё раз python", "ivan"),
+            ("Пост <b>жирный</b>", "Текст с <script>alert(1)</script> и sqlite", "petr"),
+        ])
+        conn.execute("INSERT INTO comments (post_id, author, content) VALUES (2, 'ivan', 'Класс')")
+    return db
+
+
+@pytest.mark.parametrize("query, prefix, expected", [
+    ("python", True, '"python"*'),
+    ("python flask", False, '"python" "flask"'),
+    # Операторы и кавычки FTS5 - просто символы, а не синтаксис
+    ('python OR "flask', True, '"python"* "OR"* "flask"*'),
+    ("title:python*", False, '"title" "python"'),
+    ("NEAR(a b)", False, '"NEAR" "a" "b"'),
+    ("Привет, мир!", False, '"Привет" "мир"'),
+    ("", True, ""),
+    ("  !!! ", True, ""),
+])
+def test_build_match_query(query, prefix, expected):
+    assert db.build_match_query(query, prefix) == expected
+
+
+def test_highlight_escapes_html():
+    snippet = f"<b>{db.MATCH_START}python{db.MATCH_END}</b> & co"
+
+    assert db.highlight(snippet) == "&lt;b&gt;<mark>python</mark>&lt;/b&gt; &amp; co"
+
+
+def test_title_match_ranks_first(blog):
+    """Совпадение в заголовке весит больше, чем даже частое слово в тексте"""
+    posts, total = db.search_posts_fts("python")
+
+    assert total == 3
+    assert posts[0]['title'] == "Python и Flask"
+    assert [p['score'] for p in posts] == sorted(p['score'] for p in posts)
+
+
+def test_snippet_highlights_title_only_match(blog):
+    """Слово есть только в заголовке - подсвечено в snippet из заголовка"""
+    posts, _ = db.search_posts_fts("flask")
+
+    assert len(posts) == 1
+    assert "<mark>Flask</mark>" in posts[0]['snippet']
+
+
+def test_snippet_is_escaped(blog):
+    (post,), _ = db.search_posts_fts("sqlite")
+
+    assert "<script>" not in post['snippet']
+    assert "<mark>sqlite</mark>" in post['snippet']
+
+
+def test_prefix_and_pages(blog):
+    assert db.search_posts_fts("pyth", prefix=False) == ([], 0)
+
+    first, total = db.search_posts_fts("pyth", limit=2)
+    second, _ = db.search_posts_fts("pyth", limit=2, offset=2)
+
+    assert total == 3
+    assert len(first) == 2 and len(second) == 1
+    assert {p['id'] for p in first} | {p['id'] for p in second} == {1, 2, 3}
+
+
+def test_results_have_comment_counts(blog):
+    posts, _ = db.search_posts_fts("python")
+
+    assert {p['id']: p['comment_count'] for p in posts} == {1: 0, 2: 1, 3: 0}
+
+
+def test_index_follows_update_and_delete(blog):
+    db.update_post(1, "Шаблоны Jinja", "Теперь про django")
+    db.delete_post(3)
+
+    assert [p['id'] for p in db.search_posts_fts("python")[0]] == [2]
+    assert [p['id'] for p in db.search_posts_fts("django")[0]] == [1]
+
+
+def test_empty_query(blog):
+    assert db.search_posts_fts("  ") == ([], 0)
@@ -0,0 +1,204 @@
+import sqlite3
+import threading
+import pytest
+import database as db
+
+
+@pytest.fixture
+def blog(tmp_path, monkeypatch):
+    """
+    Фикстура: пустая БД блога во временной папке и два поста
+
+    blog.db не трогаем - DATABASE подменяется только на время теста
+    """
+    monkeypatch.setattr(db, 'DATABASE', str(tmp_path / 'blog.db'))
+    db.init_db()
+    with db.get_db() as conn:
+        conn.executemany("INSERT INTO posts (title, content, author) VALUES (?, ?, ?)",
+                         [("Первый", "Текст", "ivan"), ("Второй", "Текст", "maria")])
+    return db
+
+
+@pytest.fixture
+def counter(blog, monkeypatch):
+    """
+    Свой ViewCounter на каждый тест (flush_interval большой -
+    пишем только явным flush() или по порогу)
+    """
+    counter = db.ViewCounter(flush_interval=60, flush_every=1000)
+    monkeypatch.setattr(db, 'view_counter', counter)
+    yield counter
+    counter.stop()
+
+
+def views_in_db(post_id):
+    return db.get_db().execute("SELECT views FROM posts WHERE id = ?", (post_id,)).fetchone()[0]
+
+
+def test_increments_are_batched(counter):
+    """Просмотры копятся в памяти, в БД - одной записью на flush"""
+    for _ in range(5):
+        counter.increment(1)
+    counter.increment(2)
+
+    assert views_in_db(1) == 0
+    assert counter.pending() == {1: 5, 2: 1}
+
+    counter.flush()
+
+    assert views_in_db(1) == 5
+    assert views_in_db(2) == 1
+    assert counter.pending() == {}
+
+
+def test_flush_when_threshold_reached(blog, monkeypatch):
+    """Набралось flush_every просмотров - поток пишет не дожидаясь интервала"""
+    counter = db.ViewCounter(flush_interval=60, flush_every=10)
+    monkeypatch.setattr(db, 'view_counter', counter)
+
+    for _ in range(10):
+        counter.increment(1)
+
+    for _ in range(500):
+        if views_in_db(1) == 10:
+            break
+        threading.Event().wait(0.01)
+
+    assert views_in_db(1) == 10
+    counter.stop()
+
+
+def test_stop_writes_the_rest(counter):
+    counter.increment(1)
+    counter.increment(1)
+
+    counter.stop()
+
+    assert views_in_db(1) == 2
+
+
+def test_increment_after_stop_is_written(counter):
+    """После stop() фонового потока нет - просмотр пишется сразу"""
+    counter.stop()
+
+    counter.increment(2)
+
+    assert views_in_db(2) == 1
+    assert counter.pending() == {}
+
+
+def test_reads_include_pending_views(counter):
+    """get_post_by_id и get_stats прибавляют ещё не записанные просмотры"""
+    counter.increment(1)
+    counter.flush()
+    counter.increment(1)
+    counter.increment(2, 3)
+
+    assert db.get_post_by_id(1)['views'] == 2
+    stats = db.get_stats()
+    assert stats['total_views'] == 5
+    assert stats['popular_post'] == "Второй"
+    assert stats['popular_views'] == 3
+
+
+def test_pending_includes_batch_being_written(counter, monkeypatch):
+    """
+    Пока пачка пишется в БД, её просмотры видны в pending()
+
+    КАК ПРОВЕРЯЕМ:
+    Подменяем соединение счётчика: внутри записи смотрим pending()
+    """
+    counter.increment(1, 3)
+    seen = []
+    real = counter._connection
+
+    def spy():
+        seen.append(counter.pending())
+        return real()
+
+    monkeypatch.setattr(counter, '_connection', spy)
+    counter.flush()
+
+    assert seen == [{1: 3}]
+    assert counter.pending() == {}
+    assert views_in_db(1) == 3
+
+
+def test_failed_flush_keeps_views(counter, monkeypatch):
+    """Запись не удалась - просмотры остаются и пишутся в следующий раз"""
+    counter.increment(1, 2)
+    real = counter._connection
+
+    def broken():
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(counter, '_connection', broken)
+    with pytest.raises(sqlite3.OperationalError):
+        counter.flush()
+    counter.increment(1)
+
+    assert counter.pending() == {1: 3}
+
+    monkeypatch.setattr(counter, '_connection', real)
+    counter.flush()
+    assert views_in_db(1) == 3
+
+
+def wait_for_views(post_id, expected):
+    for _ in range(500):
+        if views_in_db(post_id) == expected:
+            return
+        threading.Event().wait(0.01)
+
+
+def test_pool_exhausted_views_still_written(blog, monkeypatch):
+    """
+    Все соединения пула заняты запросами - просмотры всё равно пишутся
+
+    У счётчика своё соединение, он не ждёт свободного места в пуле
+    """
+    monkeypatch.setattr(db, '_pool', db.ConnectionPool(db.DATABASE, size=2, timeout=0.05))
+    counter = db.ViewCounter(flush_interval=0.01, flush_every=1000)
+    monkeypatch.setattr(db, 'view_counter', counter)
+    pool = db.get_pool()
+    busy = [pool.acquire() for _ in range(pool.size)]
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+
+    counter.increment(1, 4)
+    wait_for_views(1, 4)
+
+    assert views_in_db(1) == 4
+    assert counter.pending() == {}
+
+    for conn in busy:
+        pool.release(conn)
+    counter.stop()
+    pool.close()
+
+
+def test_background_thread_survives_errors(blog, monkeypatch):
+    """
+    Запись упала с ошибкой не из sqlite3 (например TimeoutError) -
+    фоновый поток жив и записывает просмотры, когда ошибка прошла
+    """
+    counter = db.ViewCounter(flush_interval=0.01, flush_every=1000)
+    monkeypatch.setattr(db, 'view_counter', counter)
+    real = counter._connection
+    failures = []
+
+    def flaky():
+        if len(failures) < 3:
+            failures.append(1)
+            raise TimeoutError("Нет свободного соединения")
+        return real()
+
+    monkeypatch.setattr(counter, '_connection', flaky)
+    counter.increment(1, 4)
+    wait_for_views(1, 4)
+
+    assert len(failures) == 3
+    assert counter._thread.is_alive()
+    assert views_in_db(1) == 4
+    assert counter.pending() == {}
+    counter.stop()
@@ -12,37 +12,58 @@ app.secret_key = 'your-secret-key'
 
 # Инициализация БД
 db.init_db()
+# Одно соединение на запрос (из пула), возвращается в пул после ответа
+db.init_app(app)
+
+# Размер страницы /api/posts
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
 
 
 @app.route('/api/posts', methods=['GET'])
 def get_posts():
     """
-    Получить все посты
+    Получить страницу постов (новые сверху)
     
     Query параметры:
-        - limit: количество постов (по умолчанию все)
-        - offset: смещение (для пагинации)
+        - limit: количество постов (по умолчанию 20, максимум 100)
+        - offset: смещение (для пагинации по номеру страницы)
+        - cursor: next_cursor из прошлого ответа - следующая страница
+          (быстрее offset на дальних страницах, offset тогда не нужен)
+        - fields: какие поля вернуть, через запятую
+          (например id,title,author,created_at - без тяжёлого content)
     
     Пример: GET /api/posts?limit=10&offset=0
+    Пример: GET /api/posts?limit=10&cursor=WyIyMDI1...&fields=id,title
     """
-    limit = request.args.get('limit', type=int)
+    limit = request.args.get('limit', default=DEFAULT_PAGE_SIZE, type=int)
     offset = request.args.get('offset', default=0, type=int)
-    
-    posts = db.get_all_posts()
-    
-    # Пагинация
-    if limit:
-        posts = posts[offset:offset + limit]
-    
-    # Добавить количество комментариев
-    for post in posts:
-        post['comment_count'] = db.get_comment_count(post['id'])
+    cursor = request.args.get('cursor') or None
+    fields = request.args.get('fields')
+    fields = [field.strip() for field in fields.split(',') if field.strip()] if fields else None
+
+    if limit < 1 or offset < 0:
+        return jsonify({
+            'error': 'Bad Request',
+            'message': 'limit должен быть больше 0, offset - не меньше 0'
+        }), 400
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    # LIMIT/OFFSET или курсор считает сама БД - в память попадает только страница
+    try:
+        posts, next_cursor = db.get_posts_page(limit, offset, cursor, fields)
+    except ValueError as e:
+        return jsonify({
+            'error': 'Bad Request',
+            'message': str(e)
+        }), 400
     
     return jsonify({
         'posts': posts,
         'count': len(posts),
-        'offset': offset,
-        'limit': limit
+        'offset': offset if cursor is None else None,
+        'limit': limit,
+        'next_cursor': next_cursor
     }), 200
 
 
@@ -241,12 +262,19 @@ def get_comments(post_id):
 @app.route('/api/search', methods=['GET'])
 def search():
     """
-    Поиск постов
+    Поиск постов (полнотекстовый, FTS5)
     
     Query параметры:
-        - q: поисковый запрос
+        - q: поисковый запрос (слова через пробел - пост должен содержать все)
+        - limit: результатов на странице (по умолчанию 20, максимум 100)
+        - offset: смещение
+        - prefix: 1 (по умолчанию) - "pyth" найдёт "python", 0 - только слово целиком
+    
+    Посты отсортированы по релевантности (bm25), в snippet -
+    фрагмент текста с найденными словами в <mark>
     
     Пример: GET /api/search?q=python
+    Пример: GET /api/search?q=flask api&limit=10&offset=10
     """
     query = request.args.get('q', '').strip()
     
@@ -255,17 +283,27 @@ def search():
             'error': 'Bad Request',
             'message': 'Параметр q обязателен'
         }), 400
-    
-    posts = db.search_posts(query)
-    
-    # Добавить количество комментариев
-    for post in posts:
-        post['comment_count'] = db.get_comment_count(post['id'])
+
+    limit = request.args.get('limit', default=DEFAULT_PAGE_SIZE, type=int)
+    offset = request.args.get('offset', default=0, type=int)
+    prefix = request.args.get('prefix', default='1') not in ('0', 'false')
+
+    if limit < 1 or offset < 0:
+        return jsonify({
+            'error': 'Bad Request',
+            'message': 'limit должен быть больше 0, offset - не меньше 0'
+        }), 400
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    posts, total = db.search_posts_fts(query, limit, offset, prefix)
     
     return jsonify({
         'query': query,
         'posts': posts,
-        'count': len(posts)
+        'count': len(posts),
+        'total': total,
+        'offset': offset,
+        'limit': limit
     }), 200
 
 
@@ -310,8 +348,10 @@ def index():
     
     <h2>Posts Endpoints:</h2>
     <ul>
-        <li><code>GET /api/posts</code> - Получить все посты</li>
+        <li><code>GET /api/posts</code> - Первая страница постов (20)</li>
         <li><code>GET /api/posts?limit=10&offset=0</code> - С пагинацией</li>
+        <li><code>GET /api/posts?limit=10&cursor=...</code> - Следующая страница по next_cursor</li>
+        <li><code>GET /api/posts?fields=id,title,author</code> - Только нужные поля</li>
         <li><code>GET /api/posts/{id}</code> - Получить пост по ID</li>
         <li><code>POST /api/posts</code> - Создать пост</li>
         <li><code>PUT /api/posts/{id}</code> - Обновить пост</li>
@@ -326,16 +366,20 @@ def index():
     
     <h2>Other Endpoints:</h2>
     <ul>
-        <li><code>GET /api/search?q=query</code> - Поиск постов</li>
+        <li><code>GET /api/search?q=query</code> - Поиск постов (по релевантности, с подсветкой)</li>
+        <li><code>GET /api/search?q=query&limit=10&offset=10&prefix=0</code> - Страница поиска, только целые слова</li>
         <li><code>GET /api/stats</code> - Статистика</li>
         <li><code>GET /api/users/{id}</code> - Получить пользователя</li>
     </ul>
     
     <h2>Примеры:</h2>
     <pre>
-# Получить все посты
+# Получить первую страницу постов
 GET /api/posts
 
+# Следующая страница (next_cursor из прошлого ответа), без content
+GET /api/posts?limit=10&cursor=WyIyMDI1LTExLTE2IDEwOjAwOjAwIiwgNDJd&fields=id,title,author
+
 # Получить пост #1
 GET /api/posts/1
 
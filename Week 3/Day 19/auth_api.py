@@ -14,6 +14,8 @@ app.secret_key = 'your-secret-key'
 
 # Инициализация БД
 db.init_db()
+# Одно соединение на запрос (из пула), возвращается в пул после ответа
+db.init_app(app)
 
 
 tokens = {}
@@ -210,10 +212,7 @@ def get_current_user(current_user):
 @app.route('/api/posts', methods=['GET'])
 def get_posts():
     """Получить все посты (публичный)"""
-    posts = db.get_all_posts()
-    
-    for post in posts:
-        post['comment_count'] = db.get_comment_count(post['id'])
+    posts = db.get_all_posts_with_comment_counts()
     
     return jsonify({
         'posts': posts,
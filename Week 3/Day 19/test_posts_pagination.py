@@ -0,0 +1,72 @@
+import os
+import sys
+import pytest
+
+# Модули блога из Day 18 (как в api_blog.py)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'Day 18'))
+import database as db
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Фикстура: тестовый клиент Flask и 25 постов во временной БД"""
+    monkeypatch.setattr(db, 'DATABASE', str(tmp_path / 'blog.db'))
+    # api_blog при импорте создаёт таблицы в DATABASE - импортируем
+    # после подмены, чтобы не трогать blog.db
+    import api_blog
+    db.init_db()
+    with db.get_db() as conn:
+        conn.executemany("INSERT INTO posts (title, content, author) VALUES (?, ?, ?)",
+                         [(f"Пост {i}", "Текст поста", "ivan") for i in range(25)])
+    return api_blog.app.test_client()
+
+
+def test_walk_pages_by_cursor(client):
+    """Все посты по next_cursor - без повторов и пропусков"""
+    ids = []
+    url = '/api/posts?limit=10'
+    while True:
+        data = client.get(url).get_json()
+        ids.extend(post['id'] for post in data['posts'])
+        if data['next_cursor'] is None:
+            break
+        url = f"/api/posts?limit=10&cursor={data['next_cursor']}"
+
+    assert sorted(ids) == list(range(1, 26))
+    assert len(ids) == len(set(ids))
+
+
+def test_walk_pages_by_offset(client):
+    ids = []
+    for offset in (0, 10, 20):
+        data = client.get(f'/api/posts?limit=10&offset={offset}').get_json()
+        assert data['offset'] == offset
+        ids.extend(post['id'] for post in data['posts'])
+
+    assert sorted(ids) == list(range(1, 26))
+
+
+def test_default_and_max_limit(client):
+    assert client.get('/api/posts').get_json()['count'] == 20
+    assert client.get('/api/posts?limit=1000').get_json()['limit'] == 100
+
+
+def test_fields(client):
+    data = client.get('/api/posts?limit=3&fields=id,title').get_json()
+
+    assert set(data['posts'][0]) == {'id', 'title', 'comment_count'}
+
+
+@pytest.mark.parametrize("query", [
+    "limit=0",
+    "limit=-5",
+    "offset=-1",
+    "cursor=испорченный",
+    "cursor=WzEsMiwzXQ==",   # [1,2,3]
+    "fields=id,password_hash",
+])
+def test_bad_request(client, query):
+    response = client.get(f'/api/posts?{query}')
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Bad Request'